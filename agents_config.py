@@ -0,0 +1,437 @@
+"""
+The 50 book agents: search queries, result limits and segment per agent.
+
+Only the scraper needs these, so book_scraper imports this module on
+first use (get_agents) rather than at init; outreach and the reply
+report never load it.
+"""
+
+AGENTS = {
+    # ----------------------------------------
+    # CATEGORY 1 — Campus Bookstores & Retail (10)
+    # ----------------------------------------
+    "campus_bookstore_east_agent": {
+        "search_queries": [
+            '"campus bookstore" "bookstore manager" "university" "New York" site:.edu',
+            '"campus bookstore" "manager" "Massachusetts" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Campus Bookstores – East Coast",
+    },
+    "campus_bookstore_midwest_agent": {
+        "search_queries": [
+            '"campus bookstore" "bookstore manager" "Illinois" site:.edu',
+            '"campus bookstore" "manager" "Ohio" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Campus Bookstores – Midwest",
+    },
+    "campus_bookstore_west_agent": {
+        "search_queries": [
+            '"campus bookstore" "bookstore manager" "California" site:.edu',
+            '"campus bookstore" "manager" "Washington" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Campus Bookstores – West",
+    },
+    "campus_bookstore_hbcu_agent": {
+        "search_queries": [
+            '"bookstore" "HBCU" "campus bookstore" site:.edu',
+            '"campus bookstore" "historically black college" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "HBCU Campus Bookstores",
+    },
+    "campus_bookstore_cc_agent": {
+        "search_queries": [
+            '"community college bookstore" "campus bookstore" site:.edu',
+            '"bookstore manager" "community college" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Community College Bookstores",
+    },
+    "campus_bookstore_ordering_agent": {
+        "search_queries": [
+            '"textbook ordering" "campus bookstore" site:.edu',
+            '"bookstore" "course materials ordering" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Bookstore Ordering Departments",
+    },
+    "university_merch_buyer_agent": {
+        "search_queries": [
+            '"merchandise buyer" "university bookstore" site:.edu',
+            '"university" "merchandise buyer" "campus store" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "University Merchandise Buyers",
+    },
+    "auxiliary_services_agent": {
+        "search_queries": [
+            '"auxiliary services" "bookstore" "textbooks" site:.edu',
+            '"auxiliary enterprises" "campus store" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Auxiliary Services",
+    },
+    "campus_retail_partnership_agent": {
+        "search_queries": [
+            '"campus store" "retail partnerships" site:.edu',
+            '"campus retail" "bookstore" "partner" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Campus Retail Partnerships",
+    },
+    "purchasing_office_books_agent": {
+        "search_queries": [
+            '"purchasing office" "books" "campus" site:.edu',
+            '"procurement" "textbooks" "university" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Purchasing Office – Books & Merch",
+    },
+
+    # ----------------------------------------
+    # CATEGORY 2 — Academic Success Departments (8)
+    # ----------------------------------------
+    "academic_success_center_agent": {
+        "search_queries": [
+            '"academic success center" "students" site:.edu',
+            '"academic success center" "resources" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Academic Success Centers",
+    },
+    "learning_center_director_agent": {
+        "search_queries": [
+            '"learning center director" "students" site:.edu',
+            '"learning center" "student success" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Learning Centers",
+    },
+    "tutoring_center_admin_agent": {
+        "search_queries": [
+            '"tutoring center" "coordinator" site:.edu',
+            '"tutoring center director" "students" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Tutoring Centers",
+    },
+    "student_retention_coordinator_agent": {
+        "search_queries": [
+            '"student retention coordinator" site:.edu',
+            '"director of student retention" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Student Retention Offices",
+    },
+    "first_year_persistence_agent": {
+        "search_queries": [
+            '"first-year persistence" "students" site:.edu',
+            '"first year persistence program" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "First-Year Persistence Programs",
+    },
+    "academic_advising_director_agent": {
+        "search_queries": [
+            '"director of academic advising" site:.edu',
+            '"academic advising center" "student success" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Academic Advising Directors",
+    },
+    "study_skills_program_agent": {
+        "search_queries": [
+            '"study skills program" "students" site:.edu',
+            '"study skills workshop" "student success" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Study Skills Programs",
+    },
+    "si_coordinator_agent": {
+        "search_queries": [
+            '"supplemental instruction coordinator" site:.edu',
+            '"SI coordinator" "supplemental instruction" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Supplemental Instruction (SI)",
+    },
+
+    # ----------------------------------------
+    # CATEGORY 3 — TRIO & Support Programs (7)
+    # ----------------------------------------
+    "trio_sss_director_agent": {
+        "search_queries": [
+            '"TRIO Student Support Services" director site:.edu',
+            '"TRIO SSS" "student support services" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "TRIO SSS Directors",
+    },
+    "trio_upward_bound_agent": {
+        "search_queries": [
+            '"TRIO Upward Bound" coordinator site:.edu',
+            '"Upward Bound" "TRIO" "program director" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "TRIO Upward Bound",
+    },
+    "trio_eoc_director_agent": {
+        "search_queries": [
+            '"TRIO Educational Opportunity Center" director site:.edu',
+            '"TRIO EOC" "program director" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "TRIO EOC Directors",
+    },
+    "trio_mcnair_agent": {
+        "search_queries": [
+            '"McNair Scholars Program" director site:.edu',
+            '"McNair Scholars" "TRIO" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "TRIO McNair Scholars",
+    },
+    "gear_up_coordinator_agent": {
+        "search_queries": [
+            '"GEAR UP coordinator" site:.edu',
+            '"GEAR UP program" "college readiness" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "GEAR UP Coordinators",
+    },
+    "heop_program_agent": {
+        "search_queries": [
+            '"HEOP program" director site:.edu',
+            '"opportunity program" "HEOP" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "HEOP / Opportunity Programs",
+    },
+    "college_bridge_program_agent": {
+        "search_queries": [
+            '"college bridge program" "students" site:.edu',
+            '"bridge to college" "summer bridge" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "College Bridge Programs",
+    },
+
+    # ----------------------------------------
+    # CATEGORY 4 — Faculty & Classroom Use (10)
+    # ----------------------------------------
+    "college_success_faculty_agent": {
+        "search_queries": [
+            '"college success course" syllabus site:.edu',
+            '"student success course" "required text" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "College Success Course Faculty",
+    },
+    "first_year_seminar_faculty_agent": {
+        "search_queries": [
+            '"first year seminar" syllabus site:.edu',
+            '"FYS" "first year seminar" "course" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "First-Year Seminar Instructors",
+    },
+    "freshman_experience_prof_agent": {
+        "search_queries": [
+            '"freshman experience" course syllabus site:.edu',
+            '"freshman experience seminar" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Freshman Experience Faculty",
+    },
+    "dev_english_instructor_agent": {
+        "search_queries": [
+            '"developmental English" syllabus site:.edu',
+            '"developmental reading" "student success" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Developmental English Instructors",
+    },
+    "student_life_skills_faculty_agent": {
+        "search_queries": [
+            '"student life skills" course syllabus site:.edu',
+            '"SLS course" "student life skills" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Student Life Skills Faculty",
+    },
+    "cc_success_course_director_agent": {
+        "search_queries": [
+            '"college success course director" site:.edu',
+            '"student success" "course coordinator" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "CC Success Course Directors",
+    },
+    "leadership_course_professor_agent": {
+        "search_queries": [
+            '"student leadership course" syllabus site:.edu',
+            '"leadership studies" course syllabus site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Leadership Course Professors",
+    },
+    "education_department_faculty_agent": {
+        "search_queries": [
+            '"education department" "student success" course site:.edu',
+            '"education department" "first year" "course" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Education Department Faculty",
+    },
+    "student_development_sdv_faculty_agent": {
+        "search_queries": [
+            '"student development" "SDV" course syllabus site:.edu',
+            '"SDV 100" "student development" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Student Development / SDV Faculty",
+    },
+    "learning_community_faculty_agent": {
+        "search_queries": [
+            '"learning community" "first year" syllabus site:.edu',
+            '"learning communities" "student success" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Seminar / Learning Communities Faculty",
+    },
+
+    # ----------------------------------------
+    # CATEGORY 5 — High School & Transition Programs (7)
+    # ----------------------------------------
+    "hs_college_career_readiness_agent": {
+        "search_queries": [
+            '"college and career readiness" director "high school"',
+            '"college & career coordinator" "high school"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "HS College & Career Readiness",
+    },
+    "hs_guidance_counselor_agent": {
+        "search_queries": [
+            '"guidance counselor" "high school" email',
+            '"school counseling office" "high school"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "High School Guidance Counselors",
+    },
+    "avid_coordinator_agent": {
+        "search_queries": [
+            '"AVID coordinator" "high school"',
+            '"AVID program" "college readiness" "coordinator"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "AVID Coordinators",
+    },
+    "hs_leadership_advisor_agent": {
+        "search_queries": [
+            '"student council advisor" "high school"',
+            '"leadership advisor" "ASB" "high school"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "High School Leadership Advisors",
+    },
+    "ub_high_school_partner_agent": {
+        "search_queries": [
+            '"Upward Bound" "high school partner"',
+            '"Upward Bound" "target high school"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Upward Bound HS Partners",
+    },
+    "freshman_academy_teacher_agent": {
+        "search_queries": [
+            '"freshman academy" "high school" "teacher"',
+            '"ninth grade academy" "high school"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Freshman Academy Teachers",
+    },
+    "cte_coordinator_agent": {
+        "search_queries": [
+            '"CTE coordinator" "high school"',
+            '"career technical education coordinator" "school"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "CTE Coordinators",
+    },
+
+    # ----------------------------------------
+    # CATEGORY 6 — Student Clubs & Organizations (5)
+    # ----------------------------------------
+    "student_business_club_agent": {
+        "search_queries": [
+            '"student business club" "advisor" site:.edu',
+            '"business club" "student organization" advisor site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Student Business Clubs",
+    },
+    "student_entrepreneurship_club_agent": {
+        "search_queries": [
+            '"entrepreneurship club" "advisor" site:.edu',
+            '"entrepreneurship society" "student organization" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Student Entrepreneurship Clubs",
+    },
+    "bsu_coordinator_agent": {
+        "search_queries": [
+            '"Black Student Union" advisor site:.edu',
+            '"Black Student Union" "faculty advisor" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Black Student Union Coordinators",
+    },
+    "men_of_color_group_agent": {
+        "search_queries": [
+            '"men of color" "student group" advisor site:.edu',
+            '"men of color initiative" "student organization" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Men of Color Student Groups",
+    },
+    "peer_mentor_program_agent": {
+        "search_queries": [
+            '"peer mentor program" coordinator site:.edu',
+            '"peer mentoring program" "student success" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Peer Mentor Programs",
+    },
+
+    # ----------------------------------------
+    # CATEGORY 7 — Libraries & Resource Centers (3)
+    # ----------------------------------------
+    "library_acquisitions_agent": {
+        "search_queries": [
+            '"library acquisitions" "librarian" site:.edu',
+            '"acquisitions librarian" "college" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Library Acquisitions",
+    },
+    "cc_library_director_agent": {
+        "search_queries": [
+            '"library director" "community college"',
+            '"community college library" "director"',
+        ],
+        "max_results_per_query": 5,
+        "segment": "Community College Library Directors",
+    },
+    "university_library_resource_agent": {
+        "search_queries": [
+            '"student success" "library guide" site:.edu',
+            '"library" "student success resources" site:.edu',
+        ],
+        "max_results_per_query": 5,
+        "segment": "University Library Resource Specialists",
+    },
+}
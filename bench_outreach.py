@@ -0,0 +1,292 @@
+"""
+Synthetic-table benchmark for book_daily_outreach_handler and
+book_reply_stats_report_handler.
+
+Both handlers scan the whole leads table and loop over it in Python.
+This fills the in-memory DynamoDB stand-in (bench_support) with
+generated leads that look like production ones - sequence steps,
+timestamps stored both as numbers and ISO strings, replies, bounces,
+a few domains holding most of the leads - and runs each handler
+against it, with SES stubbed out.
+
+    python bench_outreach.py                         # 10k, 100k and 1M leads
+    python bench_outreach.py --sizes 10000,50000
+    python bench_outreach.py --size 100000 --json out.json
+
+Every size runs in its own process so peak RSS is per size. Reports
+wall time, scan time, items scanned, read / write units, emails sent
+and RSS.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import agents_config
+import bench_support
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+EASTERN = ZoneInfo("US/Eastern")
+
+# Sequence step of generated leads (0 = never emailed)
+STEP_WEIGHTS = [(0, 0.55), (1, 0.20), (2, 0.12), (3, 0.13)]
+REPLY_RATE = 0.04
+BOUNCE_RATE = 0.02
+DO_NOT_CONTACT_RATE = 0.01
+# Share of leads whose address another agent already found
+REPEAT_EMAIL_RATE = 0.10
+
+TLDS = [(".edu", 0.75), (".k12.ca.us", 0.10), (".org", 0.10), (".com", 0.05)]
+LOCAL_PARTS = [
+    "bookstore", "info", "textbooks", "store", "manager", "director",
+    "advising", "trio", "admissions", "studentsuccess", "jsmith", "mgarcia",
+]
+
+# The handlers store the last subject/body on each lead; about this long
+SUBJECT = "Checking in about the student success PDF"
+BODY = (
+    "Hello,\n\nI'm just checking in to see if you had a chance to look at the "
+    "\"5 Student Success Shifts\" PDF I shared.\n\n" + "It's designed so you can easily share it. " * 18
+)
+
+
+# ---------------------------------------------------
+# Synthetic leads
+# ---------------------------------------------------
+
+def pick(rng: random.Random, weighted: list):
+    roll = rng.random()
+    for value, share in weighted:
+        if roll < share:
+            return value
+        roll -= share
+    return weighted[-1][0]
+
+
+def as_stored_timestamp(rng: random.Random, moment: datetime):
+    """A timestamp the way leads hold them: epoch Decimal (boto3) or ISO string."""
+    form = rng.random()
+    if form < 0.5:
+        return Decimal(int(moment.timestamp()))
+    if form < 0.75:
+        return moment.astimezone(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return moment.isoformat()
+
+
+def generate_leads(count: int, today, agent_names: list, seed: int = 1):
+    """
+    Yield `count` lead items as the scraper and outreach handler leave
+    them. Domains follow a Zipf-like curve, so a few campuses hold most
+    of the leads, like the real table.
+    """
+    rng = random.Random(seed)
+    now = datetime.combine(today, dt_time(8, 30), tzinfo=EASTERN)
+
+    domain_count = max(50, count // 20)
+    domains = [f"campus{i}{pick(rng, TLDS)}" for i in range(domain_count)]
+    domain_weights = list(itertools.accumulate(1 / (rank + 1) ** 1.1 for rank in range(domain_count)))
+    agent_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(agent_names))))
+    recent_emails = []
+
+    for n in range(count):
+        if recent_emails and rng.random() < REPEAT_EMAIL_RATE:
+            email = rng.choice(recent_emails)
+        else:
+            domain = rng.choices(domains, cum_weights=domain_weights)[0]
+            email = f"{rng.choice(LOCAL_PARTS)}{rng.randrange(100)}@{domain}"
+            recent_emails.append(email)
+            if len(recent_emails) > 1000:
+                recent_emails.pop(0)
+
+        source = rng.choices(agent_names, cum_weights=agent_weights)[0]
+        url = f"https://www.{email.split('@')[1]}/page/{n}"
+        item = {
+            "id": hashlib.sha256(f"{source}:{url}".encode()).hexdigest(),
+            "url": url,
+            "title": f"Campus store and course materials {n}",
+            "contact_email": email,
+            "source": source,
+            "segment": source.replace("_agent", ""),
+            "campaign": "BookAgents50",
+            "scraped_at": Decimal(int((now - timedelta(days=rng.uniform(0, 120))).timestamp())),
+        }
+
+        step = pick(rng, STEP_WEIGHTS)
+        if step:
+            first_sent = now - timedelta(days=rng.uniform(1, 45))
+            last_sent = min(now - timedelta(hours=1), first_sent + timedelta(days=4 * (step - 1)))
+            item["sequence_step"] = Decimal(step)
+            item["first_email_sent_at"] = as_stored_timestamp(rng, first_sent)
+            item["last_email_sent_at"] = as_stored_timestamp(rng, last_sent)
+            item["last_email_subject"] = SUBJECT
+            item["last_email_body"] = BODY
+            if step >= 3:
+                item["sequence_completed"] = True
+
+            if rng.random() < REPLY_RATE:
+                replied = first_sent + (now - first_sent) * rng.random()
+                item["manually_replied"] = True
+                item["manually_replied_at"] = as_stored_timestamp(rng, replied)
+            elif rng.random() < BOUNCE_RATE:
+                item["bounce_detected"] = True
+
+        if rng.random() < DO_NOT_CONTACT_RATE:
+            item["do_not_contact"] = True
+
+        yield item
+
+
+# ---------------------------------------------------
+# Benchmark
+# ---------------------------------------------------
+
+def outreach_day(outreach, start):
+    """The latest weekday on or before `start` that isn't a federal holiday."""
+    day = start
+    while not outreach.is_weekday(day) or outreach.is_us_federal_holiday(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def run_size(size: int, args) -> dict:
+    dynamo = bench_support.MemoryDynamo(latency_ms=args.dynamo_latency_ms)
+    ses = bench_support.MemorySes(latency_ms=args.ses_latency_ms)
+    env = {
+        "TEST_MODE": "false",
+        "REPORT_EMAIL": "report@example.com",
+        "FROM_EMAIL": "outreach@example.com",
+        "SEND_DELAY_MIN_SECONDS": "0",
+        "SEND_DELAY_MAX_SECONDS": "0",
+    }
+    outreach = bench_support.load_module("book_outreach", env=env, dynamo=dynamo, ses=ses)
+    report = bench_support.load_module("book_reply_report", env=env, dynamo=dynamo, ses=ses)
+    if not args.verbose:
+        outreach.logger.setLevel(logging.WARNING)
+
+    start = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else datetime.now(tz=EASTERN).date()
+    today = outreach_day(outreach, start)
+    # Handlers ask now_eastern() for the date; pin it to the benchmark day
+    def pinned_now():
+        return datetime.combine(today, dt_time(8, 30), tzinfo=EASTERN)
+
+    outreach.now_eastern = report.now_eastern = pinned_now
+
+    table = outreach.get_table()
+    print(f"[{size:,}] Generating leads for {today} ...", flush=True)
+    table.load(generate_leads(size, today, list(agents_config.AGENTS), seed=args.seed))
+    loaded_rss = bench_support.current_rss_mb()
+
+    timer = bench_support.StageTimer()
+    # Each handler module holds its own reference to scan_all_items
+    timer.instrument(outreach, {"scan": "scan_all_items"})
+    timer.instrument(report, {"scan": "scan_all_items"})
+
+    results = {"size": size, "date": today.isoformat(), "loaded_rss_mb": round(loaded_rss, 1), "handlers": {}}
+    handlers = {
+        "outreach": outreach.book_daily_outreach_handler,
+        "reply_report": report.book_reply_stats_report_handler,
+    }
+    for name, handler in handlers.items():
+        table.read_units = table.write_units = table.items_scanned = table.scan_pages = 0
+        sent_before = ses.sent
+        timer.samples.clear()
+
+        with bench_support.measure(trace=False) as measured:
+            resp = handler({}, None)
+
+        results["handlers"][name] = {
+            "seconds": round(measured["seconds"], 3),
+            "scan_seconds": round(sum(timer.samples.get("scan", [])), 3),
+            "items_scanned": table.items_scanned,
+            "scan_pages": table.scan_pages,
+            "read_units": table.read_units,
+            "write_units": table.write_units,
+            "emails_sent": ses.sent - sent_before,
+            "max_rss_mb": round(measured["max_rss_mb"], 1),
+            "response": json.loads(resp["body"]),
+        }
+        print(f"[{size:,}] {name}: {measured['seconds']:.2f}s", flush=True)
+
+    return results
+
+
+def print_report(results: list):
+    print()
+    print(f"{'leads':>10} {'handler':<13}{'time s':>9}{'scan s':>9}{'scanned':>10}"
+          f"{'pages':>7}{'RCU':>9}{'WCU':>6}{'sent':>6}{'RSS MB':>9}{'peak MB':>9}")
+    for result in results:
+        for name, h in result["handlers"].items():
+            print(
+                f"{result['size']:>10,} {name:<13}{h['seconds']:>9.2f}{h['scan_seconds']:>9.2f}"
+                f"{h['items_scanned']:>10,}{h['scan_pages']:>7}{h['read_units']:>9,.0f}"
+                f"{h['write_units']:>6}{h['emails_sent']:>6}"
+                f"{result['loaded_rss_mb']:>9.0f}{h['max_rss_mb']:>9.0f}"
+            )
+    print("\nRSS MB: resident after loading the table; peak MB: process peak during the handler.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="comma-separated table sizes, each run in its own process")
+    parser.add_argument("--size", type=int, default=None, help="run one size in this process")
+    parser.add_argument("--date", default=None, help="outreach date YYYY-MM-DD (default: latest business day)")
+    parser.add_argument("--dynamo-latency-ms", type=float, default=0)
+    parser.add_argument("--ses-latency-ms", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the results as JSON here")
+    parser.add_argument("--verbose", action="store_true", help="keep the handlers' INFO logging")
+    # Set on the per-size child processes; the parent prints the report
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.size is not None:
+        results = [run_size(args.size, args)]
+    else:
+        results = []
+        passthrough = [
+            "--dynamo-latency-ms", str(args.dynamo_latency_ms),
+            "--ses-latency-ms", str(args.ses_latency_ms),
+            "--seed", str(args.seed),
+        ]
+        if args.date:
+            passthrough += ["--date", args.date]
+        if args.verbose:
+            passthrough.append("--verbose")
+
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+                out_path = f.name
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--size", str(size), "--json", out_path, "--child",
+                 *passthrough],
+                check=True,
+            )
+            with open(out_path, encoding="utf-8") as f:
+                results.extend(json.load(f))
+            os.remove(out_path)
+
+    if not args.child:
+        print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+Offline scraper benchmark.
+
+Runs run_agent / book_scraper_handler against local stand-ins so scraper
+changes can be measured without Google, campus sites or AWS:
+
+- FIXTURE_SITES local "campus" web servers with generated pages (mailto
+  links, plain-text emails, pages without an email, large pages, PDFs)
+- an emulated customsearch/v1 endpoint (GOOGLE_CSE_URL points at it)
+- the in-memory DynamoDB stand-in from bench_support
+
+Latency and error profiles are set per run:
+
+    python bench_scraper.py --agents 5 --latency-ms 80 --error-rate 0.05
+    python bench_scraper.py --mode agent --agent campus_bookstore_east_agent
+
+Reports URLs/sec, p50/p95 latency per stage, bytes read and peak memory.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import bench_support
+
+FIXTURE_SITES = 8
+PAGES_PER_SITE = 200
+
+# Share of generated result pages of each kind
+PAGE_KINDS = [
+    ("mailto", 0.45),     # mailto: link on the site's own domain
+    ("text", 0.20),       # plain-text address in the body
+    ("none", 0.20),       # no email: contact-page discovery, then the domain fallback
+    ("large", 0.05),      # ~1 MB of markup before the address
+    ("pdf", 0.05),        # .pdf link served as application/pdf
+    ("binary", 0.05),     # HTML-looking URL served as an image
+]
+
+LARGE_PAGE_BYTES = 1024 * 1024
+
+# Share of page results returned as a variant spelling of the URL
+URL_VARIANT_RATE = 0.2
+
+# Scraper stages timed by wrapping book_scraper functions
+STAGES = {
+    "cse_search": "google_search",
+    "page_fetch": "fetch_page_email",
+    "contact_discovery": "discover_contact_email",
+    "domain_fallback": "lookup_domain_email",
+    "result_total": "process_search_result",
+}
+
+
+class BenchContext:
+    """Stand-in for the Lambda context: get_remaining_time_in_millis()."""
+
+    def __init__(self, timeout_seconds: float):
+        self.deadline = time.monotonic() + timeout_seconds
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int((self.deadline - time.monotonic()) * 1000)
+
+
+# ---------------------------------------------------
+# Local web + CSE stand-ins
+# ---------------------------------------------------
+
+class Profile:
+    """Latency / error profile shared by every stand-in server."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float, slow_rate: float,
+                 cse_latency_ms: float, cse_error_rate: float, seed: int):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.cse_latency_ms = cse_latency_ms
+        self.cse_error_rate = cse_error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.bytes_sent = 0
+        self.requests: dict[str, int] = {}
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def page_delay(self) -> float:
+        delay = self.latency_ms + (self.roll() * 2 - 1) * self.jitter_ms
+        if self.roll() < self.slow_rate:
+            delay *= 5
+        return max(0.0, delay) / 1000
+
+    def count(self, kind: str, sent: int):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytes_sent += sent
+
+
+def page_kind(site: int, page: int) -> str:
+    """Deterministic kind for a fixture page."""
+    roll = int(hashlib.sha256(f"{site}/{page}".encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+    for kind, share in PAGE_KINDS:
+        if roll < share:
+            return kind
+        roll -= share
+    return PAGE_KINDS[0][0]
+
+
+def page_body(site: int, page: int, kind: str) -> bytes:
+    domain = f"campus{site}.edu"
+    filler = "<p>Course materials, textbooks and campus store hours.</p>\n" * 20
+    if kind == "mailto":
+        body = f"{filler}<a href=\"mailto:store{page}@{domain}\">Contact the store</a>"
+    elif kind == "text":
+        body = f"{filler}<p>Questions? Write to manager{page}@{domain}.</p>"
+    elif kind == "large":
+        padding = "<div class=\"row\">" + "x" * 1000 + "</div>\n"
+        body = padding * (LARGE_PAGE_BYTES // len(padding)) + f"<a href=\"mailto:big{page}@{domain}\">x</a>"
+    elif site % 4 != 3:
+        # Most sites link their contact page; the rest need the domain fallback
+        body = f"<nav><a href=\"/\">Home</a> <a href=\"/contact\">Contact Us</a></nav>{filler}"
+    else:
+        body = filler
+    return f"<html><body><h1>Campus {site} page {page}</h1>{body}</body></html>".encode()
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    profile: Profile = None
+    site = 0
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8", kind: str = "page"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.profile.count(kind, len(body))
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/robots.txt":
+            return self.send(200, b"User-agent: *\nAllow: /\n", "text/plain", kind="robots")
+
+        time.sleep(self.profile.page_delay())
+        if self.profile.roll() < self.profile.error_rate:
+            return self.send(503, b"Service Unavailable", kind="error")
+
+        if path == "/contact":
+            body = f"<a href=\"mailto:info@campus{self.site}.edu\">Contact us</a>".encode()
+            return self.send(200, body, kind="contact")
+
+        try:
+            page = int(path.rstrip("/").rsplit("/", 1)[-1].split(".")[0])
+        except ValueError:
+            return self.send(404, b"Not Found", kind="error")
+
+        kind = page_kind(self.site, page)
+        if kind == "pdf":
+            return self.send(200, b"%PDF-1.4 " + b"\0" * 20000, "application/pdf", kind="pdf")
+        if kind == "binary":
+            return self.send(200, b"\x89PNG" + b"\0" * 20000, "image/png", kind="binary")
+        return self.send(200, page_body(self.site, page, kind), kind=kind)
+
+
+class CseHandler(BaseHTTPRequestHandler):
+    """Emulated customsearch/v1: deterministic results per (q, start)."""
+
+    protocol_version = "HTTP/1.1"
+    profile: Profile = None
+    sites: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        query = params.get("q", "")
+        num = int(params.get("num", 10))
+        start = int(params.get("start", 1))
+
+        time.sleep(max(0.0, self.profile.cse_latency_ms) / 1000)
+        if self.profile.roll() < self.profile.cse_error_rate:
+            body = json.dumps({"error": {"code": 429, "message": "Quota exceeded (bench)"}}).encode()
+            return self.send(429, body)
+
+        if query.startswith("site:"):
+            host = query.split()[0][len("site:"):]
+            items = [{"link": f"http://{host}/contact", "title": "Contact"}]
+        else:
+            rng = random.Random(f"{query}|{start}")
+            items = []
+            for _ in range(num):
+                site = rng.randrange(len(self.sites))
+                page = rng.randrange(PAGES_PER_SITE)
+                kind = page_kind(site, page)
+                item = {"link": f"{self.sites[site]}/dept/{page}", "title": f"Campus {site} page {page}"}
+                if kind == "pdf":
+                    item["link"] += ".pdf"
+                    item["mime"] = "application/pdf"
+                    item["fileFormat"] = "PDF/Adobe Acrobat"
+                elif rng.random() < URL_VARIANT_RATE:
+                    # Same page, spelled the way CSE sometimes returns it
+                    item["link"] += rng.choice(["/", "?utm_source=google", "#main"])
+                items.append(item)
+
+        self.send(200, json.dumps({"items": items}).encode())
+
+    def send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.profile.count("cse", len(body))
+
+
+class QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The scraper hangs up as soon as it has an email; that's expected
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def start_server(handler_class, **attrs) -> ThreadingHTTPServer:
+    handler = type(handler_class.__name__, (handler_class,), attrs)
+    server = QuietServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_stand_ins(profile: Profile, site_count: int):
+    """Start the fixture sites and the CSE endpoint; returns (servers, cse_url)."""
+    servers = [start_server(SiteHandler, profile=profile, site=i) for i in range(site_count)]
+    sites = [f"http://127.0.0.1:{server.server_port}" for server in servers]
+    cse = start_server(CseHandler, profile=profile, sites=sites)
+    servers.append(cse)
+    return servers, f"http://127.0.0.1:{cse.server_port}/customsearch/v1"
+
+
+# ---------------------------------------------------
+# Benchmark
+# ---------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["handler", "agent"], default="handler",
+                        help="book_scraper_handler over --agents agents, or run_agent for --agent")
+    parser.add_argument("--agents", type=int, default=10, help="number of agents (handler mode)")
+    parser.add_argument("--agent", default=None, help="agent name (agent mode, default: the first one)")
+    parser.add_argument("--engine", default="asyncio", choices=["asyncio", "sequential"])
+    parser.add_argument("--concurrency", type=int, default=None, help="max_concurrency / url_workers")
+    parser.add_argument("--sites", type=int, default=FIXTURE_SITES)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of page requests answered 503")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="share of page requests 5x slower")
+    parser.add_argument("--cse-latency-ms", type=float, default=120)
+    parser.add_argument("--cse-error-rate", type=float, default=0.0)
+    parser.add_argument("--dynamo-latency-ms", type=float, default=5)
+    parser.add_argument("--host-delay-ms", type=int, default=0, help="HOST_MIN_DELAY_MS for the run")
+    parser.add_argument("--cache", choices=["none", "sqlite"], default="none",
+                        help="scraper cache backend (sqlite uses a fresh temp file)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the report as JSON here")
+    parser.add_argument("--verbose", action="store_true", help="keep the handlers' INFO logging")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    profile = Profile(args.latency_ms, args.jitter_ms, args.error_rate, args.slow_rate,
+                      args.cse_latency_ms, args.cse_error_rate, args.seed)
+    servers, cse_url = start_stand_ins(profile, args.sites)
+    workdir = tempfile.mkdtemp(prefix="bench-scraper-")
+
+    dynamo = bench_support.MemoryDynamo(latency_ms=args.dynamo_latency_ms)
+    agents = bench_support.load_module(
+        "book_scraper",
+        env={
+            "GOOGLE_CSE_URL": cse_url,
+            "GOOGLE_API_KEY": "bench",
+            "GOOGLE_CX": "bench",
+            "SCRAPER_CACHE_BACKEND": args.cache,
+            "SCRAPER_CACHE_PATH": f"{workdir}/cache.sqlite3",
+            "ROBOTS_CACHE_DIR": f"{workdir}/robots",
+            "HOST_MIN_DELAY_MS": str(args.host_delay_ms),
+            "CSE_DAILY_BUDGET": "100000",
+        },
+        dynamo=dynamo,
+    )
+    if not args.verbose:
+        agents.logger.setLevel(logging.WARNING)
+
+    timer = bench_support.StageTimer()
+    timer.instrument(agents, STAGES)
+    agents.LeadWriter._write_batch = timer.wrap("batch_write", agents.LeadWriter._write_batch)
+
+    event = {"engine": args.engine}
+    if args.concurrency:
+        event["max_concurrency"] = args.concurrency
+        event["url_workers"] = args.concurrency
+    context = BenchContext(900)
+
+    print(f"Stand-ins: {args.sites} sites, CSE at {cse_url}")
+    with bench_support.measure() as measured:
+        if args.mode == "agent":
+            name = args.agent or next(iter(agents.AGENTS))
+            print(f"Running run_agent({name}) ...")
+            run = agents.begin_scrape_run()
+            result = agents.run_agent(name, event, context)
+            saved = result["saved"]
+            run_stats = run.summary()
+        else:
+            names = list(agents.AGENTS)[:args.agents]
+            print(f"Running book_scraper_handler over {len(names)} agents (engine={args.engine}) ...")
+            resp = agents.book_scraper_handler({"agent_names": names, **event}, context)
+            body = json.loads(resp["body"])
+            saved = body["total_saved"]
+            run_stats = body["run_stats"]
+
+    urls = len(timer.samples.get("result_total", []))
+    report = {
+        "mode": args.mode,
+        "engine": args.engine,
+        "seconds": round(measured["seconds"], 3),
+        "urls": urls,
+        "urls_per_sec": round(urls / measured["seconds"], 2) if measured["seconds"] else 0.0,
+        "leads_saved": saved,
+        "page_bytes_read": run_stats.get("page_bytes_read", 0),
+        "bytes_served": profile.bytes_sent,
+        "server_requests": profile.requests,
+        "dynamo_calls": sum(t.calls for t in dynamo.tables.values()),
+        "peak_traced_mb": round(measured["peak_traced_mb"], 2),
+        "max_rss_mb": round(measured["max_rss_mb"], 2),
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_ms": round(bench_support.percentile(values, 50) * 1000, 2),
+                "p95_ms": round(bench_support.percentile(values, 95) * 1000, 2),
+            }
+            for stage, values in timer.samples.items()
+        },
+        "run_stats": run_stats,
+    }
+
+    print()
+    print(f"Time:          {report['seconds']:.2f}s")
+    print(f"URLs:          {urls} ({report['urls_per_sec']:.1f}/s)")
+    print(f"Leads saved:   {saved}")
+    print(f"Bytes read:    {report['page_bytes_read']:,} of {profile.bytes_sent:,} served")
+    print(f"Requests:      {profile.requests}")
+    print(f"DynamoDB:      {report['dynamo_calls']} calls")
+    print(f"Peak memory:   {report['peak_traced_mb']:.1f} MB traced, {report['max_rss_mb']:.1f} MB max RSS")
+    print()
+    bench_support.print_stage_table(timer)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json_path}")
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Shared pieces for the offline benchmarks (bench_*.py): in-memory
+DynamoDB and SES stand-ins, a loader for the handler modules that never
+touches AWS, and latency / report helpers.
+"""
+import importlib
+import math
+import os
+import re
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+# ---------------------------------------------------
+# In-memory DynamoDB stand-in
+# ---------------------------------------------------
+
+class MemoryClient:
+    """The slice of the DynamoDB client API the Lambdas use (batch writes)."""
+
+    def __init__(self, tables: dict):
+        self.tables = tables
+
+    def batch_write_item(self, RequestItems):
+        for name, requests in RequestItems.items():
+            table = self.tables[name]
+            table.delay()
+            for request in requests:
+                table.store(request["PutRequest"]["Item"])
+        return {"UnprocessedItems": {}}
+
+
+# DynamoDB pricing units and limits
+READ_UNIT_BYTES = 4096
+WRITE_UNIT_BYTES = 1024
+SCAN_PAGE_BYTES = 1024 * 1024
+
+
+def item_size(item: dict) -> int:
+    """Approximate DynamoDB item size: attribute names plus values."""
+    size = 0
+    for name, value in item.items():
+        size += len(name)
+        if isinstance(value, str):
+            size += len(value.encode("utf-8"))
+        elif isinstance(value, bool) or value is None:
+            size += 1
+        else:
+            size += len(str(value)) // 2 + 1
+    return size
+
+
+class MemoryTable:
+    """
+    Dict-backed stand-in for a boto3 DynamoDB Table. Every call sleeps
+    `latency_ms` to approximate a network round trip, and consumed
+    capacity is tallied like DynamoDB would (eventually consistent
+    reads, scans paged at 1 MB).
+    """
+
+    def __init__(self, name: str, key: str, tables: dict, latency_ms: float = 0):
+        self.name = name
+        self.key = key
+        self.latency_ms = latency_ms
+        self.items: dict[str, dict] = {}
+        self.calls = 0
+        self.read_units = 0.0
+        self.write_units = 0
+        self.items_scanned = 0
+        self.scan_pages = 0
+        self._sizes: dict[str, int] = {}
+        # Scan order, rebuilt after new keys are added
+        self._order: list | None = None
+        self._position: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.meta = type("Meta", (), {"client": MemoryClient(tables)})()
+
+    def delay(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def store(self, item: dict):
+        """Write an item without latency or accounting (seeding, batch writes)."""
+        size = item_size(item)
+        with self._lock:
+            key = item[self.key]
+            if key not in self.items:
+                self._order = None
+            self.items[key] = dict(item)
+            self._sizes[key] = size
+            self.write_units += math.ceil(size / WRITE_UNIT_BYTES)
+
+    def load(self, items):
+        """Seed the table with items it may keep as-is (not counted as consumed capacity)."""
+        with self._lock:
+            for item in items:
+                key = item[self.key]
+                self.items[key] = item
+                self._sizes[key] = item_size(item)
+            self._order = None
+
+    def get_item(self, Key, **kwargs):
+        self.delay()
+        with self._lock:
+            item = self.items.get(Key[self.key])
+            if item:
+                self.read_units += math.ceil(self._sizes[Key[self.key]] / READ_UNIT_BYTES) / 2
+        return {"Item": dict(item)} if item else {}
+
+    def put_item(self, Item, **kwargs):
+        self.delay()
+        self.store(Item)
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues=None,
+                    ExpressionAttributeNames=None, ConditionExpression=None, **kwargs):
+        """
+        Plain "SET a = :v, ...", "ADD a :n" (numbers or sets) and "REMOVE a"
+        clauses; the only conditions evaluated are attribute_exists /
+        attribute_not_exists on the key, functions are not evaluated.
+        """
+        self.delay()
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues or {}
+        clauses = re.findall(r"(SET|ADD|REMOVE)\s+(.*?)(?=\s+(?:SET|ADD|REMOVE)\s|$)", UpdateExpression)
+
+        updated = {}
+        with self._lock:
+            exists = Key[self.key] in self.items
+            if ConditionExpression in (f"attribute_exists({self.key})", f"attribute_not_exists({self.key})") \
+                    and exists != ConditionExpression.startswith("attribute_exists"):
+                import botocore.exceptions
+
+                raise botocore.exceptions.ClientError(
+                    {"Error": {"Code": "ConditionalCheckFailedException", "Message": "The conditional request failed"}},
+                    "UpdateItem",
+                )
+            if not exists:
+                self._order = None
+            item = self.items.setdefault(Key[self.key], dict(Key))
+            for action, clause in clauses:
+                for part in clause.split(","):
+                    part = part.strip()
+                    if action == "SET":
+                        attr, value = (p.strip() for p in part.split("=", 1))
+                        attr = names.get(attr, attr)
+                        item[attr] = values[value]
+                    elif action == "ADD":
+                        attr, value = part.split()
+                        attr = names.get(attr, attr)
+                        if isinstance(values[value], set):
+                            item[attr] = item.get(attr, set()) | values[value]
+                        else:
+                            item[attr] = item.get(attr, 0) + values[value]
+                    else:
+                        attr = names.get(part, part)
+                        item.pop(attr, None)
+                    updated[attr] = item.get(attr)
+            self._sizes[Key[self.key]] = size = item_size(item)
+            self.write_units += math.ceil(size / WRITE_UNIT_BYTES)
+        return {"Attributes": updated}
+
+    def delete_item(self, Key, **kwargs):
+        self.delay()
+        with self._lock:
+            if self.items.pop(Key[self.key], None) is not None:
+                self._sizes.pop(Key[self.key])
+                self._order = None
+        return {}
+
+    def query(self, KeyConditionExpression, ExpressionAttributeValues, IndexName=None,
+              Limit: int | None = None, **kwargs):
+        """
+        A single "attr = :v" key condition, on the table or any index
+        (matched by a full pass, read units counted as if indexed).
+        """
+        self.delay()
+        attr, value = (p.strip() for p in KeyConditionExpression.split("=", 1))
+        value = ExpressionAttributeValues[value]
+        with self._lock:
+            page = [dict(item) for item in self.items.values() if item.get(attr) == value][:Limit]
+            self.read_units += max(1, math.ceil(sum(item_size(item) for item in page) / READ_UNIT_BYTES)) / 2
+        return {"Items": page, "Count": len(page), "ScannedCount": len(page)}
+
+    def scan(self, Limit: int | None = None, ExclusiveStartKey=None, **kwargs):
+        """
+        One page: up to Limit items or 1 MB, whichever comes first.
+        Filter / projection expressions are not evaluated.
+        """
+        self.delay()
+        with self._lock:
+            if self._order is None:
+                self._order = list(self.items)
+                self._position = {key: i for i, key in enumerate(self._order)}
+            start = self._position[ExclusiveStartKey[self.key]] + 1 if ExclusiveStartKey else 0
+
+            page = []
+            page_bytes = 0
+            end = start
+            while end < len(self._order) and page_bytes < SCAN_PAGE_BYTES and (Limit is None or len(page) < Limit):
+                key = self._order[end]
+                page.append(dict(self.items[key]))
+                page_bytes += self._sizes[key]
+                end += 1
+
+            self.items_scanned += len(page)
+            self.scan_pages += 1
+            self.read_units += math.ceil(page_bytes / READ_UNIT_BYTES) / 2
+
+        resp = {"Items": page, "Count": len(page), "ScannedCount": len(page)}
+        if end < len(self._order):
+            resp["LastEvaluatedKey"] = {self.key: page[-1][self.key]}
+        return resp
+
+
+class MemorySes:
+    """SES client stand-in: counts send_email calls, sleeping `latency_ms` each."""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def send_email(self, **kwargs):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        with self._lock:
+            self.sent += 1
+        return {"MessageId": f"bench-{self.sent}"}
+
+
+class MemoryDynamo:
+    """A set of MemoryTables sharing one client, created on first use."""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+        self.tables: dict[str, MemoryTable] = {}
+        self._lock = threading.Lock()
+
+    def Table(self, name: str, key: str = "id") -> MemoryTable:
+        with self._lock:
+            if name not in self.tables:
+                self.tables[name] = MemoryTable(name, key, self.tables, self.latency_ms)
+            return self.tables[name]
+
+
+# ---------------------------------------------------
+# Handler module loader
+# ---------------------------------------------------
+
+def load_module(name: str, env: dict | None = None, dynamo: MemoryDynamo | None = None,
+                ses: MemorySes | None = None):
+    """
+    Import handler module `name` (book_scraper, book_outreach,
+    book_reply_report) with `env` applied, and swap book_core's DynamoDB
+    tables / SES client for the stand-ins. Dummy AWS settings keep boto3
+    from looking for real credentials; nothing here talks to AWS.
+
+    Configuration is read at import, so `env` only applies to modules
+    this process hasn't imported yet.
+    """
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    os.environ.update(env or {})
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    module = importlib.import_module(name)
+    core = importlib.import_module("book_core")
+
+    if dynamo is not None:
+        cache_table = getattr(module, "CACHE_TABLE_NAME", None)
+
+        def get_dynamo_table(table_name: str):
+            return dynamo.Table(table_name, key="pk" if table_name == cache_table else "id")
+
+        core.table = dynamo.Table(core.TABLE_NAME)
+        # Handler modules hold their own reference to it (from book_core import ...)
+        for target in (core, module):
+            if hasattr(target, "get_dynamo_table"):
+                target.get_dynamo_table = get_dynamo_table
+    if ses is not None:
+        core.ses = ses
+    return module
+
+
+# ---------------------------------------------------
+# Measurements
+# ---------------------------------------------------
+
+class StageTimer:
+    """Wall-clock latency samples per named stage (thread-safe)."""
+
+    def __init__(self):
+        self.samples: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage: str, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        return timed
+
+    def instrument(self, module, stages: dict):
+        """Replace module.<attr> with a timed wrapper for each {stage: attr}."""
+        for stage, attr in stages.items():
+            setattr(module, attr, self.wrap(stage, getattr(module, attr)))
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest rank
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def current_rss_mb() -> float:
+    """Resident set size right now (Linux), else the peak so far."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return max_rss_mb()
+
+
+def max_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+@contextmanager
+def measure(trace: bool = True):
+    """
+    Time a block; yields a dict filled in on exit with seconds,
+    max_rss_mb and (with trace, which slows allocation-heavy code
+    down) peak_traced_mb, the peak of Python allocations in the block.
+    """
+    result = {}
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+        if trace:
+            result["peak_traced_mb"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+        result["max_rss_mb"] = max_rss_mb()
+
+
+def print_stage_table(timer: StageTimer):
+    print(f"{'stage':<18}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for stage, values in timer.samples.items():
+        print(
+            f"{stage:<18}{len(values):>8}"
+            f"{percentile(values, 50) * 1000:>10.1f}"
+            f"{percentile(values, 95) * 1000:>10.1f}"
+            f"{max(values) * 1000:>10.1f}"
+        )
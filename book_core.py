@@ -0,0 +1,308 @@
+"""
+Shared core of the book Lambdas: logging, common configuration, the
+AWS clients (created on first use), the leads-table / SES helpers and
+the batched lead writer.
+
+Each function has its own entry module - book_scraper, book_outreach,
+book_reply_report - and is deployed as its own bundle (build_lambdas.py),
+so it only imports and ships what it runs.
+"""
+import os
+import json
+import time
+import random
+import logging
+import threading
+from datetime import datetime
+
+from zoneinfo import ZoneInfo
+
+import botocore.exceptions
+
+import metrics
+
+# ---------------------------------------------------
+# Logging setup
+# ---------------------------------------------------
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# ---------------------------------------------------
+# Environment / configuration
+# ---------------------------------------------------
+
+# New table for book leads
+TABLE_NAME = os.getenv("TABLE_NAME", "book-leads-v1")
+
+# Email configuration
+SES_REGION = os.getenv("SES_REGION", "us-east-1")
+FROM_EMAIL = os.getenv("FROM_EMAIL")  # must be verified in SES
+REPORT_EMAIL = os.getenv("REPORT_EMAIL", FROM_EMAIL or "")
+
+CAMPAIGN_LABEL = os.getenv("CAMPAIGN_LABEL", "BookAgents50")
+
+# Lead writes are buffered into BatchWriteItem calls (25 items max per
+# call); unprocessed items are retried with backoff, and the buffer is
+# written straight through once the Lambda is this close to its deadline
+BATCH_WRITE_MAX_RETRIES = int(os.getenv("BATCH_WRITE_MAX_RETRIES", "5"))
+FLUSH_BEFORE_DEADLINE_MS = int(os.getenv("FLUSH_BEFORE_DEADLINE_MS", "30000"))
+
+
+def eastern_tz() -> ZoneInfo:
+    """Outreach timezone. ZoneInfo caches instances by key, so tzdata is read once."""
+    return ZoneInfo("US/Eastern")
+
+# ---------------------------------------------------
+# AWS clients (created on first use, kept for warm invocations)
+# ---------------------------------------------------
+
+# Each function only pays for what it uses: the scraper never sends
+# through SES, and boto3 itself is imported by the first client.
+dynamodb = None
+table = None
+ses = None
+_clients_lock = threading.Lock()
+
+
+def get_dynamodb():
+    """The DynamoDB resource; only its client is used (see DynamoTable)."""
+    global dynamodb
+    if dynamodb is None:
+        with _clients_lock:
+            if dynamodb is None:
+                with metrics.timer("client_init", Client="dynamodb"):
+                    import boto3
+                    dynamodb = boto3.resource("dynamodb")
+    return dynamodb
+
+
+def get_ses_client():
+    global ses
+    if ses is None:
+        with metrics.timer("client_init", Client="ses"):
+            import boto3
+            ses = boto3.client("ses", region_name=SES_REGION)
+    return ses
+
+
+class DynamoTable:
+    """
+    The slice of boto3's Table API the functions use (get_item, put_item,
+    update_item, query, scan, batch_writer), on the process-wide client.
+
+    boto3 resources aren't thread-safe but clients are, so every worker
+    thread shares this one instead of building its own session and
+    resource. The resource's client still converts plain Python values
+    to and from DynamoDB's typed JSON.
+    """
+
+    OPERATIONS = ("get_item", "put_item", "update_item", "delete_item", "query", "scan")
+
+    def __init__(self, client, name: str):
+        self.name = name
+        self.meta = type("Meta", (), {"client": client})()
+
+    def __getattr__(self, operation: str):
+        if operation not in self.OPERATIONS:
+            raise AttributeError(operation)
+        method = getattr(self.meta.client, operation)
+        return lambda **kwargs: method(TableName=self.name, **kwargs)
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        from boto3.dynamodb.table import BatchWriter
+        return BatchWriter(self.name, self.meta.client, overwrite_by_pkeys=overwrite_by_pkeys)
+
+
+_tables: dict[str, DynamoTable] = {}
+
+
+def get_dynamo_table(name: str) -> DynamoTable:
+    """DynamoDB table `name`, shared by every thread."""
+    found = _tables.get(name)
+    if found is None:
+        client = get_dynamodb().meta.client
+        with _clients_lock:
+            found = _tables.setdefault(name, DynamoTable(client, name))
+    return found
+
+
+def get_table():
+    """DynamoDB leads table (shared by every thread)."""
+    global table
+    if table is None:
+        table = get_dynamo_table(TABLE_NAME)
+    return table
+
+
+def make_response(body: dict, status_code: int = 200) -> dict:
+    return {
+        "statusCode": status_code,
+        "body": json.dumps(body),
+    }
+
+# ---------------------------------------------------
+# Leads table / SES helpers (outreach and reports)
+# ---------------------------------------------------
+
+def now_eastern() -> datetime:
+    return datetime.now(tz=eastern_tz())
+
+
+def scan_all_items():
+    items = []
+    leads = get_table()
+    with metrics.timer("dynamo_scan"):
+        resp = leads.scan()
+    items.extend(resp.get("Items", []))
+    while "LastEvaluatedKey" in resp:
+        with metrics.timer("dynamo_scan"):
+            resp = leads.scan(ExclusiveStartKey=resp["LastEvaluatedKey"])
+        items.extend(resp.get("Items", []))
+    metrics.put("ItemsScanned", len(items))
+    return items
+
+
+def normalize_email(email) -> str:
+    """Form of contact_email used to tell contacts apart (contact_email_norm)."""
+    return (email or "").strip().lower()
+
+
+def sequence_rank(item: dict) -> tuple:
+    """Sort key for leads sharing a contact: furthest along the outreach
+    sequence first, then earliest scraped."""
+    return (int(item.get("sequence_step", 0)), -int(item.get("scraped_at", 0)))
+
+
+def parse_timestamp(value):
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, tz=eastern_tz())
+        if isinstance(value, str):
+            v = value
+            if v.endswith("Z"):
+                v = v[:-1] + "+00:00"
+            return datetime.fromisoformat(v).astimezone(eastern_tz())
+    except Exception:
+        return None
+    return None
+
+
+def send_ses_email(to_email: str, subject: str, body: str) -> bool:
+    if not FROM_EMAIL:
+        logger.error("FROM_EMAIL is not configured.")
+        return False
+    try:
+        with metrics.timer("ses_send"):
+            get_ses_client().send_email(
+                Source=FROM_EMAIL,
+                Destination={"ToAddresses": [to_email]},
+                Message={
+                    "Subject": {"Data": subject, "Charset": "UTF-8"},
+                    "Body": {"Text": {"Data": body, "Charset": "UTF-8"}},
+                },
+            )
+        logger.info(f"Sent SES email to {to_email} with subject '{subject}'")
+        return True
+    except botocore.exceptions.ClientError as e:
+        logger.error(f"Error sending SES email to {to_email}: {e}")
+        return False
+
+# ---------------------------------------------------
+# Batched lead writes (scraper and SGA agent)
+# ---------------------------------------------------
+
+def remaining_ms(lambda_context) -> float:
+    """Milliseconds left in this invocation (infinite outside Lambda)."""
+    if lambda_context is None or not hasattr(lambda_context, "get_remaining_time_in_millis"):
+        return float("inf")
+    return lambda_context.get_remaining_time_in_millis()
+
+
+class LeadWriter:
+    """
+    Buffers one agent's lead items and writes them to DynamoDB with
+    BatchWriteItem (up to 25 items per call), to the leads table or
+    `table_name` (the SGA agent's own table).
+
+    `saved` only counts items DynamoDB actually accepted, so call
+    flush() before reading it.
+    """
+
+    BATCH_SIZE = 25
+
+    def __init__(self, agent_name: str, lambda_context=None, table_name: str = TABLE_NAME):
+        self.agent_name = agent_name
+        self.table_name = table_name
+        self.lambda_context = lambda_context
+        self.saved = 0
+        self.failed = 0
+        self._buffer: dict[str, dict] = {}
+        self._seen_ids: set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, item: dict) -> bool:
+        """Queue an item. Returns False if this id was already queued in this run."""
+        with self._lock:
+            if item["id"] in self._seen_ids:
+                return False
+            self._seen_ids.add(item["id"])
+            self._buffer[item["id"]] = item
+            should_flush = (
+                len(self._buffer) >= self.BATCH_SIZE
+                or remaining_ms(self.lambda_context) < FLUSH_BEFORE_DEADLINE_MS
+            )
+
+        if should_flush:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write everything buffered so far. Returns how many items were saved."""
+        with self._lock:
+            items = list(self._buffer.values())
+            self._buffer = {}
+
+        written = 0
+        for i in range(0, len(items), self.BATCH_SIZE):
+            written += self._write_batch(items[i:i + self.BATCH_SIZE])
+
+        with self._lock:
+            self.saved += written
+            self.failed += len(items) - written
+        return written
+
+    def _write_batch(self, items: list) -> int:
+        requests = [{"PutRequest": {"Item": item}} for item in items]
+        client = get_dynamo_table(self.table_name).meta.client
+
+        for attempt in range(BATCH_WRITE_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(min(0.05 * (2 ** attempt), 2.0) + random.uniform(0, 0.05))
+            try:
+                with metrics.timer("dynamo_write"):
+                    resp = client.batch_write_item(RequestItems={self.table_name: requests})
+            except botocore.exceptions.ClientError as e:
+                logger.error(f"[{self.agent_name}] Error saving batch to DynamoDB: {e}")
+                continue
+
+            requests = resp.get("UnprocessedItems", {}).get(self.table_name, [])
+            if not requests:
+                return len(items)
+
+        logger.error(
+            f"[{self.agent_name}] {len(requests)} of {len(items)} items not saved "
+            f"after {BATCH_WRITE_MAX_RETRIES} retries"
+        )
+        return len(items) - len(requests)
+
+# ---------------------------------------------------
+# Cold start
+# ---------------------------------------------------
+
+def report_init(module: str, started: float):
+    """Log an entry module's init time and hand it to metrics (InitDuration)."""
+    seconds = time.perf_counter() - started
+    logger.info(f"Cold start: {module} initialized in {seconds * 1000:.0f} ms")
+    metrics.record_init(seconds)
@@ -0,0 +1,463 @@
+"""
+Daily outreach Lambda (book-daily-outreach): emails new leads the
+3-step book sequence on business days, within the daily and per-domain
+caps, and sends a summary to REPORT_EMAIL.
+
+Handler: book_outreach.book_daily_outreach_handler
+"""
+import time
+
+# Module init (imports + config) is timed and reported on cold start
+_init_started = time.perf_counter()
+
+import os
+import random
+from datetime import datetime, timedelta
+
+import botocore.exceptions
+
+import metrics
+import profiling
+from book_core import (
+    CAMPAIGN_LABEL,
+    FROM_EMAIL,
+    REPORT_EMAIL,
+    eastern_tz,
+    get_table,
+    logger,
+    make_response,
+    normalize_email,
+    now_eastern,
+    parse_timestamp,
+    report_init,
+    scan_all_items,
+    send_ses_email,
+    sequence_rank,
+)
+
+# ---------------------------------------------------
+# Environment / configuration
+# ---------------------------------------------------
+
+TEST_MODE = os.getenv("TEST_MODE", "false").lower() == "true"
+TEST_RECIPIENT_EMAIL = os.getenv("TEST_RECIPIENT_EMAIL", REPORT_EMAIL or FROM_EMAIL or "")
+
+# When real outreach should start
+GO_LIVE_DATE_STR = os.getenv("GO_LIVE_DATE", "2026-01-06")
+
+# Sending caps
+DAILY_TOTAL_LIMIT = int(os.getenv("DAILY_TOTAL_LIMIT", "50"))
+MAX_PER_DOMAIN_PER_DAY = int(os.getenv("MAX_PER_DOMAIN_PER_DAY", "3"))
+# Random pause between outreach emails, in seconds
+SEND_DELAY_MIN_SECONDS = float(os.getenv("SEND_DELAY_MIN_SECONDS", "1"))
+SEND_DELAY_MAX_SECONDS = float(os.getenv("SEND_DELAY_MAX_SECONDS", "3"))
+
+# 3-step follow-up sequence (your choice 2B)
+MAX_SEQUENCE_STEPS = int(os.getenv("MAX_SEQUENCE_STEPS", "3"))
+INITIAL_FOLLOWUP_DAYS = int(os.getenv("INITIAL_FOLLOWUP_DAYS", "5"))
+FOLLOWUP_INTERVAL_DAYS = int(os.getenv("FOLLOWUP_INTERVAL_DAYS", "7"))
+
+# Email filters
+ONLY_EDU_EMAILS = os.getenv("ONLY_EDU_EMAILS", "false").lower() == "true"
+
+# PDF download URL for the free resource
+PDF_URL = os.getenv(
+    "PDF_URL",
+    "https://YOURDOMAIN.com/path/to/5-student-success-shifts.pdf",  # replace later
+)
+
+try:
+    GO_LIVE_DATE = datetime.strptime(GO_LIVE_DATE_STR, "%Y-%m-%d").date()
+except ValueError:
+    GO_LIVE_DATE = datetime(2026, 1, 6).date()
+
+# ---------------------------------------------------
+# Outreach helpers (weekdays, holidays)
+# ---------------------------------------------------
+
+def is_weekday(date_obj) -> bool:
+    return date_obj.weekday() < 5  # Monday=0, Sunday=6
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int):
+    dt = datetime(year, month, 1, tzinfo=eastern_tz())
+    while dt.weekday() != weekday:
+        dt += timedelta(days=1)
+    dt += timedelta(days=7 * (n - 1))
+    return dt.date()
+
+
+def last_weekday(year: int, month: int, weekday: int):
+    if month == 12:
+        dt = datetime(year + 1, 1, 1, tzinfo=eastern_tz()) - timedelta(days=1)
+    else:
+        dt = datetime(year, month + 1, 1, tzinfo=eastern_tz()) - timedelta(days=1)
+    while dt.weekday() != weekday:
+        dt -= timedelta(days=1)
+    return dt.date()
+
+
+def observed_date(fixed_date):
+    if fixed_date.weekday() == 5:  # Saturday
+        return fixed_date - timedelta(days=1)
+    if fixed_date.weekday() == 6:  # Sunday
+        return fixed_date + timedelta(days=1)
+    return fixed_date
+
+
+def is_us_federal_holiday(date_obj) -> bool:
+    year = date_obj.year
+    holidays = set()
+
+    new_year = observed_date(datetime(year, 1, 1, tzinfo=eastern_tz()).date())
+    holidays.add(new_year)
+
+    holidays.add(nth_weekday(year, 1, 0, 3))  # MLK Day
+    holidays.add(nth_weekday(year, 2, 0, 3))  # Presidents' Day
+    holidays.add(last_weekday(year, 5, 0))    # Memorial Day
+
+    juneteenth = observed_date(datetime(year, 6, 19, tzinfo=eastern_tz()).date())
+    holidays.add(juneteenth)
+
+    independence = observed_date(datetime(year, 7, 4, tzinfo=eastern_tz()).date())
+    holidays.add(independence)
+
+    holidays.add(nth_weekday(year, 9, 0, 1))  # Labor Day
+    holidays.add(nth_weekday(year, 10, 0, 2)) # Columbus / Indigenous Peoples' Day
+
+    veterans = observed_date(datetime(year, 11, 11, tzinfo=eastern_tz()).date())
+    holidays.add(veterans)
+
+    holidays.add(nth_weekday(year, 11, 3, 4)) # Thanksgiving
+
+    christmas = observed_date(datetime(year, 12, 25, tzinfo=eastern_tz()).date())
+    holidays.add(christmas)
+
+    return date_obj in holidays
+
+# ---------------------------------------------------
+# 3-step book outreach email sequence (Option 2B)
+# ---------------------------------------------------
+
+def compose_book_outreach_email(step_index: int):
+    """
+    step_index:
+      0 = first email
+      1 = 2nd (follow-up)
+      2+ = 3rd (last)
+    """
+    if step_index <= 0:
+        subject = "Free student success resource for your students"
+        body = (
+            "Good morning,\n\n"
+            "I hope you’re doing well.\n\n"
+            "I wanted to share a short, free resource I created called\n"
+            "\"5 Student Success Shifts: Simple Mindset Moves that Help Students Stay, Succeed, and Graduate.\"\n\n"
+            "Many colleges, TRIO programs, and high schools use it as a quick PDF to support\n"
+            "first-year students, bridge programs, and student success courses.\n\n"
+            f"You can download it here: {PDF_URL}\n\n"
+            "If you ever look for short, student-friendly books or resources to support\n"
+            "college success, retention, or leadership, I’d be happy to help.\n\n"
+            "Warm regards,\n"
+            "Tawan Perry\n"
+        )
+    elif step_index == 1:
+        subject = "Checking in about the student success PDF"
+        body = (
+            "Hello,\n\n"
+            "I’m just checking in to see if you had a chance to look at the\n"
+            "\"5 Student Success Shifts\" PDF I shared.\n\n"
+            "It’s designed so you can easily:\n"
+            "- Share it in first-year seminars or college success courses\n"
+            "- Use it with TRIO/GEAR UP/bridge programs\n"
+            "- Offer it as a quick pre-read before a workshop or orientation\n\n"
+            f"Here’s the link again: {PDF_URL}\n\n"
+            "If you’d like sample chapters or info on using one of my books as a\n"
+            "course or program text, I’d be glad to send that along.\n\n"
+            "Best,\n"
+            "Tawan\n"
+        )
+    else:
+        subject = "Last quick note about a free resource for your students"
+        body = (
+            "Good afternoon,\n\n"
+            "I promise this is my last quick note about the student success PDF.\n\n"
+            "If now isn’t a good time, no worries at all. I just wanted to make sure\n"
+            "you had the link in case it could support your students:\n\n"
+            f"{PDF_URL}\n\n"
+            "Whether you serve first-year students, TRIO participants, or high school\n"
+            "college readiness programs, I’m always glad to share practical resources\n"
+            "and discuss options for course- or program-wide book use.\n\n"
+            "Thank you for the work you do for students.\n\n"
+            "Warmly,\n"
+            "Tawan\n"
+        )
+
+    return subject, body
+
+
+def update_sequence_metadata(item_id: str, item: dict, new_step: int, sent_at_ts: int,
+                             subject: str, body: str):
+    update_expr_parts = [
+        "sequence_step = :step",
+        "last_email_sent_at = :last",
+        "last_email_subject = :subj",
+        "last_email_body = :body",
+    ]
+    expr_values = {
+        ":step": new_step,
+        ":last": sent_at_ts,
+        ":subj": subject,
+        ":body": body,
+    }
+
+    if "first_email_sent_at" not in item:
+        update_expr_parts.append("first_email_sent_at = :first")
+        expr_values[":first"] = sent_at_ts
+
+    if new_step >= MAX_SEQUENCE_STEPS:
+        update_expr_parts.append("sequence_completed = :completed")
+        expr_values[":completed"] = True
+
+    update_expr = "SET " + ", ".join(update_expr_parts)
+
+    try:
+        with metrics.timer("dynamo_write"):
+            get_table().update_item(
+                Key={"id": item_id},
+                UpdateExpression=update_expr,
+                ExpressionAttributeValues=expr_values,
+            )
+    except botocore.exceptions.ClientError as e:
+        logger.error(f"Error updating sequence metadata for id={item_id}: {e}")
+
+
+def contact_owners(items: list) -> dict:
+    """
+    {contact_email_norm: id of the lead that carries the sequence for
+    that address}: the one furthest along (see sequence_rank). Leads
+    saved before the scraper deduped by email, or by two shards at
+    once, share an address; only the owner is emailed, on any day.
+    """
+    owners: dict[str, dict] = {}
+    for item in items:
+        email_norm = item.get("contact_email_norm") or normalize_email(item.get("contact_email"))
+        if not email_norm:
+            continue
+        owner = owners.get(email_norm)
+        if owner is None or sequence_rank(item) > sequence_rank(owner):
+            owners[email_norm] = item
+    return {email_norm: item["id"] for email_norm, item in owners.items()}
+
+
+def build_daily_summary(today, sent_total, sent_by_step, sent_by_domain, details):
+    lines = []
+    lines.append(f"Date: {today.isoformat()} (US/Eastern)")
+    lines.append("")
+    lines.append(f"Campaign: {CAMPAIGN_LABEL}")
+    lines.append(f"Total outreach emails sent: {sent_total}")
+    lines.append("")
+
+    if sent_by_step:
+        lines.append("By sequence step:")
+        for step, count in sorted(sent_by_step.items()):
+            label = f"Email #{step}"
+            lines.append(f"  {label}: {count}")
+        lines.append("")
+
+    if sent_by_domain:
+        lines.append("By domain (top 15):")
+        for domain, count in sorted(
+            sent_by_domain.items(), key=lambda kv: kv[1], reverse=True
+        )[:15]:
+            lines.append(f"  {domain}: {count}")
+        lines.append("")
+
+    if details:
+        lines.append("Sample of emails sent today (up to 10):")
+        for d in details[:10]:
+            lines.append(
+                f"- {d['email']} | step {d['step']} | segment={d.get('segment','')} | {d['title'][:120]}"
+            )
+        lines.append("")
+
+    return "\n".join(lines)
+
+# ---------------------------------------------------
+# Book daily outreach handler (3-step sequence)
+# ---------------------------------------------------
+
+@metrics.invocation("book_daily_outreach_handler")
+@profiling.profiled("book_daily_outreach_handler")
+def book_daily_outreach_handler(event, context):
+    """
+    Trigger at ~8:30 AM Eastern, Mon–Fri.
+
+    - Uses the 3-step book/PDF sequence
+    - Sends up to DAILY_TOTAL_LIMIT emails (default 50)
+    - Respects MAX_PER_DOMAIN_PER_DAY
+    """
+    now = now_eastern()
+    today = now.date()
+
+    logger.info(f"[book_daily_outreach_handler] Invoked at {now.isoformat()}")
+
+    if not is_weekday(today):
+        logger.info("Today is weekend. Skipping outreach.")
+        return make_response({"message": "Weekend. No outreach sent."})
+
+    if is_us_federal_holiday(today):
+        logger.info("Today is a US federal holiday. Skipping outreach.")
+        return make_response({"message": "US federal holiday. No outreach sent."})
+
+    # Test mode: one sample email only to you
+    if TEST_MODE:
+        logger.info("TEST_MODE enabled. Sending sample email to test recipient only.")
+        if not TEST_RECIPIENT_EMAIL:
+            logger.error("TEST_RECIPIENT_EMAIL / REPORT_EMAIL not configured.")
+            return make_response(
+                {"message": "TEST_MODE but no test recipient configured."}, 500
+            )
+
+        subject, body = compose_book_outreach_email(step_index=0)
+        ok = send_ses_email(TEST_RECIPIENT_EMAIL, subject, body)
+        status = "sent" if ok else "failed"
+        return make_response(
+            {
+                "message": f"TEST_MODE: {status} sample email.",
+                "to": TEST_RECIPIENT_EMAIL,
+            }
+        )
+
+    if today < GO_LIVE_DATE:
+        logger.info(
+            f"Today ({today}) is before GO_LIVE_DATE ({GO_LIVE_DATE}). Skipping outreach."
+        )
+        return make_response(
+            {"message": "Before GO_LIVE_DATE. No outreach sent yet."}
+        )
+
+    items = scan_all_items()
+    logger.info(f"Scanned table, found {len(items)} items.")
+
+    sent_total = 0
+    sent_by_domain: dict[str, int] = {}
+    sent_by_step: dict[int, int] = {}
+    details = []
+    # One sequence per address, even if several leads share it
+    owners = contact_owners(items)
+
+    for item in items:
+        if sent_total >= DAILY_TOTAL_LIMIT:
+            break
+
+        email = item.get("contact_email")
+        if not email:
+            continue
+
+        email = email.strip()
+        if "@" not in email:
+            continue
+
+        domain = email.split("@")[-1].lower()
+
+        if owners.get(normalize_email(email)) != item["id"]:
+            continue
+
+        if ONLY_EDU_EMAILS and not domain.endswith(".edu"):
+            # You may want to set ONLY_EDU_EMAILS=false so HS / orgs are included
+            continue
+
+        if sent_by_domain.get(domain, 0) >= MAX_PER_DOMAIN_PER_DAY:
+            continue
+
+        if item.get("do_not_contact") or item.get("stop_sequence"):
+            continue
+        if item.get("sequence_completed"):
+            continue
+        if item.get("bounce_detected"):
+            continue
+
+        seq_step = int(item.get("sequence_step", 0))
+
+        if seq_step >= MAX_SEQUENCE_STEPS:
+            continue
+
+        first_sent = parse_timestamp(item.get("first_email_sent_at"))
+        if first_sent:
+            days_since_first = (today - first_sent.date()).days
+            if days_since_first > 30:
+                # 30-day rolloff
+                continue
+
+        # Decide if due today
+        if seq_step == 0:
+            due = True
+        else:
+            last_sent = parse_timestamp(item.get("last_email_sent_at"))
+            if not last_sent:
+                continue
+            days_since_last = (today - last_sent.date()).days
+            if seq_step == 1:
+                due = days_since_last >= INITIAL_FOLLOWUP_DAYS
+            else:
+                due = days_since_last >= FOLLOWUP_INTERVAL_DAYS
+
+        if not due:
+            continue
+
+        if sent_total >= DAILY_TOTAL_LIMIT:
+            break
+        if sent_by_domain.get(domain, 0) >= MAX_PER_DOMAIN_PER_DAY:
+            continue
+
+        subject, body = compose_book_outreach_email(seq_step)
+
+        # small delay
+        time.sleep(random.uniform(SEND_DELAY_MIN_SECONDS, SEND_DELAY_MAX_SECONDS))
+
+        if send_ses_email(email, subject, body):
+            sent_total += 1
+            sent_by_domain[domain] = sent_by_domain.get(domain, 0) + 1
+
+            step_number = seq_step + 1
+            sent_by_step[step_number] = sent_by_step.get(step_number, 0) + 1
+
+            now_ts = int(now.timestamp())
+            update_sequence_metadata(item["id"], item, seq_step + 1, now_ts, subject, body)
+
+            details.append(
+                {
+                    "id": item["id"],
+                    "email": email,
+                    "domain": domain,
+                    "step": step_number,
+                    "title": item.get("title", ""),
+                    "segment": item.get("segment", ""),
+                }
+            )
+
+    summary_text = build_daily_summary(today, sent_total, sent_by_step, sent_by_domain, details)
+    metrics.put("EmailsSent", sent_total)
+
+    if REPORT_EMAIL:
+        send_ses_email(
+            REPORT_EMAIL,
+            f"Daily Book Outreach Summary – {today.isoformat()}",
+            summary_text,
+        )
+
+    return make_response(
+        {
+            "message": "Daily book outreach completed.",
+            "sent_total": sent_total,
+            "by_step": sent_by_step,
+            "by_domain": sent_by_domain,
+        }
+    )
+
+# ---------------------------------------------------
+# Cold start
+# ---------------------------------------------------
+
+report_init("book_outreach", _init_started)
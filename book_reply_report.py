@@ -0,0 +1,143 @@
+"""
+Reply stats report Lambda (book-reply-stats-report): weekly or monthly
+report of manually marked replies, sent to REPORT_EMAIL.
+
+Handler: book_reply_report.book_reply_stats_report_handler
+"""
+import time
+
+# Module init (imports + config) is timed and reported on cold start
+_init_started = time.perf_counter()
+
+import os
+from datetime import timedelta
+
+import metrics
+import profiling
+from book_core import (
+    CAMPAIGN_LABEL,
+    REPORT_EMAIL,
+    logger,
+    make_response,
+    now_eastern,
+    parse_timestamp,
+    report_init,
+    scan_all_items,
+    send_ses_email,
+)
+
+# ---------------------------------------------------
+# Environment / configuration
+# ---------------------------------------------------
+
+# Reply stats period
+REPLY_REPORT_PERIOD = os.getenv("REPLY_REPORT_PERIOD", "weekly").lower()
+
+# ---------------------------------------------------
+# Reply stats report handler (weekly / monthly)
+# ---------------------------------------------------
+
+@metrics.invocation("book_reply_stats_report_handler")
+@profiling.profiled("book_reply_stats_report_handler")
+def book_reply_stats_report_handler(event, context):
+    """
+    Generate a weekly or monthly stats report based on
+    manually_replied = true and manually_replied_at timestamps.
+    """
+    now = now_eastern()
+    today = now.date()
+
+    if REPLY_REPORT_PERIOD == "monthly":
+        window_days = 30
+    else:
+        window_days = 7
+
+    start_date = today - timedelta(days=window_days)
+
+    logger.info(
+        f"[book_reply_stats_report_handler] Generating {REPLY_REPORT_PERIOD} report "
+        f"for replies between {start_date} and {today}"
+    )
+
+    items = scan_all_items()
+    total_replies = 0
+    replies_by_source: dict[str, int] = {}
+    replies_by_step: dict[int, int] = {}
+    fast_replies = 0  # <= 2 days from first email
+
+    for item in items:
+        if not item.get("manually_replied"):
+            continue
+
+        replied_at = parse_timestamp(item.get("manually_replied_at"))
+        if not replied_at:
+            continue
+
+        replied_date = replied_at.date()
+        if not (start_date <= replied_date <= today):
+            continue
+
+        total_replies += 1
+
+        source = item.get("source", "unknown")
+        replies_by_source[source] = replies_by_source.get(source, 0) + 1
+
+        step = int(item.get("sequence_step", 0))
+        replies_by_step[step] = replies_by_step.get(step, 0) + 1
+
+        first_sent = parse_timestamp(item.get("first_email_sent_at"))
+        if first_sent:
+            days_to_reply = (replied_date - first_sent.date()).days
+            if days_to_reply <= 2:
+                fast_replies += 1
+
+    lines = []
+    lines.append(
+        f"Reply stats report ({REPLY_REPORT_PERIOD}) – {today.isoformat()} (US/Eastern)"
+    )
+    lines.append("")
+    lines.append(f"Campaign: {CAMPAIGN_LABEL}")
+    lines.append(f"Window: last {window_days} days ({start_date} to {today})")
+    lines.append("")
+    lines.append(f"Total replies recorded: {total_replies}")
+    lines.append(f"Fast replies (<= 2 days from first email): {fast_replies}")
+    lines.append("")
+
+    if replies_by_source:
+        lines.append("Replies by agent/source (top 15):")
+        for src, count in sorted(
+            replies_by_source.items(), key=lambda kv: kv[1], reverse=True
+        )[:15]:
+            lines.append(f"  {src}: {count}")
+        lines.append("")
+
+    if replies_by_step:
+        lines.append("Replies by sequence email number:")
+        for step, count in sorted(replies_by_step.items()):
+            label = f"Email #{step}" if step > 0 else "Email #0 (pre-sequence?)"
+            lines.append(f"  {label}: {count}")
+        lines.append("")
+
+    report_body = "\n".join(lines)
+    metrics.put("Replies", total_replies)
+
+    if REPORT_EMAIL:
+        send_ses_email(
+            REPORT_EMAIL,
+            f"Book Outreach Reply Stats – {today.isoformat()}",
+            report_body,
+        )
+
+    return make_response(
+        {
+            "message": "Reply stats report generated.",
+            "total_replies": total_replies,
+            "window_days": window_days,
+        }
+    )
+
+# ---------------------------------------------------
+# Cold start
+# ---------------------------------------------------
+
+report_init("book_reply_report", _init_started)
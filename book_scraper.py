@@ -0,0 +1,2088 @@
+"""
+Scraper Lambda (book-agents-scraper): runs the book agents' Google CSE
+searches, fetches the result pages for contact emails and saves leads.
+
+Handler: book_scraper.book_scraper_handler
+"""
+import time
+
+# Module init (imports + config) is timed and reported on cold start
+_init_started = time.perf_counter()
+
+import os
+import json
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from datetime import datetime
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from zoneinfo import ZoneInfo
+
+import botocore.exceptions
+
+import contact_links
+import email_extract
+import http_pool
+import metrics
+import profiling
+import url_canon
+from book_core import (
+    CAMPAIGN_LABEL,
+    LeadWriter,
+    get_dynamo_table,
+    get_table,
+    logger,
+    make_response,
+    normalize_email,
+    remaining_ms,
+    report_init,
+)
+
+# ---------------------------------------------------
+# Environment / configuration
+# ---------------------------------------------------
+
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+GOOGLE_CX = os.getenv("GOOGLE_CX")
+# Overridable so the benchmarks can point the scraper at a local stand-in
+GOOGLE_CSE_URL = os.getenv("GOOGLE_CSE_URL", "https://www.googleapis.com/customsearch/v1")
+
+# Scraper concurrency: how many Google results of one agent are fetched /
+# processed at the same time (1 = old one-by-one behavior)
+SCRAPER_URL_WORKERS = int(os.getenv("SCRAPER_URL_WORKERS", "8"))
+
+# Run-ALL engine: "sequential" (one agent after another) or "asyncio"
+# (every agent on one event loop, at most SCRAPER_MAX_CONCURRENCY
+# searches/fetches in flight across all of them)
+SCRAPER_ENGINE = os.getenv("SCRAPER_ENGINE", "sequential").lower()
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "32"))
+
+# Fan-out dispatcher ({"mode": "dispatch"}): split AGENTS into this many
+# shards and invoke SCRAPER_FUNCTION_NAME once per shard, in parallel
+SCRAPER_DISPATCH_SHARDS = int(os.getenv("SCRAPER_DISPATCH_SHARDS", "10"))
+SCRAPER_FUNCTION_NAME = os.getenv("SCRAPER_FUNCTION_NAME") or os.getenv(
+    "AWS_LAMBDA_FUNCTION_NAME", "book-agents-scraper"
+)
+
+# Scraper runs stop starting new searches / page fetches this long before
+# the Lambda deadline, save a checkpoint (agent, query index, result
+# index) and let the next invocation resume from it. HTTP timeouts are
+# capped to the time left before that point.
+STOP_BEFORE_DEADLINE_MS = int(os.getenv("STOP_BEFORE_DEADLINE_MS", "60000"))
+HTTP_TIMEOUT_SECONDS = 15
+CHECKPOINT_TTL_DAYS = 7
+
+# Persistent scraper cache (HTTP validators, ...): "none", "dynamodb"
+# (CACHE_TABLE_NAME) or "sqlite" (SCRAPER_CACHE_PATH, local runs / tests)
+SCRAPER_CACHE_BACKEND = os.getenv("SCRAPER_CACHE_BACKEND", "none").lower()
+CACHE_TABLE_NAME = os.getenv("CACHE_TABLE_NAME", "book-scraper-cache-v1")
+SCRAPER_CACHE_PATH = os.getenv("SCRAPER_CACHE_PATH", "/tmp/book-scraper-cache.sqlite3")
+
+# How long a page's ETag / Last-Modified + extracted email is kept
+HTTP_CACHE_TTL_DAYS = int(os.getenv("HTTP_CACHE_TTL_DAYS", "30"))
+
+# Result pages are streamed: read PAGE_CHUNK_BYTES at a time, stop (and
+# drop the connection) at the first email or after PAGE_MAX_BYTES
+PAGE_MAX_BYTES = int(os.getenv("PAGE_MAX_BYTES", str(2 * 1024 * 1024)))
+PAGE_CHUNK_BYTES = int(os.getenv("PAGE_CHUNK_BYTES", "16384"))
+
+# Pre-filter: results that can't be an HTML page with a contact email are
+# skipped before downloading, by URL extension or CSE mime/fileFormat, or
+# right after the response headers, by Content-Type / Content-Length
+SKIP_URL_EXTENSIONS = frozenset({
+    "pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx", "rtf", "odt", "ods", "odp",
+    "zip", "gz", "rar", "7z", "exe", "dmg",
+    "jpg", "jpeg", "png", "gif", "svg", "webp", "bmp", "tif", "tiff", "ico",
+    "mp3", "mp4", "m4a", "mov", "avi", "wmv", "wav",
+})
+PAGE_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+PAGE_MAX_CONTENT_LENGTH = int(os.getenv("PAGE_MAX_CONTENT_LENGTH", str(5 * 1024 * 1024)))
+
+# How long a Google CSE response is reused (0 = always call the API).
+# Agents can override it with "cse_cache_ttl_hours": a number for all
+# of their queries, or a {query: hours} dict.
+CSE_CACHE_TTL_HOURS = float(os.getenv("CSE_CACHE_TTL_HOURS", "72"))
+
+# Domain fallback results: a found email is kept longer than a
+# "no email on this domain" answer
+DOMAIN_EMAIL_TTL_DAYS = int(os.getenv("DOMAIN_EMAIL_TTL_DAYS", "30"))
+DOMAIN_NO_EMAIL_TTL_DAYS = int(os.getenv("DOMAIN_NO_EMAIL_TTL_DAYS", "3"))
+
+# Leads-table GSI on contact_email_norm (dynamo.tf): a lead whose email
+# is already in the table is attached to that contact instead of saved
+# again, and an attachment marker is left under its own id so later runs
+# skip the URL ("" = no contact dedup, e.g. a table without the index)
+CONTACT_EMAIL_INDEX = os.getenv("CONTACT_EMAIL_INDEX", "contact_email-index")
+
+# Before the domain fallback, follow up to this many same-host
+# "Contact / Staff / Directory" links from a page without an email
+# (one hop, no CSE call; 0 = go straight to the fallback)
+CONTACT_DISCOVERY_MAX_PAGES = int(os.getenv("CONTACT_DISCOVERY_MAX_PAGES", "2"))
+
+# Per-host politeness for page fetches: at most MAX_REQUESTS_PER_HOST at
+# once and HOST_MIN_DELAY_MS between request starts (a larger robots.txt
+# Crawl-delay wins, up to HOST_MAX_DELAY_MS); robots.txt rules are cached
+# in memory and in ROBOTS_CACHE_DIR (ROBOTS_ERROR_TTL_MINUTES when the
+# robots.txt fetch failed or the server answered 5xx)
+MAX_REQUESTS_PER_HOST = int(os.getenv("MAX_REQUESTS_PER_HOST", "2"))
+HOST_MIN_DELAY_MS = int(os.getenv("HOST_MIN_DELAY_MS", "500"))
+HOST_MAX_DELAY_MS = int(os.getenv("HOST_MAX_DELAY_MS", "10000"))
+RESPECT_ROBOTS_TXT = os.getenv("RESPECT_ROBOTS_TXT", "true").lower() == "true"
+ROBOTS_CACHE_DIR = os.getenv("ROBOTS_CACHE_DIR", "/tmp/book-agents-robots")
+ROBOTS_CACHE_TTL_HOURS = float(os.getenv("ROBOTS_CACHE_TTL_HOURS", "24"))
+ROBOTS_ERROR_TTL_MINUTES = float(os.getenv("ROBOTS_ERROR_TTL_MINUTES", "60"))
+ROBOTS_USER_AGENT = "BookAgents"
+
+# Google CSE daily quota (resets at midnight Pacific). Planned queries
+# get the budget minus CSE_FALLBACK_RESERVE (a fraction kept for domain
+# fallback searches); when they don't fit, the lowest-yield queries
+# (new leads saved per search, historically) are skipped first.
+CSE_DAILY_BUDGET = int(os.getenv("CSE_DAILY_BUDGET", "100"))
+CSE_FALLBACK_RESERVE = float(os.getenv("CSE_FALLBACK_RESERVE", "0.25"))
+
+# Adaptive pagination: a query whose page brought new leads gets its next
+# page (CSE `start`) searched, up to CSE_MAX_PAGES_PER_RUN pages per run;
+# the cursor is persisted so the next run picks up where this one
+# stopped. A page of only duplicates sends the query back to page 1.
+CSE_MAX_PAGES_PER_RUN = int(os.getenv("CSE_MAX_PAGES_PER_RUN", "3"))
+CSE_MAX_RESULTS = 100  # CSE never returns results past #100
+
+
+def cse_quota_tz() -> ZoneInfo:
+    """The CSE quota resets at midnight Pacific."""
+    return ZoneInfo("America/Los_Angeles")
+
+# ---------------------------------------------------
+# 50 BOOK AGENTS – categories & queries (agents_config.py)
+# ---------------------------------------------------
+
+def get_agents() -> dict:
+    """The agent config, imported on first use; outreach and reports never need it."""
+    import agents_config
+    return agents_config.AGENTS
+
+
+def agent_segment(agent_name: str, cfg: dict) -> str:
+    """An agent's segment; its name minus "_agent" when the config has none."""
+    return cfg.get("segment", agent_name.replace("_agent", ""))
+
+
+def __getattr__(name):
+    # book_scraper.AGENTS / lambda.AGENTS still work for callers outside this module
+    if name == "AGENTS":
+        return get_agents()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ---------------------------------------------------
+# Persistent scraper cache (pluggable backend)
+# ---------------------------------------------------
+
+class NullCacheStore:
+    """Cache backend that never remembers anything (SCRAPER_CACHE_BACKEND=none)."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def get(self, key: str) -> dict | None:
+        return None
+
+    def put(self, key: str, record: dict, ttl_seconds: int | None = None):
+        pass
+
+    def get_count(self, key: str) -> int:
+        return 0
+
+    def incr(self, key: str, amount: int = 1, ttl_seconds: int | None = None) -> int:
+        return amount
+
+
+class DynamoCacheStore:
+    """
+    Cache records in CACHE_TABLE_NAME: pk = "<namespace>#<key>", the
+    record as a JSON string in "data", and "expires_at" (DynamoDB TTL).
+    """
+
+    def __init__(self, namespace: str, table_name: str = CACHE_TABLE_NAME):
+        self.namespace = namespace
+        self.table_name = table_name
+
+    def _pk(self, key: str) -> str:
+        return f"{self.namespace}#{key}"
+
+    def get(self, key: str) -> dict | None:
+        try:
+            resp = get_dynamo_table(self.table_name).get_item(Key={"pk": self._pk(key)})
+        except botocore.exceptions.ClientError as e:
+            logger.warning(f"Error reading cache {self._pk(key)}: {e}")
+            return None
+
+        item = resp.get("Item")
+        if not item:
+            return None
+        # DynamoDB TTL deletes lazily, so check expiry ourselves too
+        expires_at = item.get("expires_at")
+        if expires_at is not None and int(expires_at) <= time.time():
+            return None
+        return json.loads(item["data"])
+
+    def put(self, key: str, record: dict, ttl_seconds: int | None = None):
+        item = {"pk": self._pk(key), "data": json.dumps(record)}
+        if ttl_seconds:
+            item["expires_at"] = int(time.time() + ttl_seconds)
+        try:
+            get_dynamo_table(self.table_name).put_item(Item=item)
+        except botocore.exceptions.ClientError as e:
+            logger.warning(f"Error writing cache {self._pk(key)}: {e}")
+
+    def get_count(self, key: str) -> int:
+        """Counter kept by incr() (0 if missing)."""
+        try:
+            resp = get_dynamo_table(self.table_name).get_item(Key={"pk": self._pk(key)})
+        except botocore.exceptions.ClientError as e:
+            logger.warning(f"Error reading counter {self._pk(key)}: {e}")
+            return 0
+        return int(resp.get("Item", {}).get("count", 0))
+
+    def incr(self, key: str, amount: int = 1, ttl_seconds: int | None = None) -> int:
+        """Atomically add to a counter (safe across concurrent invocations)."""
+        update_expr = "ADD #count :amount"
+        expr_values = {":amount": amount}
+        if ttl_seconds:
+            update_expr += " SET expires_at = :expires_at"
+            expr_values[":expires_at"] = int(time.time() + ttl_seconds)
+        try:
+            resp = get_dynamo_table(self.table_name).update_item(
+                Key={"pk": self._pk(key)},
+                UpdateExpression=update_expr,
+                ExpressionAttributeNames={"#count": "count"},
+                ExpressionAttributeValues=expr_values,
+                ReturnValues="UPDATED_NEW",
+            )
+        except botocore.exceptions.ClientError as e:
+            logger.warning(f"Error updating counter {self._pk(key)}: {e}")
+            return 0
+        return int(resp["Attributes"]["count"])
+
+
+class SqliteCacheStore:
+    """Same records as DynamoCacheStore, in a local SQLite file."""
+
+    def __init__(self, namespace: str, path: str = SCRAPER_CACHE_PATH):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "pk TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "pk TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at INTEGER)"
+            )
+
+    def _pk(self, key: str) -> str:
+        return f"{self.namespace}#{key}"
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires_at FROM cache WHERE pk = ?", (self._pk(key),)
+            ).fetchone()
+        if not row:
+            return None
+        data, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return json.loads(data)
+
+    def put(self, key: str, record: dict, ttl_seconds: int | None = None):
+        expires_at = int(time.time() + ttl_seconds) if ttl_seconds else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (pk, data, expires_at) VALUES (?, ?, ?)",
+                (self._pk(key), json.dumps(record), expires_at),
+            )
+
+    def get_count(self, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count, expires_at FROM counters WHERE pk = ?", (self._pk(key),)
+            ).fetchone()
+        if not row or (row[1] is not None and row[1] <= time.time()):
+            return 0
+        return row[0]
+
+    def incr(self, key: str, amount: int = 1, ttl_seconds: int | None = None) -> int:
+        expires_at = int(time.time() + ttl_seconds) if ttl_seconds else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO counters (pk, count, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(pk) DO UPDATE SET count = count + excluded.count, "
+                "expires_at = COALESCE(excluded.expires_at, expires_at)",
+                (self._pk(key), amount, expires_at),
+            )
+            row = self._conn.execute(
+                "SELECT count FROM counters WHERE pk = ?", (self._pk(key),)
+            ).fetchone()
+        return row[0]
+
+
+CACHE_BACKENDS = {
+    "none": NullCacheStore,
+    "dynamodb": DynamoCacheStore,
+    "sqlite": SqliteCacheStore,
+}
+
+# One store per namespace, kept for warm invocations
+_cache_stores: dict[str, object] = {}
+_cache_stores_lock = threading.Lock()
+
+
+def get_cache_store(namespace: str):
+    """Cache store for `namespace` using the SCRAPER_CACHE_BACKEND backend."""
+    with _cache_stores_lock:
+        store = _cache_stores.get(namespace)
+        if store is None:
+            backend = CACHE_BACKENDS.get(SCRAPER_CACHE_BACKEND)
+            if backend is None:
+                raise ValueError(f"Unknown SCRAPER_CACHE_BACKEND: {SCRAPER_CACHE_BACKEND}")
+            store = _cache_stores[namespace] = backend(namespace)
+        return store
+
+# ---------------------------------------------------
+# Per-host politeness (rate limit + robots.txt)
+# ---------------------------------------------------
+
+class HostScheduler:
+    """
+    Limits page fetches per host: at most `max_per_host` in flight and
+    request starts spaced at least the host's delay apart. Hosts are
+    independent, so total parallelism across different hosts is unaffected.
+    """
+
+    def __init__(self, max_per_host: int = MAX_REQUESTS_PER_HOST, min_delay_ms: int = HOST_MIN_DELAY_MS):
+        self.max_per_host = max(1, max_per_host)
+        self.min_delay = min_delay_ms / 1000.0
+        self._lock = threading.Lock()
+        self._hosts: dict[str, dict] = {}
+
+    def _state(self, host: str) -> dict:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = {
+                    "sem": threading.Semaphore(self.max_per_host),
+                    "next_start": 0.0,
+                    "delay": self.min_delay,
+                }
+            return state
+
+    def set_delay(self, host: str, seconds: float):
+        """Raise a host's spacing (e.g. to its robots.txt Crawl-delay)."""
+        state = self._state(host)
+        with self._lock:
+            state["delay"] = max(self.min_delay, min(seconds, HOST_MAX_DELAY_MS / 1000.0))
+
+    @contextmanager
+    def slot(self, host: str):
+        """Hold one of the host's request slots, waiting for its spacing."""
+        state = self._state(host)
+        state["sem"].acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, state["next_start"])
+                state["next_start"] = start_at + state["delay"]
+            if start_at > now:
+                current_run().bump("host_delay_waits")
+                time.sleep(start_at - now)
+            yield
+        finally:
+            state["sem"].release()
+
+
+# Module-level so warm invocations keep each host's spacing
+host_scheduler = HostScheduler()
+
+
+class RobotsCache:
+    """
+    Parsed robots.txt per origin, kept in memory and as JSON files in
+    ROBOTS_CACHE_DIR (which survives warm invocations) for
+    ROBOTS_CACHE_TTL_HOURS.
+    """
+
+    def __init__(self, cache_dir: str = ROBOTS_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._parsers: dict[str, tuple] = {}
+        self._origin_locks: dict[str, threading.Lock] = {}
+
+    def _path(self, origin: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(origin.encode("utf-8")).hexdigest() + ".json")
+
+    @staticmethod
+    def _parse(record: dict) -> RobotFileParser:
+        parser = RobotFileParser()
+        status = record.get("status")
+        if status in (401, 403) or (status or 0) >= 500:
+            # 5xx: the rules are unknown, not absent (RFC 9309 2.3.1.4)
+            parser.disallow_all = True
+        elif status == 200:
+            parser.parse(record.get("text", "").splitlines())
+        else:
+            parser.allow_all = True
+        return parser
+
+    def _read_disk(self, origin: str) -> dict | None:
+        try:
+            with open(self._path(origin), encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record.get("fetched_at", 0) + ROBOTS_CACHE_TTL_HOURS * 3600 <= time.time():
+            return None
+        return record
+
+    def _write_disk(self, origin: str, record: dict):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(origin), "w", encoding="utf-8") as f:
+                json.dump(record, f)
+        except OSError as e:
+            logger.warning(f"Error caching robots.txt for {origin}: {e}")
+
+    @staticmethod
+    def _expire_soon(record: dict):
+        """Backdate fetched_at so the record lives ROBOTS_ERROR_TTL_MINUTES."""
+        record["fetched_at"] -= int(ROBOTS_CACHE_TTL_HOURS * 3600 - ROBOTS_ERROR_TTL_MINUTES * 60)
+
+    def _fetch(self, origin: str, host: str) -> dict:
+        record = {"origin": origin, "fetched_at": int(time.time()), "status": None, "text": ""}
+        try:
+            with host_scheduler.slot(host):
+                resp = http_pool.get(
+                    f"{origin}/robots.txt", headers=FETCH_HEADERS, timeout=current_run().http_timeout(10)
+                )
+            record["status"] = resp.status
+            if resp.status == 200:
+                # Plenty for any real robots.txt
+                record["text"] = resp.body[:512 * 1024].decode("utf-8", errors="ignore")
+            elif resp.status >= 500:
+                # Disallowed until the server recovers; ask again soon
+                self._expire_soon(record)
+        except Exception as e:
+            # Unreachable robots.txt: allow, but don't remember it for long
+            logger.warning(f"Error fetching robots.txt for {origin}: {e}")
+            self._expire_soon(record)
+        current_run().bump("robots_fetches")
+        return record
+
+    def parser_for(self, url: str) -> RobotFileParser:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}".lower()
+
+        with self._lock:
+            origin_lock = self._origin_locks.setdefault(origin, threading.Lock())
+
+        with origin_lock:
+            hit = self._parsers.get(origin)
+            if hit and hit[0] + ROBOTS_CACHE_TTL_HOURS * 3600 > time.time():
+                return hit[1]
+
+            record = self._read_disk(origin)
+            if record is None:
+                record = self._fetch(origin, parsed.netloc.lower())
+                self._write_disk(origin, record)
+
+            parser = self._parse(record)
+            self._parsers[origin] = (record["fetched_at"], parser)
+
+        delay = parser.crawl_delay(ROBOTS_USER_AGENT)
+        if delay:
+            host_scheduler.set_delay(parsed.netloc.lower(), float(delay))
+        return parser
+
+    def allowed(self, url: str) -> bool:
+        return self.parser_for(url).can_fetch(ROBOTS_USER_AGENT, url)
+
+
+robots_cache = RobotsCache()
+
+
+def interleave_by_host(results: list, link=lambda result: result.get("link")) -> list:
+    """
+    Reorder search results round-robin by host, so a global worker pool
+    is not filled with fetches all queued behind one host's limit.
+    """
+    by_host: dict[str, list] = {}
+    for result in results:
+        host = urlparse(link(result) or "").netloc.lower()
+        by_host.setdefault(host, []).append(result)
+
+    queues = list(by_host.values())
+    ordered = []
+    while queues:
+        for queue in queues:
+            ordered.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+# ---------------------------------------------------
+# Helper functions (scraping) – NO external requests (stdlib http_pool)
+# ---------------------------------------------------
+
+FETCH_HEADERS = {"User-Agent": http_pool.USER_AGENT}
+
+
+def http_get(url: str, params: dict | None = None, headers: dict | None = None, timeout: float = HTTP_TIMEOUT_SECONDS):
+    """
+    Generic HTTP GET over the pooled keep-alive client (http_pool).
+
+    Returns an http_pool.Response (2xx/3xx, including 304 Not Modified),
+    or None on network errors and 4xx/5xx.
+    """
+    try:
+        resp = http_pool.get(url, params=params, headers=headers, timeout=current_run().http_timeout(timeout))
+        resp.raise_for_status()
+        return resp
+    except Exception as e:
+        logger.warning(f"Error fetching {url}: {e}")
+        return None
+
+
+def http_get_text(url: str, params: dict | None = None, headers: dict | None = None,
+                  timeout: float = HTTP_TIMEOUT_SECONDS) -> str | None:
+    """Generic HTTP GET returning decoded text."""
+    resp = http_get(url, params=params, headers=headers, timeout=timeout)
+    if resp is None:
+        return None
+    return resp.text()
+
+
+class CseQuotaExceeded(Exception):
+    pass
+
+
+class CseSearchError(Exception):
+    """A CSE call that failed (HTTP, JSON or API error): no page, not an empty one."""
+
+
+def cse_cache_key(query: str, num: int, start: int) -> str:
+    return hashlib.sha256(json.dumps([query, num, start]).encode("utf-8")).hexdigest()
+
+
+def cse_ttl_hours(cfg: dict, query: str) -> float:
+    """Cache TTL for one of an agent's queries (see CSE_CACHE_TTL_HOURS)."""
+    ttl = cfg.get("cse_cache_ttl_hours", CSE_CACHE_TTL_HOURS)
+    if isinstance(ttl, dict):
+        ttl = ttl.get(query, CSE_CACHE_TTL_HOURS)
+    return float(ttl)
+
+
+def google_search(query: str, num: int = 5, start: int = 1, ttl_hours: float | None = None,
+                  quota_kind: str = "query"):
+    """
+    Call Google Custom Search and return items list. A failed call
+    raises CseSearchError, so an empty list always means an empty page.
+
+    Responses are cached in the "cse" store by (query, num, start) for
+    ttl_hours (default CSE_CACHE_TTL_HOURS), so the API is only called
+    when the cached copy is missing or stale.
+
+    Real API calls are charged to the run's CSE quota as `quota_kind`
+    ("query" or "fallback"); CseQuotaExceeded is raised when that part
+    of the budget is used up.
+    """
+    if ttl_hours is None:
+        ttl_hours = CSE_CACHE_TTL_HOURS
+
+    cache = get_cache_store("cse")
+    key = cse_cache_key(query, num, start)
+
+    if ttl_hours > 0:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Google results from cache: {query}")
+            current_run().bump("cse_cache_hits")
+            return cached["items"]
+        current_run().bump("cse_cache_misses")
+
+    quota = current_run().quota
+    if quota is not None and not quota.try_spend(quota_kind):
+        raise CseQuotaExceeded(f"CSE {quota_kind} budget used up, not searching: {query}")
+
+    logger.info(f"Searching Google: {query}")
+
+    params = {
+        "key": GOOGLE_API_KEY,
+        "cx": GOOGLE_CX,
+        "q": query,
+        "num": num,
+    }
+    if start > 1:
+        params["start"] = start
+
+    with metrics.timer("cse_call"):
+        text = http_get_text(GOOGLE_CSE_URL, params=params, headers=None)
+    if text is None:
+        raise CseSearchError(f"Google CSE request failed for query={query}")
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise CseSearchError(f"Error decoding Google JSON for query={query}: {e}") from e
+
+    if "error" in data:
+        raise CseSearchError(f"Google CSE error for query={query}: {data['error'].get('message', data['error'])}")
+
+    items = data.get("items", [])
+    if ttl_hours > 0:
+        cache.put(key, {"items": items}, ttl_seconds=int(ttl_hours * 3600))
+    return items
+
+
+class PageSkipped(Exception):
+    """A result page that can't produce a lead; `reason` names the filter."""
+
+    def __init__(self, reason: str, url: str):
+        super().__init__(f"Skipping {url} ({reason})")
+        self.reason = reason
+
+
+def result_skip_reason(result: dict) -> str | None:
+    """Pre-download filter on a CSE result: URL extension, then mime/fileFormat."""
+    filename = urlparse(result.get("link") or "").path.rsplit("/", 1)[-1]
+    ext = filename.rpartition(".")[2].lower() if "." in filename else ""
+    if ext in SKIP_URL_EXTENSIONS:
+        return "url_extension"
+
+    # CSE only sets these for non-HTML documents
+    mime = (result.get("mime") or "").lower()
+    if result.get("fileFormat") or (mime and not mime.startswith(PAGE_CONTENT_TYPES)):
+        return "cse_file_type"
+    return None
+
+
+def response_skip_reason(headers) -> str | None:
+    """Filter on response headers, before any of the body is read."""
+    content_type = (headers.get("Content-Type") or "").lower()
+    if content_type and not content_type.startswith(PAGE_CONTENT_TYPES):
+        return "content_type"
+
+    try:
+        content_length = int(headers.get("Content-Length") or 0)
+    except ValueError:
+        content_length = 0
+    if PAGE_MAX_CONTENT_LENGTH and content_length > PAGE_MAX_CONTENT_LENGTH:
+        return "content_length"
+    return None
+
+
+def scan_chunks_for_email(chunks, page_url: str, max_bytes: int = PAGE_MAX_BYTES, links=None) -> tuple:
+    """
+    Run a streamed body through the shared email_extract engine, stopping
+    as soon as nothing later could beat the best candidate (a mailto: on
+    the page's own domain) or max_bytes have been read. A
+    contact_links.ContactLinkScanner passed as `links` is fed the same chunks.
+    Returns (best_email, bytes_read).
+    """
+    scanner = email_extract.EmailScanner(page_url)
+    bytes_read = 0
+    # Time spent extracting, not waiting on the network
+    scan_seconds = 0.0
+
+    try:
+        for chunk in chunks:
+            if max_bytes and bytes_read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - bytes_read]
+            bytes_read += len(chunk)
+
+            start = time.perf_counter()
+            scanner.feed(chunk)
+            if links is not None:
+                links.feed(chunk)
+            scan_seconds += time.perf_counter() - start
+            if scanner.done:
+                return scanner.best, bytes_read
+            if max_bytes and bytes_read >= max_bytes:
+                current_run().bump("page_byte_cap_hits")
+                break
+
+        start = time.perf_counter()
+        scanner.feed(b"", final=True)
+        if links is not None:
+            links.feed(b"", final=True)
+        scan_seconds += time.perf_counter() - start
+        return scanner.best, bytes_read
+    finally:
+        metrics.put("Latency", scan_seconds * 1000, "Milliseconds", Stage="extraction")
+
+
+def fetch_page_email(url: str, contact_pages: list | None = None) -> str | None:
+    """
+    Fetch a page and return the best email on it (see email_extract).
+    The body is streamed and the connection dropped as soon as the
+    best possible candidate turns up. When there is no email and
+    `contact_pages` is given, it is extended with the page's likely
+    contact links (see contact_links), best first.
+
+    Pages that sent an ETag / Last-Modified are remembered in the "http"
+    cache store together with their extracted email and contact links;
+    the next fetch is a conditional GET and a 304 reuses them without
+    reading or scanning the page again.
+
+    Raises PageSkipped when the headers show the body isn't a page worth
+    reading (see response_skip_reason).
+    """
+    cache = get_cache_store("http")
+    cached = cache.get(url)
+
+    headers = dict(FETCH_HEADERS)
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    if RESPECT_ROBOTS_TXT and not robots_cache.allowed(url):
+        logger.info(f"Skipping URL disallowed by robots.txt: {url}")
+        current_run().bump("robots_disallowed")
+        return None
+
+    try:
+        # Timed once the host slot is ours, so politeness waits don't count
+        with host_scheduler.slot(urlparse(url).netloc.lower()), metrics.timer("page_fetch"), \
+                http_pool.stream(url, headers=headers, timeout=current_run().http_timeout()) as resp:
+            if resp.status >= 400:
+                logger.warning(f"Error fetching {url}: HTTP {resp.status}")
+                return None
+
+            if resp.status == 304 and cached:
+                current_run().bump("http_not_modified")
+                if contact_pages is not None and not cached.get("email"):
+                    contact_pages.extend(cached.get("contact_links") or [])
+                return cached.get("email")
+
+            reason = response_skip_reason(resp.headers)
+            if reason:
+                raise PageSkipped(reason, url)
+
+            current_run().bump("http_full_fetches")
+            links = contact_links.ContactLinkScanner(url)
+            email, bytes_read = scan_chunks_for_email(resp.iter_chunks(PAGE_CHUNK_BYTES), url, links=links)
+            # Only needed (and only complete) when the page had no email
+            found_links = [] if email else links.ranked(CONTACT_DISCOVERY_MAX_PAGES)
+            current_run().bump("page_bytes_read", bytes_read)
+            metrics.put("BytesFetched", bytes_read, "Bytes")
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except PageSkipped:
+        raise
+    except Exception as e:
+        logger.warning(f"Error fetching {url}: {e}")
+        return None
+
+    if etag or last_modified:
+        cache.put(
+            url,
+            {"etag": etag, "last_modified": last_modified, "email": email, "contact_links": found_links},
+            ttl_seconds=HTTP_CACHE_TTL_DAYS * 86400,
+        )
+
+    if contact_pages is not None:
+        contact_pages.extend(found_links)
+    return email
+
+
+def extract_domain(url: str) -> str:
+    parsed = urlparse(url)
+    return parsed.netloc
+
+
+def google_search_for_domain_email(domain: str) -> str | None:
+    """Fallback search on domain to find an email."""
+    fallback_query = f'site:{domain} "email" "contact"'
+    logger.info(f"Fallback search on domain: {domain} with query: {fallback_query}")
+    try:
+        items = google_search(fallback_query, num=3, quota_kind="fallback")
+    except (CseQuotaExceeded, CseSearchError):
+        raise
+    except Exception as e:
+        logger.warning(f"Error in fallback domain search for {domain}: {e}")
+        return None
+
+    for item in items:
+        link = item.get("link")
+        if not link:
+            continue
+
+        reason = result_skip_reason(item)
+        if reason:
+            logger.info(f"Skipping non-page fallback result for {domain} ({reason}): {link}")
+            continue
+
+        try:
+            email = fetch_page_email(url_canon.canonical_url(link))
+        except PageSkipped as e:
+            logger.info(f"Fallback page for {domain} skipped: {e}")
+            continue
+        if email:
+            return email
+
+    return None
+
+
+def discover_contact_email(agent_name: str, links: list) -> str | None:
+    """
+    One hop of contact-page discovery: fetch the page's best
+    CONTACT_DISCOVERY_MAX_PAGES same-host contact links (links found on
+    those aren't followed) and return the first email. Each link is
+    fetched at most once per run, however many pages point to it.
+    """
+    def compute(link: str) -> str | None:
+        current_run().bump("contact_discovery_pages")
+        try:
+            return fetch_page_email(link)
+        except PageSkipped as e:
+            logger.info(f"[{agent_name}] Contact page skipped: {e}")
+            return None
+
+    with metrics.timer("contact_discovery"):
+        for link in links[:CONTACT_DISCOVERY_MAX_PAGES]:
+            if current_run().out_of_time():
+                break
+            link = url_canon.canonical_url(link)
+            logger.info(f"[{agent_name}] Trying contact page: {link}")
+            email, _ = current_run().contact_pages.get_or_compute(
+                url_canon.url_key(link), lambda _: compute(link)
+            )
+            if email:
+                current_run().bump("contact_discovery_hits")
+                return email
+
+    return None
+
+
+def lookup_domain_email(domain: str) -> str | None:
+    """
+    Domain fallback with caching: at most one google_search_for_domain_email
+    per domain per TTL window. Misses are cached too ("email": null) for
+    the shorter DOMAIN_NO_EMAIL_TTL_DAYS, and within a run concurrent
+    lookups for one domain share a single search.
+    """
+    def compute(key: str) -> str | None:
+        cache = get_cache_store("domain")
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Fallback result for domain {key} from cache: {cached.get('email')}")
+            current_run().bump("domain_cache_hits")
+            return cached.get("email")
+
+        current_run().bump("domain_cache_misses")
+        try:
+            with metrics.timer("domain_fallback"):
+                email = google_search_for_domain_email(key)
+        except CseQuotaExceeded as e:
+            # Not a real "no email" answer, so don't cache it
+            logger.info(str(e))
+            return None
+        except CseSearchError as e:
+            logger.warning(f"Error in fallback domain search for {key}: {e}")
+            return None
+        ttl_days = DOMAIN_EMAIL_TTL_DAYS if email else DOMAIN_NO_EMAIL_TTL_DAYS
+        cache.put(key, {"email": email}, ttl_seconds=ttl_days * 86400)
+        return email
+
+    email, _ = current_run().domain_emails.get_or_compute(domain.lower(), compute)
+    return email
+
+
+def make_id(url: str, agent_name: str) -> str:
+    """Lead id: every spelling of a URL (see url_canon.url_key) gets the same one."""
+    h = hashlib.sha256()
+    h.update((url_canon.url_key(url) + "|" + agent_name).encode("utf-8"))
+    return h.hexdigest()
+
+
+def item_exists(item_id: str) -> bool:
+    try:
+        with metrics.timer("dynamo_read"):
+            resp = get_table().get_item(Key={"id": item_id})
+        return "Item" in resp
+    except botocore.exceptions.ClientError as e:
+        logger.error(f"Error checking existence in DynamoDB for id={item_id}: {e}")
+        return False
+
+
+def find_contact_id(email_norm: str) -> str | None:
+    """Id of a lead already holding this contact email (CONTACT_EMAIL_INDEX query)."""
+    try:
+        with metrics.timer("dynamo_read"):
+            resp = get_table().query(
+                IndexName=CONTACT_EMAIL_INDEX,
+                KeyConditionExpression="contact_email_norm = :email",
+                ExpressionAttributeValues={":email": email_norm},
+                Limit=1,
+            )
+    except botocore.exceptions.ClientError as e:
+        logger.error(f"Error querying {CONTACT_EMAIL_INDEX} for {email_norm}: {e}")
+        return None
+    items = resp.get("Items", [])
+    return items[0]["id"] if items else None
+
+
+def claim_contact(item: dict) -> str | None:
+    """
+    None if `item` is the first lead for its contact email, else the id
+    of the lead that has it: one already in the table, or the first one
+    queued this run (the index can't see those yet).
+    """
+    if not CONTACT_EMAIL_INDEX:
+        return None
+    owner_id, _ = current_run().contacts.get_or_compute(
+        item["contact_email_norm"], lambda email_norm: find_contact_id(email_norm) or item["id"]
+    )
+    return None if owner_id == item["id"] else owner_id
+
+
+def attachment_marker(url: str, source: str, owner_id: str) -> dict:
+    """
+    Item stored under make_id(url, source) once that page was attached to
+    the lead `owner_id`: item_exists() finds it, so the page isn't
+    fetched again. It has no contact_email, so outreach, the reply report
+    and the contact_email-index GSI pass over it.
+    """
+    return {
+        "id": make_id(url, source),
+        "attached_to": owner_id,
+        "attached_url": url,
+        "attached_source": source,
+        "attached_at": int(time.time()),
+    }
+
+
+def attach_contacts(attachments: dict) -> int:
+    """
+    Add {lead id: {(url, source), ...}} to the existing leads'
+    other_urls / other_sources sets and leave an attachment_marker per
+    URL. Returns how many leads were updated; a lead that isn't in the
+    table (its write failed) is skipped, markers included, so its URLs
+    are tried again next run.
+    """
+    updated = 0
+    for item_id, found in attachments.items():
+        urls = {url for url, _ in found}
+        sources = {source for _, source in found}
+        try:
+            with metrics.timer("dynamo_write"):
+                get_table().update_item(
+                    Key={"id": item_id},
+                    UpdateExpression="ADD other_urls :urls, other_sources :sources",
+                    ConditionExpression="attribute_exists(id)",
+                    ExpressionAttributeValues={":urls": urls, ":sources": sources},
+                )
+                for url, source in found:
+                    get_table().put_item(Item=attachment_marker(url, source, item_id))
+            updated += 1
+        except botocore.exceptions.ClientError as e:
+            logger.error(f"Error attaching {len(urls)} URLs to contact id={item_id}: {e}")
+    return updated
+
+
+# ---------------------------------------------------
+# Run-scoped state (shared by every agent in one handler run)
+# ---------------------------------------------------
+
+class RunMemo:
+    """
+    Compute-once memo for one run: the first caller for a key computes
+    the value, concurrent and later callers wait for and share it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: dict[str, Future] = {}
+
+    def get_or_compute(self, key: str, compute) -> tuple:
+        """Return (compute(key), computed_by_this_call)."""
+        with self._lock:
+            future = self._results.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._results[key] = future
+
+        if is_owner:
+            try:
+                future.set_result(compute(key))
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result(), is_owner
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+
+class UrlFrontier:
+    """
+    Run-scoped URL frontier: each unique URL (by url_canon.url_key) is
+    fetched and its email extracted (fallback included) once, no matter
+    how many agents' queries return it or how they spell it. Later
+    agents get the same result.
+    """
+
+    def __init__(self):
+        self._memo = RunMemo()
+
+    def resolve(self, url: str, agent_name: str, resolver) -> str | None:
+        """Return resolver(url), computing it only for the first agent asking."""
+        key = url_canon.url_key(url)
+        email, computed = self._memo.get_or_compute(key, lambda _: resolver(url))
+        if not computed:
+            logger.info(f"[{agent_name}] Reusing result for URL already fetched this run: {url}")
+            current_run().bump("frontier_shared_hits")
+        return email
+
+    def unique_urls(self) -> int:
+        return len(self._memo)
+
+
+class ScrapeRun:
+    """State for one book_scraper_handler run: URL frontier, memos + counters."""
+
+    def __init__(self):
+        self.frontier = UrlFrontier()
+        self.domain_emails = RunMemo()
+        self.contact_pages = RunMemo()
+        # Normalized contact email -> id of the lead that has it
+        self.contacts = RunMemo()
+        # Lead id -> {(url, agent), ...} found again under another id
+        self.attachments: dict[str, set] = {}
+        # CseQuota once run_agents has planned the run (None = unlimited)
+        self.quota = None
+        # ScrapeCheckpoint when run_agents is resuming / saving progress
+        self.checkpoint = None
+        # ThreadPoolExecutor for blocking steps (see worker_pool)
+        self.workers = None
+        # time.monotonic() at which no new work should start (None = no deadline)
+        self.deadline = None
+        self.stats: dict[str, int] = {}
+        # Pre-filtered results: agent -> reason -> count
+        self.skips: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def set_deadline(self, lambda_context):
+        """Stop STOP_BEFORE_DEADLINE_MS before the invocation times out."""
+        left_ms = remaining_ms(lambda_context)
+        if left_ms != float("inf"):
+            self.deadline = time.monotonic() + (left_ms - STOP_BEFORE_DEADLINE_MS) / 1000
+
+    def time_left(self) -> float:
+        """Seconds until the run should stop starting new work."""
+        if self.deadline is None:
+            return float("inf")
+        return self.deadline - time.monotonic()
+
+    def out_of_time(self) -> bool:
+        return self.time_left() <= 0
+
+    def http_timeout(self, default: float = HTTP_TIMEOUT_SECONDS) -> float:
+        """Socket timeout for a request started now."""
+        return max(1.0, min(default, self.time_left()))
+
+    def bump(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + n
+
+    def summary(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["frontier_unique_urls"] = self.frontier.unique_urls()
+        return stats
+
+    def attach(self, item_id: str, url: str, agent_name: str):
+        """Queue a URL / agent for an existing contact (see flush_attachments)."""
+        with self._lock:
+            self.attachments.setdefault(item_id, set()).add((url, agent_name))
+
+    def flush_attachments(self) -> int:
+        """Write the queued attachments once their leads are saved."""
+        with self._lock:
+            attachments, self.attachments = self.attachments, {}
+        return attach_contacts(attachments) if attachments else 0
+
+    def count_skip(self, agent_name: str, reason: str):
+        """Count a pre-filtered result, per agent and in the run stats."""
+        with self._lock:
+            by_reason = self.skips.setdefault(agent_name, {})
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+        self.bump(f"skipped_{reason}")
+
+    def agent_skips(self, agent_name: str) -> dict:
+        with self._lock:
+            return dict(self.skips.get(agent_name, {}))
+
+    def is_query_skipped(self, agent_name: str, query: str) -> bool:
+        return self.quota is not None and self.quota.is_skipped(agent_name, query)
+
+
+class ScrapeCheckpoint:
+    """
+    Progress of runs over one list of agents, kept in the "checkpoint"
+    cache store so a run cut short by the deadline is resumed by the next
+    invocation: the agents not finished yet in the current cycle, and for
+    an agent stopped midway, the (query index, result index) of the first
+    search result it had not handled.
+    """
+
+    def __init__(self, agent_names: list):
+        self.agent_names = list(agent_names)
+        self.key = hashlib.sha256("|".join(sorted(self.agent_names)).encode("utf-8")).hexdigest()
+        self._store = get_cache_store("checkpoint")
+        self._lock = threading.Lock()
+
+        record = self._store.get(self.key) or {}
+        pending = set(record.get("pending", []))
+        self.pending = [name for name in self.agent_names if name in pending]
+        self.positions = {
+            name: tuple(pos) for name, pos in record.get("positions", {}).items() if name in pending
+        }
+        self.resumed = bool(self.pending) and (len(self.pending) < len(self.agent_names) or bool(self.positions))
+        if not self.pending:
+            # Fresh start, or the last cycle finished
+            self.pending = list(self.agent_names)
+
+    def run_order(self) -> list:
+        """Unfinished agents first, in catalog order, then the rest."""
+        pending = set(self.pending)
+        return self.pending + [name for name in self.agent_names if name not in pending]
+
+    def position(self, agent_name: str) -> tuple:
+        """(query index, result index) the agent should resume from."""
+        with self._lock:
+            return self.positions.get(agent_name, (0, 0))
+
+    def advance(self, agent_name: str, position: tuple):
+        with self._lock:
+            if agent_name in self.pending:
+                self.positions[agent_name] = tuple(position)
+        self.save()
+
+    def finish(self, agent_name: str):
+        with self._lock:
+            if agent_name in self.pending:
+                self.pending.remove(agent_name)
+                self.positions.pop(agent_name, None)
+        self.save()
+
+    def end_run(self):
+        """Start a new cycle once every agent has finished this one."""
+        with self._lock:
+            if self.pending:
+                return
+            self.pending = list(self.agent_names)
+        self.save()
+
+    def save(self):
+        with self._lock:
+            record = {"pending": list(self.pending), "positions": dict(self.positions)}
+        self._store.put(self.key, record, ttl_seconds=CHECKPOINT_TTL_DAYS * 86400)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "resumed": self.resumed,
+                "pending_agents": list(self.pending),
+                "positions": {name: list(pos) for name, pos in self.positions.items()},
+            }
+
+
+_current_run: ContextVar[ScrapeRun | None] = ContextVar("book_scrape_run", default=None)
+
+
+def begin_scrape_run() -> ScrapeRun:
+    """Start a fresh run for this handler invocation (threads/tasks inherit it)."""
+    run = ScrapeRun()
+    _current_run.set(run)
+    return run
+
+
+def current_run() -> ScrapeRun:
+    run = _current_run.get()
+    if run is None:
+        run = begin_scrape_run()
+    return run
+
+
+# ---------------------------------------------------
+# Google CSE daily quota
+# ---------------------------------------------------
+
+def cse_quota_day() -> str:
+    """CSE quota day (the quota resets at midnight Pacific)."""
+    return datetime.now(tz=cse_quota_tz()).date().isoformat()
+
+
+def cse_spent_today() -> int:
+    return get_cache_store("quota").get_count(cse_quota_day())
+
+
+def query_yield(query: str) -> dict:
+    """Historical {"searches", "saved"} for a search query."""
+    key = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return get_cache_store("yield").get(key) or {"searches": 0, "saved": 0}
+
+
+def record_query_yields(yields: dict):
+    """
+    Add this run's (searches, new saved leads) to each query's history.
+    Only searches that returned a result page count; a failed or
+    skipped CSE call says nothing about the query's yield.
+    """
+    store = get_cache_store("yield")
+    for query, (searches, saved) in yields.items():
+        key = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        record = store.get(key) or {"query": query, "searches": 0, "saved": 0}
+        record["searches"] += searches
+        record["saved"] += saved
+        store.put(key, record)
+
+
+def query_cursor_key(query: str, num: int) -> str:
+    return hashlib.sha256(f"{query}|{num}".encode("utf-8")).hexdigest()
+
+
+def load_query_cursor(query: str, num: int) -> int:
+    """CSE `start` the query's next search should use (1 = first page)."""
+    record = get_cache_store("cursor").get(query_cursor_key(query, num))
+    return record["next_start"] if record else 1
+
+
+def save_query_cursor(query: str, num: int, next_start: int):
+    get_cache_store("cursor").put(query_cursor_key(query, num), {"query": query, "next_start": next_start})
+
+
+def next_page_start(start: int, num: int, results: int, new_leads: int) -> int:
+    """
+    Cursor after searching the page at `start`: one page deeper if it
+    brought new leads, otherwise 1. "No new leads" covers a page of only
+    duplicates (already in the table, attached or saved this run) and
+    also one whose new pages had no email; either way the query has
+    stopped producing. A short page or the CSE_MAX_RESULTS limit also
+    goes back to 1.
+    """
+    next_start = start + num
+    if not new_leads or results < num or next_start + num - 1 > CSE_MAX_RESULTS:
+        return 1
+    return next_start
+
+
+def yield_score(record: dict) -> float:
+    """Saved leads per search, smoothed so untried queries look promising."""
+    return (record.get("saved", 0) + 1) / (record.get("searches", 0) + 1)
+
+
+class CseQuota:
+    """
+    This run's share of the daily CSE budget: `query_budget` calls for
+    planned agent queries and `fallback_reserve` for domain fallbacks.
+    """
+
+    def __init__(self, remaining: int, spent_before: int = 0, reserve_fraction: float = CSE_FALLBACK_RESERVE):
+        self.remaining = remaining
+        self.spent_before = spent_before
+        self.fallback_reserve = int(round(remaining * reserve_fraction))
+        self.query_budget = remaining - self.fallback_reserve
+        self.query_spent = 0
+        self.deep_spent = 0
+        self.fallback_spent = 0
+        # Planned first pages not searched yet; deeper pages can't use
+        # the budget they need
+        self.planned_left = 0
+        self.skipped: list[tuple] = []
+        self._skipped_set: set[tuple] = set()
+        self._lock = threading.Lock()
+
+    def plan(self, agent_names: list, checkpoint=None):
+        """
+        Skip the lowest-yield queries that would not fit in query_budget.
+        Queries answered from the CSE cache are free and never skipped,
+        and queries before an agent's checkpoint position aren't searched
+        this run, so they don't count.
+        """
+        to_search = []
+        for name in agent_names:
+            cfg = get_agents()[name]
+            num = cfg["max_results_per_query"]
+            first_query = checkpoint.position(name)[0] if checkpoint else 0
+            for q in cfg["search_queries"][first_query:]:
+                start = load_query_cursor(q, num)
+                if cse_ttl_hours(cfg, q) > 0 and get_cache_store("cse").get(
+                    cse_cache_key(q, num, start)
+                ) is not None:
+                    continue
+                to_search.append((name, q))
+
+        self.planned_left = min(len(to_search), self.query_budget)
+        if len(to_search) <= self.query_budget:
+            return
+
+        scores = {q: yield_score(query_yield(q)) for _, q in to_search}
+        # Stable sort: equal yields keep catalog order
+        ranked = sorted(to_search, key=lambda pair: scores[pair[1]], reverse=True)
+        for name, q in ranked[self.query_budget:]:
+            self.record_skip(name, q)
+        logger.info(
+            f"[cse_quota] {len(to_search)} queries need the API, budget {self.query_budget}: "
+            f"skipping {len(self.skipped)} lowest-yield queries."
+        )
+
+    def is_skipped(self, agent_name: str, query: str) -> bool:
+        with self._lock:
+            return (agent_name, query) in self._skipped_set
+
+    def record_skip(self, agent_name: str, query: str):
+        with self._lock:
+            if (agent_name, query) not in self._skipped_set:
+                self._skipped_set.add((agent_name, query))
+                self.skipped.append((agent_name, query))
+
+    def try_spend(self, kind: str) -> bool:
+        """
+        Charge one API call to the budget: "query" (a query's first page
+        this run), "deep" (a further page) or "fallback".
+        """
+        with self._lock:
+            if kind == "fallback":
+                if self.fallback_spent >= self.fallback_reserve:
+                    return False
+                self.fallback_spent += 1
+            elif kind == "deep":
+                if self.query_spent + self.planned_left >= self.query_budget:
+                    return False
+                self.query_spent += 1
+                self.deep_spent += 1
+            else:
+                if self.query_spent >= self.query_budget:
+                    return False
+                self.query_spent += 1
+                self.planned_left = max(0, self.planned_left - 1)
+
+        get_cache_store("quota").incr(cse_quota_day(), 1, ttl_seconds=2 * 86400)
+        return True
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "daily_budget": CSE_DAILY_BUDGET,
+                "spent_before_run": self.spent_before,
+                "run_budget": self.remaining,
+                "query_budget": self.query_budget,
+                "fallback_reserve": self.fallback_reserve,
+                "query_spent": self.query_spent,
+                "deep_page_spent": self.deep_spent,
+                "fallback_spent": self.fallback_spent,
+                "skipped_queries": [{"agent": a, "query": q} for a, q in self.skipped],
+            }
+
+
+def plan_cse_quota(agent_names: list, budget: int | None = None, checkpoint=None) -> CseQuota:
+    """
+    Budget this run's CSE calls from what is left of today's quota
+    (capped at `budget`, a dispatcher shard's share, when given),
+    starting each agent at its `checkpoint` position.
+    """
+    spent = cse_spent_today()
+    remaining = max(0, CSE_DAILY_BUDGET - spent)
+    if budget is not None:
+        remaining = min(int(budget), remaining)
+    quota = CseQuota(remaining, spent)
+    quota.plan(agent_names, checkpoint)
+    return quota
+
+
+def search_agent_query(agent_name: str, cfg: dict, q: str, start: int = 1, first_page: bool = True):
+    """
+    One page of results for an agent query, or None when it was not
+    searched (CSE quota, errors).
+    """
+    if current_run().out_of_time():
+        return None
+
+    quota = current_run().quota
+    if quota is not None and quota.is_skipped(agent_name, q):
+        logger.info(f"[{agent_name}] Skipping query (CSE quota, low yield): {q}")
+        return None
+
+    if start > 1:
+        logger.info(f"[{agent_name}] Searching page at start={start}: {q}")
+
+    try:
+        return google_search(
+            q,
+            num=cfg["max_results_per_query"],
+            start=start,
+            ttl_hours=cse_ttl_hours(cfg, q),
+            quota_kind="query" if first_page else "deep",
+        )
+    except CseQuotaExceeded as e:
+        logger.warning(f"[{agent_name}] {e}")
+        if first_page:
+            quota.record_skip(agent_name, q)
+        return None
+    except Exception as e:
+        logger.error(f"[{agent_name}] Error during Google search: {e}")
+        return None
+
+
+def resolve_url_email(agent_name: str, url: str) -> str | None:
+    """
+    Fetch a result page and find an email, then try the contact pages it
+    links to, then fall back to a domain search.
+    """
+    contact_pages = []
+    email = fetch_page_email(url, contact_pages if CONTACT_DISCOVERY_MAX_PAGES > 0 else None)
+
+    if not email and contact_pages:
+        email = discover_contact_email(agent_name, contact_pages)
+
+    if not email:
+        domain = extract_domain(url)
+        logger.info(
+            f"[{agent_name}] No email on main page. Fallback search on domain: {domain}"
+        )
+        email = lookup_domain_email(domain)
+
+    return email
+
+
+def process_search_result(agent_name: str, cfg: dict, result: dict, writer: LeadWriter) -> bool:
+    """
+    Handle one Google result: dedup, fetch, find email, queue for saving.
+
+    Returns True when a new lead was queued on `writer`.
+    """
+    url = result.get("link")
+    title = result.get("title")
+
+    if not url:
+        return False
+
+    reason = result_skip_reason(result)
+    if reason:
+        logger.info(f"[{agent_name}] Skipping non-page result ({reason}): {url}")
+        current_run().count_skip(agent_name, reason)
+        return False
+
+    # Checked, fetched and stored in one spelling (see url_canon)
+    url = url_canon.canonical_url(url)
+
+    logger.info(f"[{agent_name}] Processing URL: {url}")
+
+    item_id = make_id(url, agent_name)
+
+    if item_exists(item_id):
+        logger.info(
+            f"[{agent_name}] Skipping duplicate URL (already in table or attached to a contact): {url}"
+        )
+        return False
+
+    try:
+        email = current_run().frontier.resolve(
+            url, agent_name, lambda u: resolve_url_email(agent_name, u)
+        )
+    except PageSkipped as e:
+        logger.info(f"[{agent_name}] {e}")
+        current_run().count_skip(agent_name, e.reason)
+        return False
+
+    if not email:
+        logger.info(
+            f"[{agent_name}] No email found even after fallback. Skipping URL: {url}"
+        )
+        return False
+
+    segment = agent_segment(agent_name, cfg)
+
+    item = {
+        "id": item_id,
+        "url": url,
+        "title": title or "",
+        "contact_email": email,
+        "contact_email_norm": normalize_email(email),
+        "source": agent_name,
+        "segment": segment,
+        "campaign": CAMPAIGN_LABEL,
+        "scraped_at": int(time.time()),
+    }
+
+    owner_id = claim_contact(item)
+    if owner_id:
+        logger.info(f"[{agent_name}] {email} is already a contact (id={owner_id}); attaching URL: {url}")
+        current_run().attach(owner_id, url, agent_name)
+        current_run().bump("contacts_attached")
+        return False
+
+    logger.info(f"[{agent_name}] Saving item to DynamoDB: {url}")
+    if writer.add(item):
+        return True
+
+    logger.info(f"[{agent_name}] Skipping duplicate URL (already saved this run): {url}")
+    return False
+
+
+def process_before_deadline(agent_name: str, cfg: dict, result: dict, writer: LeadWriter) -> bool | None:
+    """process_search_result(), or None if the run is out of time."""
+    if current_run().out_of_time():
+        return None
+    return process_search_result(agent_name, cfg, result, writer)
+
+
+def resume_position(first: tuple, pages: dict, handled: dict, query_count: int) -> tuple:
+    """
+    First (query index, result index) not handled yet, given each
+    query's first page (`pages`, None if not searched) and the result
+    indexes handled this run; (query_count, 0) when all are done.
+    """
+    for qi in range(first[0], query_count):
+        items = pages.get(qi)
+        ri = first[1] if qi == first[0] else 0
+        if items is None:
+            return (qi, ri)
+        while ri < len(items) and ri in handled.get(qi, ()):
+            ri += 1
+        if ri < len(items):
+            return (qi, ri)
+    return (query_count, 0)
+
+
+# Worker threads for the blocking scraper steps, one pool per size, shared
+# by every agent and event loop and kept for warm invocations (asyncio.run
+# shuts down its loop's default executor, so that can't be reused)
+_worker_pools: dict[int, ThreadPoolExecutor] = {}
+_worker_pools_lock = threading.Lock()
+
+
+def worker_pool(max_workers: int) -> ThreadPoolExecutor:
+    max_workers = max(1, max_workers)
+    with _worker_pools_lock:
+        pool = _worker_pools.get(max_workers)
+        if pool is None:
+            pool = _worker_pools[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="scraper"
+            )
+        return pool
+
+
+async def in_worker(fn, *args):
+    """Run fn(*args) on the run's worker pool with the caller's context (the current ScrapeRun)."""
+    pool = current_run().workers or worker_pool(SCRAPER_MAX_CONCURRENCY)
+    return await asyncio.get_running_loop().run_in_executor(pool, copy_context().run, fn, *args)
+
+
+async def run_blocking(sem: asyncio.Semaphore, fn, *args):
+    """Run a blocking scraper step in a worker thread, bounded by sem."""
+    async with sem:
+        return await in_worker(fn, *args)
+
+
+async def run_agent_async(agent_name: str, sem: asyncio.Semaphore, lambda_context=None) -> dict:
+    """
+    One agent on the shared event loop, in rounds: each round searches a
+    page for every query concurrently, then fetches all of their result
+    pages. Queries whose page brought new leads get their next page in
+    the following round (see next_page_start). Leads are batch-written
+    and flushed before the agent reports its saved count.
+
+    With a checkpoint on the run, the first round resumes from the
+    agent's saved (query index, result index), and where it stopped is
+    saved again if the run runs out of time.
+    """
+    if agent_name not in get_agents():
+        raise ValueError(f"Unknown agent: {agent_name}")
+
+    cfg = get_agents()[agent_name]
+    run = current_run()
+    checkpoint = run.checkpoint
+
+    if run.out_of_time():
+        logger.info(f"[{agent_name}] Out of time, leaving it for the next run.")
+        return {"message": f"{agent_name} deferred to the next run.", "saved": 0, "source": agent_name}
+
+    first = checkpoint.position(agent_name) if checkpoint else (0, 0)
+    if first != (0, 0):
+        logger.info(f"[{agent_name}] Resuming at query {first[0]}, result {first[1]}.")
+    else:
+        logger.info(f"[{agent_name}] Starting run. Segment: {cfg.get('segment', '')}")
+
+    num = cfg["max_results_per_query"]
+    all_queries = cfg["search_queries"]
+    # Query index -> query, for the queries this run searches
+    queries = {
+        qi: q for qi, q in enumerate(all_queries)
+        if qi >= first[0] and not run.is_query_skipped(agent_name, q)
+    }
+    starts = await asyncio.gather(*(run_blocking(sem, load_query_cursor, q, num) for q in queries.values()))
+    pending = dict(zip(queries, starts))
+
+    first_pages = {qi: [] for qi in range(first[0], len(all_queries)) if qi not in queries}
+    handled: dict[int, set] = {}
+    yields = {}  # query -> (pages searched, new leads)
+    writer = LeadWriter(agent_name, lambda_context)
+    try:
+        for page in range(max(1, CSE_MAX_PAGES_PER_RUN)):
+            if not pending or run.out_of_time():
+                break
+            batch = list(pending.items())
+            searches = await asyncio.gather(
+                *(run_blocking(sem, search_agent_query, agent_name, cfg, queries[qi], start, page == 0)
+                  for qi, start in batch)
+            )
+            results = [
+                (qi, ri, result)
+                for (qi, _), items in zip(batch, searches)
+                for ri, result in enumerate(items or [])
+                # Already handled before the checkpoint
+                if not (page == 0 and qi == first[0] and ri < first[1])
+            ]
+            results = interleave_by_host(results, link=lambda entry: entry[2].get("link"))
+            outcomes = await asyncio.gather(
+                *(run_blocking(sem, process_before_deadline, agent_name, cfg, r, writer) for _, _, r in results)
+            )
+
+            new_leads = {qi: 0 for qi, _ in batch}
+            # Queries with results left unhandled at the deadline
+            unfinished = set()
+            for (qi, ri, _), outcome in zip(results, outcomes):
+                if outcome is None:
+                    unfinished.add(qi)
+                    continue
+                if page == 0:
+                    handled.setdefault(qi, set()).add(ri)
+                if outcome:
+                    new_leads[qi] += 1
+
+            pending = {}
+            cursors = {}
+            for (qi, start), items in zip(batch, searches):
+                if page == 0:
+                    # Not searched because of the deadline: resume here. Not
+                    # searched for other reasons (quota, errors): move on.
+                    first_pages[qi] = None if items is None and run.out_of_time() else items or []
+                if items is None:
+                    # Not searched (CSE error, quota): keep the cursor where
+                    # it was and try the same page again next round
+                    pending[qi] = start
+                    continue
+                q = queries[qi]
+                # Only pages that came back count towards the query's yield
+                pages, saved = yields.get(q, (0, 0))
+                yields[q] = (pages + 1, saved + new_leads[qi])
+                if qi in unfinished:
+                    # The checkpoint's result index points into this page:
+                    # resume on it, not on the next one
+                    cursors[q] = start
+                    continue
+                cursors[q] = next_page_start(start, num, len(items), new_leads[qi])
+                if cursors[q] > 1:
+                    pending[qi] = cursors[q]
+            for q, next_start in cursors.items():
+                await run_blocking(sem, save_query_cursor, q, num, next_start)
+    finally:
+        await run_blocking(sem, writer.flush)
+    total_saved = writer.saved
+
+    await run_blocking(sem, record_query_yields, yields)
+
+    position = resume_position(first, first_pages, handled, len(all_queries))
+    if checkpoint:
+        if position[0] >= len(all_queries):
+            await run_blocking(sem, checkpoint.finish, agent_name)
+        else:
+            logger.info(f"[{agent_name}] Out of time at query {position[0]}, result {position[1]}; checkpoint saved.")
+            await run_blocking(sem, checkpoint.advance, agent_name, position)
+
+    if writer.failed:
+        logger.error(f"[{agent_name}] Failed to save {writer.failed} items.")
+
+    logger.info(f"[{agent_name}] Finished. Saved {total_saved} items.")
+    metrics.put("LeadsSaved", total_saved, Agent=agent_name)
+    metrics.put("LeadsSaved", total_saved, Segment=agent_segment(agent_name, cfg))
+    return {
+        "message": f"{agent_name} ran successfully. Saved {total_saved} items.",
+        "saved": total_saved,
+        "source": agent_name,
+        "prefilter_skips": run.agent_skips(agent_name),
+    }
+
+
+async def run_agents_async(agent_names: list, concurrency: int, lambda_context=None) -> dict:
+    """
+    Run several agents on one event loop.
+
+    `concurrency` is the global limit on in-flight searches/fetches
+    across ALL agents. Returns {agent_name: run result}.
+    """
+    concurrency = max(1, concurrency)
+    current_run().workers = worker_pool(concurrency)
+    sem = asyncio.Semaphore(concurrency)
+
+    results = await asyncio.gather(
+        *(run_agent_async(name, sem, lambda_context) for name in agent_names),
+        return_exceptions=True,
+    )
+
+    by_agent = {}
+    for name, res in zip(agent_names, results):
+        if isinstance(res, Exception):
+            logger.error(f"[{name}] Agent run failed: {res}")
+            res = {"message": f"{name} failed: {res}", "saved": 0, "source": name}
+        by_agent[name] = res
+
+    # Every writer has flushed, so leads first seen this run exist now
+    await in_worker(current_run().flush_attachments)
+    return by_agent
+
+
+def run_agent(agent_name: str, context: dict | None = None, lambda_context=None) -> dict:
+    """
+    Generic runner for all 50 book agents.
+
+    - De-duplicates by id, and by contact email: a lead for an email
+      already in the table is attached to that contact (CONTACT_EMAIL_INDEX)
+      and its id kept as an attachment marker, so the URL isn't fetched again
+    - Only saves items that have a non-empty contact_email
+    - Searches and result pages are handled by up to
+      SCRAPER_URL_WORKERS at a time (event "url_workers" overrides it),
+      so one agent takes about as long as its slowest page
+    """
+    if agent_name not in get_agents():
+        raise ValueError(f"Unknown agent: {agent_name}")
+
+    workers = SCRAPER_URL_WORKERS
+    if isinstance(context, dict) and context.get("url_workers"):
+        workers = int(context["url_workers"])
+
+    current_run()
+    return asyncio.run(run_agents_async([agent_name], workers, lambda_context))[agent_name]
+
+
+def run_agents(agent_names: list, event: dict | None = None, lambda_context=None) -> dict:
+    """
+    Run a list of agents in this invocation with the configured engine.
+    Returns {agent_name: run result}.
+    """
+    engine = SCRAPER_ENGINE
+    if isinstance(event, dict) and event.get("engine"):
+        engine = str(event["engine"]).lower()
+
+    logger.info(
+        f"[book_scraper_handler] Running {len(agent_names)} agents (engine={engine})."
+    )
+
+    run = current_run()
+    run.set_deadline(lambda_context)
+    run.checkpoint = ScrapeCheckpoint(agent_names)
+    if run.checkpoint.resumed:
+        logger.info(
+            f"[book_scraper_handler] Resuming checkpoint: {len(run.checkpoint.pending)} agents left in this cycle."
+        )
+    agent_names = run.checkpoint.run_order()
+
+    budget = event.get("cse_budget") if isinstance(event, dict) else None
+    run.quota = plan_cse_quota(list(agent_names), budget, run.checkpoint)
+
+    if engine == "asyncio":
+        concurrency = SCRAPER_MAX_CONCURRENCY
+        if isinstance(event, dict) and event.get("max_concurrency"):
+            concurrency = int(event["max_concurrency"])
+        results = asyncio.run(run_agents_async(list(agent_names), concurrency, lambda_context))
+    else:
+        results = {name: run_agent(name, event, lambda_context) for name in agent_names}
+
+    run.checkpoint.end_run()
+    return results
+
+# ---------------------------------------------------
+# Fan-out dispatcher (one scraper invocation per shard)
+# ---------------------------------------------------
+
+_lambda_client = None
+
+
+def get_lambda_client():
+    global _lambda_client
+    if _lambda_client is None:
+        import boto3
+        import botocore.config
+
+        # Shards are invoked asynchronously, so a call only waits for
+        # Lambda to queue the event; no retries (a retry after a lost
+        # response would scrape the same shard twice)
+        _lambda_client = boto3.client(
+            "lambda",
+            config=botocore.config.Config(
+                read_timeout=30, connect_timeout=10, retries={"max_attempts": 0}
+            ),
+        )
+    return _lambda_client
+
+
+def lambda_invoker(payload: dict) -> dict:
+    """
+    Queue an asynchronous ("Event") invocation of the deployed scraper.
+    Returns {"statusCode": 202} once Lambda has accepted it: the shard
+    reports its own results (log line + EMF metrics), and the dispatcher
+    doesn't wait out its run.
+    """
+    resp = get_lambda_client().invoke(
+        FunctionName=SCRAPER_FUNCTION_NAME,
+        InvocationType="Event",
+        Payload=json.dumps(payload).encode("utf-8"),
+    )
+    if resp.get("StatusCode") != 202:
+        raise RuntimeError(f"Invoke not accepted: status {resp.get('StatusCode')}")
+    return {"statusCode": 202}
+
+
+def local_invoker(payload: dict) -> dict:
+    """In-process, synchronous stand-in for lambda_invoker (local runs / tests)."""
+    return book_scraper_handler(payload, None)
+
+
+INVOKERS = {
+    "lambda": lambda_invoker,
+    "local": local_invoker,
+}
+
+
+def shard_agents(agent_names: list, shards: int) -> list:
+    """Round-robin agents into at most `shards` non-empty shards."""
+    shards = max(1, min(shards, len(agent_names)))
+    return [agent_names[i::shards] for i in range(shards)]
+
+
+def dispatch_agents(agent_names: list, shards: int, invoker=None, event: dict | None = None) -> dict:
+    """
+    Invoke the scraper once per shard, all shards in parallel.
+
+    `invoker` takes a payload dict and returns either {"statusCode": 202}
+    for a queued asynchronous invocation (lambda_invoker: the shard
+    reports its own results) or the scraper's {"statusCode", "body"}
+    response (local_invoker), whose per-agent results are merged into
+    the summary body. While any shard is queued, total_saved and
+    by_agent are None rather than a partial count; the queued agents
+    are listed under "queued_agents".
+    """
+    invoker = invoker or lambda_invoker
+    shard_list = shard_agents(list(agent_names), shards)
+
+    passthrough = {}
+    if isinstance(event, dict):
+        passthrough = {k: event[k] for k in ("engine", "max_concurrency", "url_workers", "profile") if k in event}
+
+    logger.info(f"[dispatcher] Fanning out {len(agent_names)} agents over {len(shard_list)} shards.")
+
+    # Split what's left of today's CSE quota by each shard's query count,
+    # so shards running in parallel can't overspend it between them
+    remaining = max(0, CSE_DAILY_BUDGET - cse_spent_today())
+    agents = get_agents()
+    shard_queries = [sum(len(agents[n]["search_queries"]) for n in names) for names in shard_list]
+    total_queries = sum(shard_queries) or 1
+    shard_budgets = [remaining * q // total_queries for q in shard_queries]
+
+    def invoke_shard(index, names, budget):
+        return invoker({"agent_names": names, "cse_budget": budget, "shard": index, **passthrough})
+
+    total_saved = 0
+    per_agent = {}
+    prefilter_skips = {}
+    run_stats: dict[str, int] = {}
+    failed_shards = []
+    queued_shards = []
+    queued_agents = []
+    stopped_shards = []
+    cse_quota = {"daily_budget": CSE_DAILY_BUDGET, "remaining_at_dispatch": remaining,
+                 "query_spent": 0, "fallback_spent": 0, "skipped_queries": []}
+
+    with ThreadPoolExecutor(max_workers=len(shard_list)) as pool:
+        futures = [
+            pool.submit(invoke_shard, index, names, budget)
+            for index, (names, budget) in enumerate(zip(shard_list, shard_budgets))
+        ]
+        for index, (names, future) in enumerate(zip(shard_list, futures)):
+            try:
+                resp = future.result()
+                if resp.get("statusCode") == 202:
+                    queued_shards.append(index)
+                    queued_agents.extend(names)
+                    continue
+                body = resp.get("body", {})
+                if isinstance(body, str):
+                    body = json.loads(body)
+                if resp.get("statusCode", 200) != 200:
+                    raise RuntimeError(body.get("message", f"status {resp.get('statusCode')}"))
+            except Exception as e:
+                logger.error(f"[dispatcher] Shard {index} failed ({', '.join(names)}): {e}")
+                failed_shards.append({"shard": index, "agents": names, "error": str(e)})
+                continue
+
+            for name, saved in body.get("by_agent", {}).items():
+                per_agent[name] = saved
+                total_saved += saved
+            prefilter_skips.update(body.get("prefilter_skips", {}))
+            for stat, value in body.get("run_stats", {}).items():
+                run_stats[stat] = run_stats.get(stat, 0) + value
+            if body.get("stopped_before_deadline"):
+                stopped_shards.append(index)
+            shard_quota = body.get("cse_quota", {})
+            cse_quota["query_spent"] += shard_quota.get("query_spent", 0)
+            cse_quota["fallback_spent"] += shard_quota.get("fallback_spent", 0)
+            cse_quota["skipped_queries"] += shard_quota.get("skipped_queries", [])
+
+    message = f"Dispatched {len(agent_names)} book agents over {len(shard_list)} shards."
+    if queued_shards:
+        message += (f" {len(queued_shards)} shards queued; they report their own results "
+                    f"(\"Shard N done\" log line, LeadsSaved metrics).")
+    return {
+        "message": message,
+        # Unknown until the queued shards finish
+        "total_saved": None if queued_shards else total_saved,
+        "by_agent": None if queued_shards else per_agent,
+        "shards": len(shard_list),
+        "failed_shards": failed_shards,
+        # Invoked asynchronously: their results are in their own logs / metrics
+        "queued_shards": queued_shards,
+        "queued_agents": queued_agents,
+        # Shards that hit the deadline; they resume from their checkpoint
+        "stopped_shards": stopped_shards,
+        "run_stats": run_stats,
+        "prefilter_skips": prefilter_skips,
+        "cse_quota": cse_quota,
+    }
+
+# Run stats counting (hits, misses) of each persistent cache store
+CACHE_STATS = {
+    "cse": ("cse_cache_hits", "cse_cache_misses"),
+    "http": ("http_not_modified", "http_full_fetches"),
+    "domain": ("domain_cache_hits", "domain_cache_misses"),
+}
+
+
+def put_cache_metrics(run_stats: dict):
+    """CacheHit / CacheMiss counts and CacheHitRate per cache store."""
+    for cache, (hit_stat, miss_stat) in CACHE_STATS.items():
+        hits = run_stats.get(hit_stat, 0)
+        misses = run_stats.get(miss_stat, 0)
+        if not hits + misses:
+            continue
+        metrics.put("CacheHit", hits, Cache=cache)
+        metrics.put("CacheMiss", misses, Cache=cache)
+        metrics.put("CacheHitRate", 100 * hits / (hits + misses), "Percent", Cache=cache)
+
+# ---------------------------------------------------
+# Single scraper handler (Option 1B)
+# ---------------------------------------------------
+
+@metrics.invocation("book_scraper_handler")
+@profiling.profiled("book_scraper_handler")
+def book_scraper_handler(event, context):
+    """
+    EventBridge passes in one of:
+      {"agent_name": "campus_bookstore_east_agent"}   -> that agent only
+      {"agent_names": ["...", "..."]}                  -> one shard of agents
+      {"mode": "dispatch", "shards": 10}               -> fan out: invoke this
+                                                          function once per shard
+
+    If none is given, this will run ALL 50 agents, either one after
+    another or (engine "asyncio", via SCRAPER_ENGINE or the event's
+    "engine" field) concurrently on one event loop.
+    """
+    agent_name = None
+    if isinstance(event, dict):
+        agent_name = event.get("agent_name") or event.get("agent")
+
+    if agent_name:
+        if agent_name not in get_agents():
+            raise ValueError(f"Unknown agent: {agent_name}")
+        logger.info(f"[book_scraper_handler] Running single agent: {agent_name}")
+        run = begin_scrape_run()
+        run.set_deadline(context)
+        run.quota = plan_cse_quota([agent_name], event.get("cse_budget"))
+        body = run_agent(agent_name, event, context)
+        body["run_stats"] = run.summary()
+        body["cse_quota"] = run.quota.summary()
+        put_cache_metrics(body["run_stats"])
+        return make_response(body)
+
+    if isinstance(event, dict) and event.get("mode") == "dispatch":
+        shards = int(event.get("shards") or SCRAPER_DISPATCH_SHARDS)
+        invoker = INVOKERS.get(event.get("invoker", "lambda"))
+        if invoker is None:
+            return make_response(
+                {"message": f"Unknown invoker: {event['invoker']} (expected one of: {', '.join(INVOKERS)})"}, 400
+            )
+        body = dispatch_agents(list(get_agents()), shards, invoker=invoker, event=event)
+        return make_response(body)
+
+    if isinstance(event, dict) and event.get("agent_names"):
+        agent_names = list(event["agent_names"])
+        agents = get_agents()
+        unknown = [name for name in agent_names if name not in agents]
+        if unknown:
+            raise ValueError(f"Unknown agent(s): {', '.join(unknown)}")
+        message = f"{len(agent_names)} book agents ran."
+    else:
+        # Fallback: run all 50 agents
+        logger.info("[book_scraper_handler] No agent_name provided, running ALL agents.")
+        agent_names = list(get_agents())
+        message = "All book agents ran."
+
+    run = begin_scrape_run()
+    results = run_agents(agent_names, event, context)
+
+    total_saved = 0
+    per_agent = {}
+    prefilter_skips = {}
+    for name, res in results.items():
+        total_saved += res.get("saved", 0)
+        per_agent[name] = res.get("saved", 0)
+        if res.get("prefilter_skips"):
+            prefilter_skips[name] = res["prefilter_skips"]
+
+    run_stats = run.summary()
+    put_cache_metrics(run_stats)
+    if isinstance(event, dict) and "shard" in event:
+        # Invoked asynchronously by the dispatcher: nobody reads the response
+        logger.info(
+            f"[book_scraper_handler] Shard {event['shard']} done: saved {total_saved} "
+            f"({json.dumps(per_agent)}), stopped before deadline: {run.out_of_time()}"
+        )
+    return make_response(
+        {
+            "message": message,
+            "total_saved": total_saved,
+            "by_agent": per_agent,
+            "run_stats": run_stats,
+            "prefilter_skips": prefilter_skips,
+            "cse_quota": run.quota.summary(),
+            "stopped_before_deadline": run.out_of_time(),
+            "checkpoint": run.checkpoint.summary(),
+        }
+    )
+
+# ---------------------------------------------------
+# Cold start
+# ---------------------------------------------------
+
+report_init("book_scraper", _init_started)
@@ -0,0 +1,132 @@
+"""
+Build one deployment zip per Lambda function from the shared code.
+
+Each zip holds the function's entry module plus the local modules it
+imports (found by walking their import statements, including imports
+inside functions), as source and precompiled bytecode, so a cold start
+neither ships nor compiles code the function never runs. boto3 /
+botocore come from the Lambda runtime.
+
+    python3.12 build_lambdas.py                        # every function -> build/<name>.zip
+    python3.12 build_lambdas.py book-daily-outreach    # just one
+
+The bytecode is compiled by the interpreter running this script: use
+the runtime's version (python3.12 in lambda.tf), otherwise the runtime
+ignores the .pyc files and compiles the sources itself.
+"""
+import argparse
+import ast
+import os
+import py_compile
+import sys
+import tempfile
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUILD_DIR = os.path.join(HERE, "build")
+RUNTIME_PYTHON = (3, 12)
+
+# Function name (lambda.tf) -> entry module; handler is <module>.<handler>
+FUNCTIONS = {
+    "book-agents-scraper": "book_scraper",
+    "book-daily-outreach": "book_outreach",
+    "book-reply-stats-report": "book_reply_report",
+    # Standalone SGA agent, not managed by lambda.tf: upload the zip to its
+    # existing function (handler sga_lambda_function.lambda_handler), see README
+    "sga-agent": "sga_lambda_function",
+}
+
+# Fixed timestamps so unchanged code builds an identical zip (and
+# Terraform's source_code_hash doesn't change)
+ZIP_DATE_TIME = (2020, 1, 1, 0, 0, 0)
+
+
+def local_imports(module: str) -> set:
+    """Modules in this directory that `module` imports anywhere."""
+    with open(os.path.join(HERE, f"{module}.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return {name for name in names if os.path.exists(os.path.join(HERE, f"{name}.py"))}
+
+
+def module_closure(entry: str) -> list:
+    """`entry` and every local module reachable from it."""
+    seen = set()
+    pending = [entry]
+    while pending:
+        module = pending.pop()
+        if module not in seen:
+            seen.add(module)
+            pending.extend(local_imports(module) - seen)
+    return sorted(seen)
+
+
+def zip_entry(name: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def build(function: str, entry: str, out_dir: str = BUILD_DIR) -> dict:
+    """Write <out_dir>/<function>.zip; returns what went into it."""
+    modules = module_closure(entry)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{function}.zip")
+
+    with zipfile.ZipFile(path, "w") as zf, tempfile.TemporaryDirectory() as tmp:
+        for module in modules:
+            source = os.path.join(HERE, f"{module}.py")
+            with open(source, "rb") as f:
+                zf.writestr(zip_entry(f"{module}.py"), f.read())
+
+            # Unchecked: /var/task is read-only and never changes under the
+            # .pyc, so the runtime can skip comparing it with the source
+            pyc = os.path.join(tmp, f"{module}.pyc")
+            py_compile.compile(
+                source,
+                cfile=pyc,
+                dfile=f"{module}.py",
+                doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+            with open(pyc, "rb") as f:
+                zf.writestr(zip_entry(f"__pycache__/{module}.{sys.implementation.cache_tag}.pyc"), f.read())
+
+    return {"function": function, "handler_module": entry, "modules": modules,
+            "path": path, "bytes": os.path.getsize(path)}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("functions", nargs="*", help=f"function names (default: all of {', '.join(FUNCTIONS)})")
+    parser.add_argument("--out", default=BUILD_DIR, help="output directory (default: build/)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    unknown = [name for name in args.functions if name not in FUNCTIONS]
+    if unknown:
+        sys.exit(f"Unknown function(s): {', '.join(unknown)}")
+
+    if sys.version_info[:2] != RUNTIME_PYTHON:
+        print(
+            f"Warning: compiling with Python {sys.version_info[0]}.{sys.version_info[1]}, the runtime is "
+            f"{RUNTIME_PYTHON[0]}.{RUNTIME_PYTHON[1]}; the bundled .pyc files won't be used.",
+            file=sys.stderr,
+        )
+
+    for function in args.functions or FUNCTIONS:
+        result = build(function, FUNCTIONS[function], args.out)
+        print(f"{function:<26}{result['bytes'] / 1024:>8.1f} KB  {', '.join(result['modules'])}")
+
+
+if __name__ == "__main__":
+    main()
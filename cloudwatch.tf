@@ -18,8 +18,10 @@
 #   - 08:00 AM Eastern (standard time)
 #   - 09:00 AM Eastern (during daylight savings)
 #
-# book_scraper_handler(event, context) will see NO agent_name
-# and will automatically loop through every entry in AGENTS.
+# book_scraper_handler(event, context) gets {"mode": "dispatch"}: it splits
+# AGENTS into SCRAPER_DISPATCH_SHARDS shards and invokes itself
+# asynchronously once per shard; each shard logs its own results and
+# emits its own metrics.
 resource "aws_cloudwatch_event_rule" "book_agents_scrape_daily" {
   name                = "book-agents-scrape-daily"
   description         = "Run all 50 book scraper agents once per day"
@@ -31,7 +33,10 @@ resource "aws_cloudwatch_event_target" "book_agents_scrape_target" {
   target_id = "book-agents-scraper-lambda"
   arn       = aws_lambda_function.book_agents_scraper.arn
 
-  # No input -> handler runs ALL agents
+  # Dispatcher -> one parallel scraper invocation per shard of agents
+  input = jsonencode({
+    mode = "dispatch"
+  })
 }
 
 resource "aws_lambda_permission" "book_agents_scrape_permission" {
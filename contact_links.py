@@ -0,0 +1,116 @@
+"""
+Same-host "Contact / Staff / Directory" link discovery on raw page bytes.
+
+When a result page has no email, the page it links to as "Contact us"
+or "Staff directory" usually does. ContactLinkScanner is fed the same
+chunks as email_extract.EmailScanner while the page streams in, pulls
+out <a href=...>text</a> pairs and ranks the ones on the page's own
+host by anchor text and path:
+
+    anchor text  "contact" / "staff" / "directory" ...   +3 .. +1
+    path         /contact, /staff, /directory, ...       +3 .. +1
+
+Links scoring under MIN_LINK_SCORE (a lone "about" isn't enough),
+off-host links, mailto:/tel:/javascript:, in-page anchors and files
+(PDFs, images, ...) are ignored.
+"""
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+# Keyword -> score, checked against the lowercased anchor text / path
+TEXT_KEYWORDS = {
+    "contact": 3, "staff": 3, "directory": 3, "people": 2, "our team": 2,
+    "meet the": 2, "personnel": 2, "leadership": 1, "about": 1, "office": 1,
+}
+PATH_KEYWORDS = {
+    "contact": 3, "staff": 2, "directory": 2, "people": 2, "team": 2,
+    "personnel": 2, "about": 1,
+}
+MIN_LINK_SCORE = 2
+
+FILE_EXTENSIONS = frozenset({
+    "pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx", "zip", "jpg", "jpeg",
+    "png", "gif", "svg", "webp", "mp3", "mp4", "mov", "ics", "css", "js",
+})
+
+# Bytes kept from the end of a chunk so a tag split across chunks is
+# still matched; longer anchors are ignored
+MAX_ANCHOR_BYTES = 2048
+
+_ANCHOR = re.compile(
+    rb"<a\s[^>]*?href\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))[^>]*>(.{0,1024}?)</a\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG = re.compile(rb"<[^>]*>")
+_SPACE = re.compile(r"\s+")
+
+
+def score_link(text: str, path: str) -> int:
+    text = text.lower()
+    path = path.lower()
+    score = max((s for k, s in TEXT_KEYWORDS.items() if k in text), default=0)
+    score += max((s for k, s in PATH_KEYWORDS.items() if k in path), default=0)
+    return score
+
+
+class ContactLinkScanner:
+    """
+    Incremental link extractor: feed() the body chunk by chunk (or all
+    at once with final=True), then ranked() gives the likely contact
+    pages on the same host, best first.
+    """
+
+    def __init__(self, page_url: str):
+        parts = urlsplit(page_url)
+        self.page_url = page_url
+        self.host = parts.netloc.lower()
+        self._page = urlunsplit(parts._replace(fragment="")).rstrip("/")
+        self._links: dict[str, int] = {}
+        self._carry = b""
+
+    def _consider(self, href: bytes, text: bytes):
+        href = href.decode("utf-8", "replace").strip()
+        if not href or href.startswith("#"):
+            return
+
+        url = urljoin(self.page_url, href)
+        parts = urlsplit(url)
+        # Also drops mailto:, tel:, javascript:, ...
+        if parts.scheme not in ("http", "https") or parts.netloc.lower() != self.host:
+            return
+        url = urlunsplit(parts._replace(fragment=""))
+        if url.rstrip("/") == self._page:
+            return
+        last = parts.path.rsplit("/", 1)[-1]
+        if "." in last and last.rsplit(".", 1)[-1].lower() in FILE_EXTENSIONS:
+            return
+
+        label = _SPACE.sub(" ", _TAG.sub(b" ", text).decode("utf-8", "replace")).strip()
+        score = score_link(label, parts.path)
+        if score >= MIN_LINK_SCORE and score > self._links.get(url, 0):
+            self._links[url] = score
+
+    def feed(self, chunk: bytes, final: bool = False):
+        data = self._carry + chunk
+        end = 0
+        for match in _ANCHOR.finditer(data):
+            href = match.group(1) or match.group(2) or match.group(3) or b""
+            self._consider(href, match.group(4))
+            end = match.end()
+
+        if final:
+            self._carry = b""
+        else:
+            self._carry = data[max(end, len(data) - MAX_ANCHOR_BYTES):]
+
+    def ranked(self, limit: int | None = None) -> list:
+        """Same-host links that look like contact pages, best first (first seen on ties)."""
+        order = sorted(self._links.items(), key=lambda link: -link[1])
+        return [url for url, _ in order[:limit]]
+
+
+def contact_links(data: bytes, page_url: str, limit: int | None = None) -> list:
+    """Likely contact pages linked from a whole page body, best first."""
+    scanner = ContactLinkScanner(page_url)
+    scanner.feed(data, final=True)
+    return scanner.ranked(limit)
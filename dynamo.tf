@@ -13,6 +13,46 @@ resource "aws_dynamodb_table" "book_leads" {
     type = "S"
   }
 
+  # Lowercased contact_email: the scraper checks it before saving a lead
+  # so each contact is one item (migrate_lead_urls.py fills old items)
+  attribute {
+    name = "contact_email_norm"
+    type = "S"
+  }
+
+  global_secondary_index {
+    name            = "contact_email-index"
+    hash_key        = "contact_email_norm"
+    projection_type = "KEYS_ONLY"
+  }
+
+  tags = {
+    Project     = "book-agents-50"
+    Environment = "prod"
+    Owner       = "Tawan"
+  }
+}
+
+#############################################
+# Scraper cache (HTTP validators, ...)
+#############################################
+
+resource "aws_dynamodb_table" "book_scraper_cache" {
+  name         = "book-scraper-cache-v1"
+  billing_mode = "PAY_PER_REQUEST"
+
+  hash_key = "pk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
   tags = {
     Project     = "book-agents-50"
     Environment = "prod"
@@ -0,0 +1,193 @@
+"""
+Single-pass email extraction on raw page bytes, shared by the scrapers.
+
+Instead of running a regex over the whole decoded page, we jump from
+one "@" to the next with bytes.find() and only look at the few bytes
+around each anchor, so a page is scanned once, linearly, without
+decoding it first.
+
+Candidates are ranked while scanning:
+    mailto: link          +4
+    on the page's domain  +2
+    .edu address          +1
+and the best one wins (the first seen on ties).
+"""
+from urllib.parse import urlparse
+
+MAX_LOCAL_LEN = 64
+MAX_DOMAIN_LEN = 253
+
+_MAILTO = b"mailto:"
+# Bytes kept before an unscanned position so a local part (and its
+# mailto: prefix) that started in the previous chunk is still seen
+_LEFT_CONTEXT = MAX_LOCAL_LEN + len(_MAILTO)
+
+_ALNUM = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+LOCAL_CHARS = frozenset(_ALNUM + b"._%+-")
+DOMAIN_CHARS = frozenset(_ALNUM + b".-")
+
+# "logo@2x.png" and friends look like addresses but are file names
+FILE_EXTENSIONS = frozenset({
+    "png", "jpg", "jpeg", "gif", "svg", "webp", "bmp", "ico", "tif", "tiff",
+    "css", "js", "json", "map", "woff", "woff2", "ttf", "eot", "pdf",
+})
+
+RANK_MAILTO = 4
+RANK_SAME_SITE = 2
+RANK_EDU = 1
+
+
+# Second-level labels under a country TLD that are public suffixes
+# themselves ("ox.ac.uk", "school.edu.au", "shop.co.jp"); no PSL download
+COUNTRY_SECOND_LEVELS = frozenset({
+    "ac", "co", "com", "edu", "gov", "govt", "k12", "ltd", "mil", "net",
+    "nhs", "org", "plc", "sch",
+})
+# Third-level labels under "<state>.us" that are public suffixes
+# ("myschool.k12.ca.us", "college.cc.or.us")
+US_STATE_THIRD_LEVELS = frozenset({
+    "k12", "cc", "lib", "tec", "gen", "state", "dst", "cog", "mus", "pvt",
+})
+
+
+def site_of(host: str) -> str:
+    """
+    Registrable domain of a host: the public suffix plus one label
+    ("www.cs.example.edu" -> "example.edu", "www.ox.ac.uk" -> "ox.ac.uk",
+    "www.myschool.k12.ca.us" -> "myschool.k12.ca.us").
+    """
+    host = (host or "").lower().split(":")[0].strip(".")
+    labels = host.split(".")
+    suffix = 1
+    if len(labels) >= 3 and len(labels[-1]) == 2:
+        if labels[-1] == "us" and len(labels[-2]) == 2:
+            suffix = 3 if len(labels) >= 4 and labels[-3] in US_STATE_THIRD_LEVELS else 2
+        elif labels[-2] in COUNTRY_SECOND_LEVELS:
+            suffix = 2
+    return ".".join(labels[-(suffix + 1):])
+
+
+def _candidate_at(data: bytes, at: int):
+    """
+    Expand around the "@" at `at`.
+
+    Returns (email, start, end, is_mailto) where email is None when the
+    bytes around the anchor are not a plausible address, and `end` is
+    where the domain run stopped.
+    """
+    start = at
+    floor = max(0, at - MAX_LOCAL_LEN - 1)
+    while start > floor and data[start - 1] in LOCAL_CHARS:
+        start -= 1
+
+    end = at + 1
+    ceiling = min(len(data), at + 1 + MAX_DOMAIN_LEN + 1)
+    while end < ceiling and data[end] in DOMAIN_CHARS:
+        end += 1
+
+    is_mailto = data[max(0, start - len(_MAILTO)):start].lower() == _MAILTO
+    local = data[start:at]
+    domain = data[at + 1:end].rstrip(b".-")
+
+    # Runs that hit the length limits are junk (base64, hashes, ...)
+    if start == floor and start > 0 and data[start - 1] in LOCAL_CHARS:
+        return None, start, end, is_mailto
+    if end == ceiling and end < len(data):
+        return None, start, end, is_mailto
+    if len(local) > MAX_LOCAL_LEN or len(domain) > MAX_DOMAIN_LEN:
+        return None, start, end, is_mailto
+
+    if not local or local[:1] == b"." or local[-1:] == b".":
+        return None, start, end, is_mailto
+
+    labels = domain.split(b".")
+    if len(labels) < 2 or not all(labels):
+        return None, start, end, is_mailto
+    tld = labels[-1]
+    if len(tld) < 2 or not tld.isalpha() or tld.lower().decode() in FILE_EXTENSIONS:
+        return None, start, end, is_mailto
+
+    return (local + b"@" + domain).decode("ascii"), start, end, is_mailto
+
+
+class EmailScanner:
+    """
+    Incremental extractor: feed() the body chunk by chunk (or all at
+    once with final=True) and read `best`. `done` turns True once nothing
+    later in the page could outrank the current best.
+    """
+
+    def __init__(self, page_url: str | None = None):
+        self.page_site = site_of(urlparse(page_url).netloc) if page_url else ""
+        self.max_rank = RANK_MAILTO + (RANK_SAME_SITE if self.page_site else 0)
+        if not self.page_site or self.page_site.endswith(".edu"):
+            self.max_rank += RANK_EDU
+
+        self.best: str | None = None
+        self.best_rank = -1
+        self._seen: dict[str, tuple] = {}
+        self._carry = b""
+        self._scan_from = 0
+
+    @property
+    def done(self) -> bool:
+        return self.best_rank >= self.max_rank
+
+    def rank(self, email: str, is_mailto: bool) -> int:
+        domain = email.rsplit("@", 1)[-1].lower()
+        score = RANK_MAILTO if is_mailto else 0
+        if self.page_site and site_of(domain) == self.page_site:
+            score += RANK_SAME_SITE
+        if domain.endswith(".edu"):
+            score += RANK_EDU
+        return score
+
+    def _consider(self, email: str, is_mailto: bool):
+        score = self.rank(email, is_mailto)
+        key = email.lower()
+        if key not in self._seen or score > self._seen[key][0]:
+            self._seen[key] = (score, self._seen.get(key, (0, email))[1])
+        if score > self.best_rank:
+            self.best, self.best_rank = email, score
+
+    def feed(self, chunk: bytes, final: bool = False):
+        data = self._carry + chunk
+        pos = self._scan_from
+
+        at = data.find(b"@", pos)
+        while at != -1:
+            email, _, end, is_mailto = _candidate_at(data, at)
+            if end >= len(data) and not final:
+                # The domain may continue in the next chunk
+                break
+            if email:
+                self._consider(email, is_mailto)
+                if self.done:
+                    break
+            at = data.find(b"@", at + 1)
+
+        resume = len(data) if at == -1 else at
+        keep_from = max(0, resume - _LEFT_CONTEXT)
+        self._carry = data[keep_from:]
+        self._scan_from = resume - keep_from
+
+    def ranked(self) -> list:
+        """Every distinct address seen, best first (first seen on ties)."""
+        order = sorted(self._seen.values(), key=lambda seen: -seen[0])
+        return [email for _, email in order]
+
+
+def best_email(data: bytes, page_url: str | None = None) -> str | None:
+    """Best-ranked email in a whole page body."""
+    scanner = EmailScanner(page_url)
+    scanner.feed(data, final=True)
+    return scanner.best
+
+
+def extract_emails(data: bytes, page_url: str | None = None) -> list:
+    """All distinct emails in a page body (case-insensitive), best first."""
+    scanner = EmailScanner(page_url)
+    # Keep scanning past a perfect match: callers want every address
+    scanner.max_rank = float("inf")
+    scanner.feed(data, final=True)
+    return scanner.ranked()
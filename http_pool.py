@@ -0,0 +1,360 @@
+"""
+Pooled keep-alive HTTP client shared by the book agents Lambdas.
+
+Standard library only (the Lambda runtime has no `requests`):
+
+- idle connections are kept per (scheme, host, port) in a module-level
+  pool, so they survive warm Lambda invocations
+- asks for gzip/deflate and decodes the body transparently
+- caches DNS answers for DNS_CACHE_TTL seconds
+- follows redirects like urllib's urlopen did
+- stream() hands out the body chunk by chunk, so callers can stop
+  reading (and drop the connection) as soon as they have what they need
+"""
+import json
+import socket
+import ssl
+import threading
+import time
+import zlib
+import http.client
+from urllib.parse import urlencode, urljoin, urlsplit
+
+# Idle keep-alive connections kept per host
+MAX_IDLE_PER_HOST = 4
+# Most servers drop idle keep-alive connections after 5-60s; don't
+# bother reusing anything older than this
+IDLE_TIMEOUT = 30.0
+DNS_CACHE_TTL = 300.0
+MAX_REDIRECTS = 5
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# User-Agent every book agents crawler sends with page and robots.txt fetches
+USER_AGENT = "Mozilla/5.0 (compatible; BookAgents/1.0; +https://example.com)"
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Chunk size used when get() reads a whole body
+READ_CHUNK_SIZE = 64 * 1024
+# Largest decoded body get() accepts (0 = no limit)
+GET_MAX_BYTES = 10 * 1024 * 1024
+
+# Errors that mean a reused keep-alive connection was closed by the server
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status} for {response.url}")
+        self.response = response
+
+
+class ResponseTooLarge(Exception):
+    def __init__(self, url: str, max_bytes: int):
+        super().__init__(f"Body of {url} is larger than {max_bytes} bytes")
+        self.url = url
+
+
+class Response:
+    """A fully read response. `headers` is case-insensitive."""
+
+    def __init__(self, status: int, headers, url: str, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.url = url
+        self.body = body
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="ignore")
+
+    def json(self):
+        return json.loads(self.body)
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HTTPStatusError(self)
+
+
+# ---------------------------------------------------
+# DNS cache
+# ---------------------------------------------------
+
+_dns_cache: dict[tuple, tuple] = {}
+_dns_lock = threading.Lock()
+
+
+def resolve(host: str, port: int) -> list:
+    """socket.getaddrinfo() with answers cached for DNS_CACHE_TTL seconds."""
+    now = time.monotonic()
+    with _dns_lock:
+        hit = _dns_cache.get((host, port))
+    if hit and hit[0] > now:
+        return hit[1]
+
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    with _dns_lock:
+        _dns_cache[(host, port)] = (now + DNS_CACHE_TTL, infos)
+    return infos
+
+
+def _create_connection(host: str, port: int, timeout: float) -> socket.socket:
+    last_error = None
+    for family, socktype, proto, _, addr in resolve(host, port):
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(addr)
+        except OSError as e:
+            sock.close()
+            last_error = e
+            continue
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    # The cached answer may be stale; resolve again next time
+    with _dns_lock:
+        _dns_cache.pop((host, port), None)
+    raise last_error or OSError(f"could not connect to {host}:{port}")
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    def connect(self):
+        self.sock = _create_connection(self.host, self.port, self.timeout)
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    def connect(self):
+        sock = _create_connection(self.host, self.port, self.timeout)
+        self.sock = self._context.wrap_socket(sock, server_hostname=self.host)
+
+
+# ---------------------------------------------------
+# Connection pool
+# ---------------------------------------------------
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port)."""
+
+    def __init__(self, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        # Loading the CA bundle takes tens of ms; only pay for it on the first https request
+        self._ssl_context = None
+
+    def acquire(self, key: tuple, timeout: float):
+        """Return (connection, reused)."""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, released_at = idle.pop()
+                if now - released_at < IDLE_TIMEOUT:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+
+        scheme, host, port = key
+        if scheme == "https":
+            with self._lock:
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+            conn = _HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = _HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def release(self, key: tuple, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+
+# Module-level so warm invocations keep their connections
+_pool = ConnectionPool()
+
+
+class _Decoder:
+    """
+    Incremental gzip/deflate decoder for one response body. Output comes
+    in pieces of at most `max_length` bytes, so a small compressed chunk
+    (a gzip bomb) never turns into one huge buffer.
+    """
+
+    def __init__(self, content_encoding: str | None):
+        self.encoding = (content_encoding or "").strip().lower()
+        self._obj = None
+        if self.encoding in ("gzip", "x-gzip"):
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes, max_length: int):
+        """Yield the decoded form of `data`, max_length bytes at a time."""
+        if self.encoding == "deflate" and self._obj is None:
+            # Some servers send raw deflate without the zlib header
+            has_zlib_header = data and (data[0] & 0x0F) == 8
+            self._obj = zlib.decompressobj(zlib.MAX_WBITS if has_zlib_header else -zlib.MAX_WBITS)
+        if self._obj is None:
+            if data:
+                yield data
+            return
+        while True:
+            out = self._obj.decompress(data, max_length)
+            if out:
+                yield out
+            data = self._obj.unconsumed_tail
+            # A full piece may have more output behind it, even with no input left
+            if not data and len(out) < max_length:
+                return
+
+    def flush(self) -> bytes:
+        return self._obj.flush() if self._obj is not None else b""
+
+
+class StreamingResponse:
+    """
+    A response whose body has not been read yet. Use as a context
+    manager; the connection goes back to the pool only if the body was
+    read to the end, otherwise it is closed.
+    """
+
+    def __init__(self, status: int, headers, url: str, raw, conn, key: tuple):
+        self.status = status
+        self.headers = headers
+        self.url = url
+        self.bytes_received = 0
+        self._raw = raw
+        self._conn = conn
+        self._key = key
+        self._complete = False
+        self._closed = False
+
+    def iter_chunks(self, chunk_size: int = READ_CHUNK_SIZE):
+        """Yield the decoded body in chunks of at most chunk_size bytes."""
+        decoder = _Decoder(self.headers.get("Content-Encoding"))
+        while True:
+            data = self._raw.read(chunk_size)
+            if not data:
+                break
+            self.bytes_received += len(data)
+            yield from decoder.decompress(data, chunk_size)
+
+        self._complete = True
+        tail = decoder.flush()
+        if tail:
+            yield tail
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._complete and not self._raw.will_close:
+            _pool.release(self._key, self._conn)
+        else:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _split(url: str):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    return (parts.scheme, parts.hostname, port), target
+
+
+def _open(url: str, headers: dict, timeout: float) -> StreamingResponse:
+    key, target = _split(url)
+
+    for attempt in range(2):
+        conn, reused = _pool.acquire(key, timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            resp = conn.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            if reused and attempt == 0:
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+
+        return StreamingResponse(resp.status, resp.headers, url, resp, conn, key)
+
+
+def stream(url: str, params: dict | None = None, headers: dict | None = None, timeout: float = 15) -> StreamingResponse:
+    """
+    GET `url` over a pooled connection, following redirects, and return
+    the final response with its body still unread:
+
+        with http_pool.stream(url) as resp:
+            for chunk in resp.iter_chunks():
+                ...
+    """
+    if params:
+        sep = "&" if "?" in url else "?"
+        url = f"{url}{sep}{urlencode(params)}"
+
+    request_headers = {**DEFAULT_HEADERS, **(headers or {})}
+
+    for _ in range(MAX_REDIRECTS):
+        resp = _open(url, request_headers, timeout)
+        location = resp.headers.get("Location")
+        if resp.status not in REDIRECT_STATUSES or not location:
+            return resp
+        with resp:
+            for _chunk in resp.iter_chunks():
+                pass
+        url = urljoin(url, location)
+
+    return _open(url, request_headers, timeout)
+
+
+def get(url: str, params: dict | None = None, headers: dict | None = None, timeout: float = 15,
+        max_bytes: int = GET_MAX_BYTES) -> Response:
+    """
+    GET `url` over a pooled connection and return the (decoded) response.
+
+    Raises on network errors, and ResponseTooLarge once the decoded body
+    passes max_bytes; HTTP error statuses are returned as-is (see
+    Response.raise_for_status).
+    """
+    with stream(url, params=params, headers=headers, timeout=timeout) as resp:
+        chunks = []
+        size = 0
+        for chunk in resp.iter_chunks():
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise ResponseTooLarge(resp.url, max_bytes)
+            chunks.append(chunk)
+        body = b"".join(chunks)
+    return Response(resp.status, resp.headers, resp.url, body)
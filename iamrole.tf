@@ -39,12 +39,27 @@ resource "aws_iam_role_policy" "lambda_dynamodb_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:PutItem",
+          "dynamodb:BatchWriteItem",
           "dynamodb:UpdateItem",
           "dynamodb:GetItem",
           "dynamodb:Scan",
           "dynamodb:Query"
         ]
-        Resource = aws_dynamodb_table.book_leads.arn
+        Resource = [
+          aws_dynamodb_table.book_leads.arn,
+          "${aws_dynamodb_table.book_leads.arn}/index/*"
+        ]
+      },
+
+      # Scraper cache table (read / write only)
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem"
+        ]
+        Resource = aws_dynamodb_table.book_scraper_cache.arn
       },
 
       # SES send permissions for your verified identity
@@ -59,3 +74,20 @@ resource "aws_iam_role_policy" "lambda_dynamodb_policy" {
     ]
   })
 }
+
+# Scraper dispatcher invokes the scraper function once per shard
+resource "aws_iam_role_policy" "lambda_scraper_invoke_policy" {
+  name = "book-agents-lambda-invoke-policy-v1"
+  role = aws_iam_role.lambda_exec.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["lambda:InvokeFunction"]
+        Resource = aws_lambda_function.book_agents_scraper.arn
+      }
+    ]
+  })
+}
@@ -8,11 +8,12 @@
 resource "aws_lambda_function" "book_agents_scraper" {
   function_name = "book-agents-scraper"
   role          = aws_iam_role.lambda_exec.arn
-  handler       = "lambda.book_scraper_handler"
+  handler       = "book_scraper.book_scraper_handler"
   runtime       = "python3.12"
 
-  filename         = "lambda.zip"
-  source_code_hash = filebase64sha256("lambda.zip")
+  # Built by build_lambdas.py: only this function's modules, with bytecode
+  filename         = "build/book-agents-scraper.zip"
+  source_code_hash = filebase64sha256("build/book-agents-scraper.zip")
 
   timeout     = 900
   memory_size = 512
@@ -33,6 +34,53 @@ resource "aws_lambda_function" "book_agents_scraper" {
       # Campaign label (optional, matches lambda.py default)
       CAMPAIGN_LABEL = "BookAgents50"
 
+      # Scraper concurrency (matches lambda.py default)
+      SCRAPER_URL_WORKERS = "8"
+
+      # Run-ALL mode: every agent on one event loop, 32 fetches in flight
+      SCRAPER_ENGINE          = "asyncio"
+      SCRAPER_MAX_CONCURRENCY = "32"
+
+      # Dispatcher mode: invoke this function once per shard of agents
+      SCRAPER_DISPATCH_SHARDS = "10"
+
+      # Stop 60s before the 900s timeout and resume from a checkpoint next run
+      STOP_BEFORE_DEADLINE_MS = "60000"
+
+      # Persistent scraper cache (conditional GETs, ...)
+      SCRAPER_CACHE_BACKEND = "dynamodb"
+      CACHE_TABLE_NAME      = "book-scraper-cache-v1"
+      CSE_CACHE_TTL_HOURS   = "72"
+      CSE_DAILY_BUDGET      = "100"
+      CSE_FALLBACK_RESERVE  = "0.25"
+      CSE_MAX_PAGES_PER_RUN = "3"
+
+      # Domain fallback cache: found email / "no email" answers
+      DOMAIN_EMAIL_TTL_DAYS    = "30"
+      DOMAIN_NO_EMAIL_TTL_DAYS = "3"
+
+      # Leads-table GSI used to attach a known email to its contact
+      CONTACT_EMAIL_INDEX = "contact_email-index"
+
+      # Same-host contact pages tried before the domain fallback (0 = off)
+      CONTACT_DISCOVERY_MAX_PAGES = "2"
+
+      # Streamed page reads: stop at the first email or after 2 MB
+      PAGE_MAX_BYTES   = "2097152"
+      PAGE_CHUNK_BYTES = "16384"
+
+      # Per-host politeness + robots.txt
+      MAX_REQUESTS_PER_HOST = "2"
+      HOST_MIN_DELAY_MS     = "500"
+      RESPECT_ROBOTS_TXT    = "true"
+
+      # CloudWatch namespace of the EMF performance metrics
+      METRICS_NAMESPACE = "BookAgents"
+
+      # On-demand profiling: "all" or handler names; or send {"profile": true}
+      PROFILE_HANDLERS = ""
+      PROFILE_TOP_N    = "30"
+
       # OpenAI key (Terraform still asks for it; lambda.py can ignore it)
       OPENAI_API_KEY = var.openai_api_key
     }
@@ -43,6 +91,14 @@ resource "aws_lambda_function" "book_agents_scraper" {
   }
 }
 
+# Dispatcher shards are asynchronous invocations: don't let Lambda retry
+# a failed shard (it resumes from its checkpoint on the next daily run
+# instead of spending the CSE budget twice)
+resource "aws_lambda_function_event_invoke_config" "book_agents_scraper" {
+  function_name          = aws_lambda_function.book_agents_scraper.function_name
+  maximum_retry_attempts = 0
+}
+
 # -------------------------------------------------------------------
 # 2) Daily Outreach Lambda (emails decision makers with PDF link)
 #     NOTE: name is book_daily_outreach to match cloudwatch.tf
@@ -50,11 +106,12 @@ resource "aws_lambda_function" "book_agents_scraper" {
 resource "aws_lambda_function" "book_daily_outreach" {
   function_name = "book-daily-outreach"
   role          = aws_iam_role.lambda_exec.arn
-  handler       = "lambda.book_daily_outreach_handler"
+  handler       = "book_outreach.book_daily_outreach_handler"
   runtime       = "python3.12"
 
-  filename         = "lambda.zip"
-  source_code_hash = filebase64sha256("lambda.zip")
+  # Built by build_lambdas.py: only this function's modules, with bytecode
+  filename         = "build/book-daily-outreach.zip"
+  source_code_hash = filebase64sha256("build/book-daily-outreach.zip")
 
   timeout     = 900
   memory_size = 512
@@ -93,11 +150,12 @@ resource "aws_lambda_function" "book_daily_outreach" {
 resource "aws_lambda_function" "book_reply_stats_report" {
   function_name = "book-reply-stats-report"
   role          = aws_iam_role.lambda_exec.arn
-  handler       = "lambda.book_reply_stats_report_handler"
+  handler       = "book_reply_report.book_reply_stats_report_handler"
   runtime       = "python3.12"
 
-  filename         = "lambda.zip"
-  source_code_hash = filebase64sha256("lambda.zip")
+  # Built by build_lambdas.py: only this function's modules, with bytecode
+  filename         = "build/book-reply-stats-report.zip"
+  source_code_hash = filebase64sha256("build/book-reply-stats-report.zip")
 
   timeout     = 900
   memory_size = 512
@@ -0,0 +1,251 @@
+"""
+CloudWatch Embedded Metric Format (EMF) telemetry for the Lambdas.
+
+Metrics are collected in memory during an invocation and written once,
+when the handler returns, as EMF JSON records: one record per dimension
+set, with every value of a metric in one array, so a 900s scraper run
+logs a handful of lines rather than one per fetch. CloudWatch turns the
+records into metrics; no PutMetricData calls.
+
+    @metrics.invocation("book_scraper_handler")
+    def book_scraper_handler(event, context):
+        with metrics.timer("page_fetch"):
+            ...
+        metrics.put("LeadsSaved", 3, Agent="campus_bookstore_east_agent")
+
+Where the records go is set by METRICS_SINK:
+    "stdout"       (default) print them; Lambda ships stdout to CloudWatch Logs
+    "file:<path>"  append them as JSON lines to a local file
+    "none"         drop them
+Tests and benchmarks can also call set_sink(MemorySink()).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "BookAgents")
+METRICS_SINK = os.getenv("METRICS_SINK", "stdout")
+
+# EMF limits: values per metric array, metrics per record
+MAX_VALUES_PER_METRIC = 100
+MAX_METRICS_PER_RECORD = 100
+
+
+# ---------------------------------------------------
+# Sinks
+# ---------------------------------------------------
+
+class StdoutSink:
+    def write(self, record: dict):
+        print(json.dumps(record), flush=True)
+
+
+class FileSink:
+    """JSON lines appended to `path` (local runs)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, record: dict):
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+class MemorySink:
+    """Keeps the records in `records` (tests, benchmarks)."""
+
+    def __init__(self):
+        self.records: list[dict] = []
+
+    def write(self, record: dict):
+        self.records.append(record)
+
+    def values(self, name: str, **dimensions) -> list:
+        """Every value written for metric `name` with exactly these dimensions."""
+        found = []
+        for record in self.records:
+            dims = {k: record[k] for k in record["_aws"]["CloudWatchMetrics"][0]["Dimensions"][0]}
+            if name in record and dims == dimensions:
+                value = record[name]
+                found.extend(value if isinstance(value, list) else [value])
+        return found
+
+
+class NullSink:
+    def write(self, record: dict):
+        pass
+
+
+def sink_from_config(config: str):
+    if config == "none":
+        return NullSink()
+    if config.startswith("file:"):
+        return FileSink(config[len("file:"):])
+    return StdoutSink()
+
+
+# ---------------------------------------------------
+# Recorder
+# ---------------------------------------------------
+
+class MetricsBuffer:
+    """Thread-safe metric values keyed by dimension set, plus the
+    dimensions (e.g. the handler name) added to every metric."""
+
+    def __init__(self, dimensions: dict | None = None):
+        self.dimensions = dict(dimensions or {})
+        # (dimension items) -> {metric name: (unit, [values])}
+        self._metrics: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def put(self, name: str, value: float, unit: str, dimensions: dict):
+        key = tuple(sorted({**self.dimensions, **dimensions}.items()))
+        with self._lock:
+            metrics = self._metrics.setdefault(key, {})
+            if name not in metrics:
+                metrics[name] = (unit, [])
+            metrics[name][1].append(value)
+
+    def drain(self) -> dict:
+        with self._lock:
+            buffered, self._metrics = self._metrics, {}
+        return buffered
+
+
+class MetricsRecorder:
+    """
+    Collects metrics into the buffer of the current scope (one per
+    handler invocation, see scope()), or a module-wide buffer outside
+    any scope. Scopes live in a ContextVar, so concurrent invocations
+    (local shards on threads) keep their dimensions and values apart;
+    worker threads see the scope when run under copy_context().
+    """
+
+    def __init__(self, namespace: str = METRICS_NAMESPACE, sink=None):
+        self.namespace = namespace
+        self.sink = sink or sink_from_config(METRICS_SINK)
+        self._root = MetricsBuffer()
+        self._scope: ContextVar[MetricsBuffer | None] = ContextVar("metrics_scope", default=None)
+
+    def _buffer(self) -> MetricsBuffer:
+        return self._scope.get() or self._root
+
+    def put(self, name: str, value: float, unit: str = "Count", **dimensions):
+        self._buffer().put(name, value, unit, dimensions)
+
+    @contextmanager
+    def scope(self, **dimensions):
+        """A fresh buffer tagged with `dimensions` for the block, flushed when it ends."""
+        buffer = MetricsBuffer(dimensions)
+        token = self._scope.set(buffer)
+        try:
+            yield buffer
+        finally:
+            self._scope.reset(token)
+            self._write(buffer.drain())
+
+    @contextmanager
+    def timer(self, stage: str, **dimensions):
+        """Record the block's wall time as Latency (ms) for `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.put("Latency", (time.perf_counter() - start) * 1000, "Milliseconds", Stage=stage, **dimensions)
+
+    def flush(self):
+        """Write everything buffered in the current scope as EMF records and start over."""
+        self._write(self._buffer().drain())
+
+    def _write(self, buffered: dict):
+        timestamp = int(time.time() * 1000)
+        for key, metrics in buffered.items():
+            for record in self._records(timestamp, dict(key), metrics):
+                self.sink.write(record)
+
+    def _records(self, timestamp: int, dimensions: dict, metrics: dict):
+        """EMF records for one dimension set, split to stay within the limits."""
+        chunks = []
+        for name, (unit, values) in metrics.items():
+            for i in range(0, len(values), MAX_VALUES_PER_METRIC):
+                chunks.append((name, unit, values[i:i + MAX_VALUES_PER_METRIC]))
+
+        record = None
+        for name, unit, values in chunks:
+            if record is None or name in record or len(record["_aws"]["CloudWatchMetrics"][0]["Metrics"]) >= MAX_METRICS_PER_RECORD:
+                if record is not None:
+                    yield record
+                record = {
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [{
+                            "Namespace": self.namespace,
+                            "Dimensions": [list(dimensions)],
+                            "Metrics": [],
+                        }],
+                    },
+                    **dimensions,
+                }
+            record["_aws"]["CloudWatchMetrics"][0]["Metrics"].append({"Name": name, "Unit": unit})
+            record[name] = values if len(values) > 1 else values[0]
+        if record is not None:
+            yield record
+
+
+# Module-level so every module in the function shares one recorder
+recorder = MetricsRecorder()
+
+# Module init time of this cold start, until the first invocation reports it
+init_seconds: float | None = None
+
+
+def put(name: str, value: float, unit: str = "Count", **dimensions):
+    recorder.put(name, value, unit, **dimensions)
+
+
+def timer(stage: str, **dimensions):
+    return recorder.timer(stage, **dimensions)
+
+
+def flush():
+    recorder.flush()
+
+
+def set_sink(sink):
+    recorder.sink = sink
+
+
+def record_init(seconds: float):
+    """Module init time, reported as InitDuration by the first invocation."""
+    global init_seconds
+    init_seconds = seconds
+
+
+def invocation(function_name: str):
+    """
+    Decorator for a Lambda handler: collects its metrics in their own
+    scope tagged with Function=function_name, times the whole invocation
+    and flushes that scope once when the handler returns (or raises).
+    The first invocation after a cold start also reports InitDuration.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global init_seconds
+            with recorder.scope(Function=function_name):
+                if init_seconds is not None:
+                    put("ColdStart", 1)
+                    put("InitDuration", init_seconds * 1000, "Milliseconds")
+                    init_seconds = None
+                start = time.perf_counter()
+                try:
+                    return handler(event, context)
+                finally:
+                    put("Duration", (time.perf_counter() - start) * 1000, "Milliseconds")
+        return wrapper
+    return decorator
@@ -0,0 +1,172 @@
+"""
+One-time migration: re-key existing leads by canonical URL, merge the
+duplicates (same page, or same contact email) and fill in
+contact_email_norm.
+
+Leads saved before url_canon was introduced were keyed by the raw CSE
+link, so one page can be in the table several times (http/https, www,
+trailing slash, index.html, tracking parameters ...). This rewrites
+every lead under make_id(canonical url, source) and keeps one item per
+id:
+
+- the survivor is the copy furthest along the outreach sequence
+  (earliest scraped on ties), so nobody gets step 1 again
+- stop flags set on any copy (do_not_contact, bounce_detected,
+  manually_replied, ...) are carried over to the survivor
+- the other copies are deleted
+- every lead gets contact_email_norm, so the contact_email-index GSI
+  the scraper checks before saving a lead (dynamo.tf) covers old leads
+
+Leads saved before the contact email dedup can hold the same address
+under different pages. Those are merged the same way, one lead per
+contact_email_norm: the survivor also gets the other leads' URLs and
+sources in other_urls / other_sources, and each other lead is replaced
+by an attachment marker (book_scraper.attachment_marker), exactly as if
+the scraper had attached it.
+
+    TABLE_NAME=book-leads-v1 python3 migrate_lead_urls.py            # dry run
+    TABLE_NAME=book-leads-v1 python3 migrate_lead_urls.py --apply
+
+Safe to re-run: once migrated, every item is already in its canonical
+form and nothing is written.
+"""
+import argparse
+
+import url_canon
+from book_core import TABLE_NAME, get_table, normalize_email, scan_all_items, sequence_rank
+from book_scraper import attachment_marker, make_id
+
+# Carried over from any duplicate when the survivor doesn't have them
+STICKY_FIELDS = (
+    "do_not_contact",
+    "stop_sequence",
+    "bounce_detected",
+    "sequence_completed",
+    "manually_replied",
+    "manually_replied_at",
+)
+
+
+def absorb(merged: dict, other: dict):
+    """Carry `other`'s stop flags and attached URLs / sources over to `merged`."""
+    for field in STICKY_FIELDS:
+        if other.get(field) and not merged.get(field):
+            merged[field] = other[field]
+    for field in ("other_urls", "other_sources"):
+        if other.get(field):
+            merged[field] = set(merged.get(field, ())) | set(other[field])
+
+
+def merge_group(new_id: str, items: list) -> dict:
+    """The item to keep under new_id for one group of duplicates."""
+    items = sorted(items, key=sequence_rank, reverse=True)
+    merged = dict(items[0])
+    for other in items[1:]:
+        absorb(merged, other)
+
+    merged["id"] = new_id
+    merged["url"] = url_canon.canonical_url(merged["url"])
+    if merged.get("contact_email"):
+        merged["contact_email_norm"] = normalize_email(merged["contact_email"])
+    return merged
+
+
+def merge_contacts(leads: dict) -> int:
+    """
+    Fold leads (by id) that share contact_email_norm into the survivor,
+    replacing the others with attachment markers. Returns how many
+    leads were folded.
+    """
+    by_email: dict[str, list] = {}
+    for lead in leads.values():
+        if lead.get("contact_email_norm"):
+            by_email.setdefault(lead["contact_email_norm"], []).append(lead)
+
+    folded = 0
+    for contacts in by_email.values():
+        if len(contacts) < 2:
+            continue
+        survivor, *others = sorted(contacts, key=sequence_rank, reverse=True)
+        for other in others:
+            absorb(survivor, other)
+            survivor["other_urls"] = set(survivor.get("other_urls", ())) | {other["url"]}
+            survivor["other_sources"] = set(survivor.get("other_sources", ())) | {other["source"]}
+            leads[other["id"]] = attachment_marker(other["url"], other["source"], survivor["id"])
+            folded += 1
+    return folded
+
+
+def plan(items: list) -> dict:
+    """
+    Work out the migration without touching the table:
+    {"puts": [items], "deletes": [ids], "groups": n, "contacts_merged": n,
+    "conflicts": [...]}.
+    """
+    groups: dict[str, list] = {}
+    for item in items:
+        if item.get("url") and item.get("source"):
+            groups.setdefault(make_id(item["url"], item["source"]), []).append(item)
+
+    leads, deletes, conflicts = {}, [], []
+    for new_id, group in groups.items():
+        leads[new_id] = merge_group(new_id, group)
+        deletes.extend(item["id"] for item in group if item["id"] != new_id)
+
+        emails = {normalize_email(item.get("contact_email")) for item in group}
+        if len(emails) > 1:
+            conflicts.append({"id": new_id, "url": leads[new_id]["url"],
+                              "kept": leads[new_id].get("contact_email"), "emails": sorted(emails)})
+
+    contacts_merged = merge_contacts(leads)
+
+    puts = []
+    for new_id, group in groups.items():
+        current = next((item for item in group if item["id"] == new_id), None)
+        if leads[new_id] != current:
+            puts.append(leads[new_id])
+
+    return {"puts": puts, "deletes": deletes, "groups": len(groups), "contacts_merged": contacts_merged,
+            "conflicts": conflicts}
+
+
+def apply(result: dict):
+    """Write the merged items first, then delete the old copies."""
+    with get_table().batch_writer() as batch:
+        for item in result["puts"]:
+            batch.put_item(Item=item)
+        for item_id in result["deletes"]:
+            batch.delete_item(Key={"id": item_id})
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--apply", action="store_true", help="write the changes (default: dry run)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print(f"Scanning DynamoDB table: {TABLE_NAME} ...")
+    items = scan_all_items()
+    result = plan(items)
+
+    print(f"Items scanned:      {len(items)}")
+    print(f"Canonical leads:    {result['groups']}")
+    print(f"Contacts merged:    {result['contacts_merged']}")
+    print(f"Items to write:     {len(result['puts'])}")
+    print(f"Items to delete:    {len(result['deletes'])}")
+    for conflict in result["conflicts"]:
+        print(f"  Different emails for {conflict['url']}: {', '.join(conflict['emails'])} "
+              f"(keeping {conflict['kept']})")
+
+    if not args.apply:
+        print("Dry run, nothing written. Re-run with --apply to migrate.")
+        return
+
+    apply(result)
+    print(f"Done: table now holds {len(items) - len(result['deletes'])} items.")
+
+
+if __name__ == "__main__":
+    main()
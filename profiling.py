@@ -0,0 +1,216 @@
+"""
+On-demand cProfile + tracemalloc profiling of a Lambda invocation.
+
+Off by default and free when off: the wrapper only checks the event and
+PROFILE_HANDLERS before calling the handler. When on, the invocation
+runs under cProfile and tracemalloc and the logs get
+
+  - the top PROFILE_TOP_N functions by cumulative time
+  - the top allocation sites that grew during the invocation
+    (a tracemalloc snapshot diff) and the traced peak
+
+and, with PROFILE_OUTPUT set, a .pstats file for snakeviz / pstats.
+
+    @profiling.profiled("book_scraper_handler")
+    def book_scraper_handler(event, context):
+        ...
+
+Turning it on:
+    event  {"profile": true}
+           {"profile": {"top_n": 50, "output": "s3://bucket/profiles"}}
+    env    PROFILE_HANDLERS="all" or a comma-separated list of handler names
+
+PROFILE_OUTPUT is a directory ("/tmp/profiles") or an S3 prefix
+("s3://bucket/prefix"; needs s3:PutObject on it). Empty = logs only.
+"""
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger()
+
+PROFILE_HANDLERS = os.getenv("PROFILE_HANDLERS", "")
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "30"))
+PROFILE_OUTPUT = os.getenv("PROFILE_OUTPUT", "")
+# Stack depth kept per allocation; 1 groups by line
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "1"))
+
+# The session running in this process, if any. Handlers invoked from
+# inside it (the dispatcher's "local" invoker) are already covered.
+active_session = None
+
+
+def profile_options(function_name: str, event) -> dict | None:
+    """
+    {"top_n", "output"} if this invocation should be profiled, else
+    None. The event's "profile" field wins over PROFILE_HANDLERS.
+    """
+    requested = event.get("profile") if isinstance(event, dict) else None
+    if requested is None:
+        names = {n.strip() for n in PROFILE_HANDLERS.split(",") if n.strip()}
+        requested = bool(names & {"all", "true", "1", function_name})
+    if not requested:
+        return None
+
+    options = {"top_n": PROFILE_TOP_N, "output": PROFILE_OUTPUT}
+    if isinstance(requested, dict):
+        options.update({k: v for k, v in requested.items() if k in options})
+    return options
+
+
+# ---------------------------------------------------
+# Profiling session
+# ---------------------------------------------------
+
+class ProfileSession:
+    """
+    cProfile + tracemalloc around one invocation.
+
+    cProfile only sees the thread that enabled it (before Python 3.12),
+    so threads started during the session - the scraper's fetch pool,
+    the dispatcher's shard invokes - each get their own profiler, merged
+    into one table at the end. On 3.12+ the first profiler already sees
+    every thread and the per-thread ones are skipped.
+    """
+
+    def __init__(self, function_name: str):
+        self.function_name = function_name
+        self.profiler = cProfile.Profile()
+        self.thread_profilers: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self.before = None
+        self.seconds = 0.0
+
+    def _profile_thread(self, *args):
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active interpreter-wide (3.12+) and covers this thread
+            return
+        with self._lock:
+            self.thread_profilers.append(profiler)
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self.before = tracemalloc.take_snapshot()
+        threading.setprofile(self._profile_thread)
+        self._start = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.seconds = time.perf_counter() - self._start
+        threading.setprofile(None)
+        self.after = tracemalloc.take_snapshot()
+        self.peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def stats(self, stream=None) -> pstats.Stats:
+        stats = pstats.Stats(self.profiler, stream=stream)
+        with self._lock:
+            profilers = list(self.thread_profilers)
+        for profiler in profilers:
+            # Threads that never called anything have no stats
+            try:
+                stats.add(profiler)
+            except TypeError:
+                pass
+        return stats
+
+    def cumulative_table(self, top_n: int) -> str:
+        out = io.StringIO()
+        stats = self.stats(stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(top_n)
+        return out.getvalue()
+
+    def allocation_diff(self, top_n: int) -> str:
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        diff = self.after.filter_traces(ignore).compare_to(self.before.filter_traces(ignore), "lineno")
+        lines = [f"Traced peak {self.peak_mb:.1f} MB; top {top_n} allocation sites by growth:"]
+        lines.extend(str(stat) for stat in diff[:top_n])
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------
+# .pstats output
+# ---------------------------------------------------
+
+def write_pstats(session: ProfileSession, output: str, request_id: str) -> str:
+    """Dump the stats to `output` (directory or s3:// prefix); returns where."""
+    name = f"{session.function_name}-{time.strftime('%Y%m%dT%H%M%S')}-{request_id}.pstats"
+
+    if not output.startswith("s3://"):
+        os.makedirs(output, exist_ok=True)
+        path = os.path.join(output, name)
+        session.stats().dump_stats(path)
+        return path
+
+    import boto3
+
+    bucket, _, prefix = output[len("s3://"):].partition("/")
+    key = f"{prefix.rstrip('/')}/{name}" if prefix else name
+    path = os.path.join("/tmp", name)
+    session.stats().dump_stats(path)
+    try:
+        boto3.client("s3").upload_file(path, bucket, key)
+    finally:
+        os.remove(path)
+    return f"s3://{bucket}/{key}"
+
+
+def report(session: ProfileSession, options: dict, context):
+    top_n = int(options["top_n"])
+    tag = f"[profile:{session.function_name}]"
+    logger.info(f"{tag} {session.seconds:.2f}s, top {top_n} by cumulative time:\n{session.cumulative_table(top_n)}")
+    logger.info(f"{tag} {session.allocation_diff(top_n)}")
+
+    if options["output"]:
+        request_id = getattr(context, "aws_request_id", None) or "local"
+        try:
+            where = write_pstats(session, options["output"], request_id)
+            logger.info(f"{tag} Wrote {where}")
+        except Exception as e:
+            logger.warning(f"{tag} Could not write .pstats to {options['output']}: {e}")
+
+
+def profiled(function_name: str):
+    """
+    Decorator for a Lambda handler: runs the invocation under the
+    profilers when profile_options() asks for it, else calls it as is.
+    Reports are logged even if the handler raises.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global active_session
+            options = profile_options(function_name, event)
+            if not options or active_session is not None:
+                return handler(event, context)
+
+            session = active_session = ProfileSession(function_name)
+            session.start()
+            try:
+                return handler(event, context)
+            finally:
+                session.stop()
+                active_session = None
+                report(session, options, context)
+        return wrapper
+    return decorator
@@ -1,12 +1,13 @@
 import os
 import json
 import uuid
-import re
 import logging
 from datetime import datetime, timezone
 
-import boto3
-import requests
+import email_extract
+import http_pool
+import profiling
+from book_core import LeadWriter
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -26,8 +27,8 @@ SEARCH_QUERIES = os.getenv("SEARCH_QUERIES", DEFAULT_QUERY).split("||")
 # Limit how many search results per run
 MAX_RESULTS = int(os.getenv("MAX_RESULTS", "10"))
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(DDB_TABLE_NAME)
+# Same crawler identity as book_scraper
+FETCH_HEADERS = {"User-Agent": http_pool.USER_AGENT}
 
 
 def google_search(query: str) -> list:
@@ -39,27 +40,23 @@ def google_search(query: str) -> list:
         "q": query,
     }
     logger.info(f"[google_search] Querying Google CSE: {query}")
-    resp = requests.get(url, params=params, timeout=15)
+    resp = http_pool.get(url, params=params, timeout=15)
     resp.raise_for_status()
     data = resp.json()
     return data.get("items", [])
 
 
 def fetch_emails_from_url(url: str) -> list:
-    """Fetch a page and extract emails using regex."""
+    """Fetch a page and extract its emails, best first (see email_extract)."""
     logger.info(f"[fetch_emails_from_url] Fetching {url}")
     try:
-        resp = requests.get(url, timeout=15)
+        resp = http_pool.get(url, headers=FETCH_HEADERS, timeout=15)
         resp.raise_for_status()
-        html = resp.text
     except Exception as e:
         logger.warning(f"[fetch_emails_from_url] Error fetching {url}: {e}")
         return []
 
-    # Basic email regex
-    email_pattern = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
-    emails = re.findall(email_pattern, html)
-    unique_emails = sorted(set(emails))
+    unique_emails = email_extract.extract_emails(resp.body, url)
     logger.info(
         f"[fetch_emails_from_url] Found {len(unique_emails)} emails on {url}"
     )
@@ -67,88 +64,81 @@ def fetch_emails_from_url(url: str) -> list:
 
 
 def choose_primary_email(url: str, emails: list) -> str | None:
-    """Prefer .edu email matching the site's domain; else first .edu; else first."""
-    if not emails:
-        return None
+    """
+    fetch_emails_from_url already ranks emails (mailto: links, then the
+    site's own domain, then .edu), so the primary one is the first.
+    """
+    return emails[0] if emails else None
 
-    # Get domain from URL
-    domain_match = re.search(r"https?://([^/]+)/?", url)
-    page_domain = domain_match.group(1).lower() if domain_match else ""
 
-    # 1) .edu and contains domain
-    for e in emails:
-        lower = e.lower()
-        if lower.endswith(".edu") and page_domain and page_domain.split(":")[0] in lower:
-            return e
-
-    # 2) any .edu email
-    for e in emails:
-        if e.lower().endswith(".edu"):
-            return e
-
-    # 3) fallback: first email
-    return emails[0]
-
-
-def save_item_to_dynamodb(item: dict):
+def save_item_to_dynamodb(item: dict, writer: LeadWriter):
+    """Queue an item on the writer (written in 25-item batches)."""
     logger.info(f"[{AGENT_SOURCE}] Saving item to DynamoDB: {item}")
-    table.put_item(Item=item)
+    writer.add(item)
 
 
-def run_agent() -> int:
-    saved_count = 0
+def run_agent(lambda_context=None) -> int:
+    """Search, fetch and save; returns how many items DynamoDB accepted."""
     now_iso = datetime.now(timezone.utc).isoformat()
 
-    for query in SEARCH_QUERIES:
-        query = query.strip()
-        if not query:
-            continue
+    # Buffered 25-item BatchWriteItem calls; unprocessed items are retried
+    # with backoff and only accepted writes are counted (see LeadWriter)
+    writer = LeadWriter(AGENT_SOURCE, lambda_context, table_name=DDB_TABLE_NAME)
+    try:
+        for query in SEARCH_QUERIES:
+            query = query.strip()
+            if not query:
+                continue
 
-        items = google_search(query)
-        if not items:
-            continue
+            items = google_search(query)
+            if not items:
+                continue
 
-        for result in items[:MAX_RESULTS]:
-            url = result.get("link")
-            title = result.get("title", "")
-            snippet = result.get("snippet", "")
+            for result in items[:MAX_RESULTS]:
+                url = result.get("link")
+                title = result.get("title", "")
+                snippet = result.get("snippet", "")
 
-            if not url:
-                continue
+                if not url:
+                    continue
 
-            emails = fetch_emails_from_url(url)
-            primary_email = choose_primary_email(url, emails)
+                emails = fetch_emails_from_url(url)
+                primary_email = choose_primary_email(url, emails)
 
-            # Deterministic ID based on source + URL
-            record_id = uuid.uuid5(
-                uuid.NAMESPACE_URL, f"{AGENT_SOURCE}:{url}"
-            ).hex
+                # Deterministic ID based on source + URL
+                record_id = uuid.uuid5(
+                    uuid.NAMESPACE_URL, f"{AGENT_SOURCE}:{url}"
+                ).hex
 
-            ddb_item = {
-                "id": record_id,
-                "url": url,
-                "title": title,
-                "snippet": snippet,
-                "source": AGENT_SOURCE,
-                "query": query,
-                "timestamp": now_iso,
-            }
+                ddb_item = {
+                    "id": record_id,
+                    "url": url,
+                    "title": title,
+                    "snippet": snippet,
+                    "source": AGENT_SOURCE,
+                    "query": query,
+                    "timestamp": now_iso,
+                }
 
-            if primary_email:
-                ddb_item["email"] = primary_email
-            if emails:
-                ddb_item["emails"] = emails
+                if primary_email:
+                    ddb_item["email"] = primary_email
+                if emails:
+                    ddb_item["emails"] = emails
 
-            save_item_to_dynamodb(ddb_item)
-            saved_count += 1
+                save_item_to_dynamodb(ddb_item, writer)
+    finally:
+        writer.flush()
 
-    return saved_count
+    if writer.failed:
+        logger.error(f"[{AGENT_SOURCE}] Failed to save {writer.failed} items.")
+    return writer.saved
 
 
+@profiling.profiled("sga_lambda_handler")
 def lambda_handler(event, context):
     logger.info(f"[lambda_handler] Starting agent: {AGENT_SOURCE}")
     try:
-        saved = run_agent()
+        saved = run_agent(context)
         body = {
             "message": f"{AGENT_SOURCE} ran successfully. Saved {saved} items.",
             "saved": saved,
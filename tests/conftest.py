@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# The Lambda modules live at the repo root; dummy AWS settings keep boto3
+# from looking for credentials (nothing in the tests talks to AWS)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    """book_scraper with a fresh SQLite cache, no robots.txt checks and a fresh run."""
+    import book_scraper
+
+    path = str(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(book_scraper, "SCRAPER_CACHE_BACKEND", "sqlite")
+    monkeypatch.setitem(book_scraper.CACHE_BACKENDS, "sqlite",
+                        lambda namespace: book_scraper.SqliteCacheStore(namespace, path))
+    monkeypatch.setattr(book_scraper, "_cache_stores", {})
+    monkeypatch.setattr(book_scraper, "RESPECT_ROBOTS_TXT", False)
+    book_scraper.begin_scrape_run()
+    return book_scraper
@@ -0,0 +1,54 @@
+import time
+
+AGENT = "test_agent"
+CFG = {"search_queries": ["campus bookstore"], "max_results_per_query": 5, "segment": "Test"}
+
+
+def setup_agent(scraper, monkeypatch, stop_after=None):
+    """
+    One agent with one query; CSE page at `start` is x<start>..x<start+4>.
+    After `stop_after` results the run's deadline passes. Returns the
+    list the handled links are appended to.
+    """
+    handled = []
+    monkeypatch.setattr(scraper, "get_agents", lambda: {AGENT: CFG})
+    monkeypatch.setattr(scraper, "cse_spent_today", lambda: 0)
+    monkeypatch.setattr(
+        scraper, "google_search",
+        lambda q, num=10, start=1, **kw: [{"link": f"https://a.edu/x{i}"} for i in range(start, start + num)],
+    )
+
+    def process(agent_name, cfg, result, writer):
+        handled.append(result["link"].rsplit("/", 1)[-1])
+        if stop_after is not None and len(handled) >= stop_after:
+            scraper.current_run().deadline = time.monotonic() - 1
+        return True
+
+    monkeypatch.setattr(scraper, "process_search_result", process)
+    return handled
+
+
+def test_resume_continues_on_the_interrupted_page(scraper, monkeypatch):
+    first = setup_agent(scraper, monkeypatch, stop_after=2)
+    scraper.run_agents([AGENT], {"engine": "asyncio", "max_concurrency": 1})
+    assert first == ["x1", "x2"]
+
+    scraper.begin_scrape_run()
+    second = setup_agent(scraper, monkeypatch)
+    scraper.run_agents([AGENT], {"engine": "asyncio", "max_concurrency": 1})
+    assert second[:3] == ["x3", "x4", "x5"]
+
+
+def test_finished_page_advances_the_cursor(scraper, monkeypatch):
+    handled = setup_agent(scraper, monkeypatch)
+    monkeypatch.setattr(scraper, "CSE_MAX_PAGES_PER_RUN", 1)
+    scraper.run_agents([AGENT], {"engine": "asyncio"})
+    assert handled == ["x1", "x2", "x3", "x4", "x5"]
+    assert scraper.load_query_cursor(CFG["search_queries"][0], 5) == 6
+
+
+def test_checkpoint_summary_lists_pending_agents(scraper):
+    checkpoint = scraper.ScrapeCheckpoint(["a", "b"])
+    assert checkpoint.summary()["pending_agents"] == ["a", "b"]
+    checkpoint.finish("a")
+    assert checkpoint.summary()["pending_agents"] == ["b"]
@@ -0,0 +1,100 @@
+import pytest
+
+import book_outreach
+import migrate_lead_urls
+from bench_support import MemoryDynamo
+
+AGENT = "campus_bookstore_east_agent"
+CFG = {"segment": "campus_bookstore", "search_queries": ["q"]}
+OWNER = {
+    "id": "owner", "url": "https://campus.edu/store", "source": AGENT,
+    "contact_email": "Store@Campus.edu", "contact_email_norm": "store@campus.edu",
+}
+
+
+@pytest.fixture
+def table(scraper, monkeypatch):
+    table = MemoryDynamo().Table("leads")
+    monkeypatch.setattr(scraper, "get_table", lambda: table)
+    return table
+
+
+@pytest.fixture
+def fetches(scraper, monkeypatch):
+    """URLs resolved (fetched) so far; every page has the owner's email."""
+    fetched = []
+
+    def resolve(agent_name, url):
+        fetched.append(url)
+        return "store@campus.edu"
+
+    monkeypatch.setattr(scraper, "resolve_url_email", resolve)
+    return fetched
+
+
+def process(scraper, url, writer=None):
+    writer = writer or scraper.LeadWriter(AGENT)
+    return scraper.process_search_result(AGENT, CFG, {"link": url, "title": "Hours"}, writer)
+
+
+def test_attached_url_is_not_fetched_again(scraper, table, fetches):
+    table.load([dict(OWNER)])
+    url = "https://campus.edu/store/hours"
+
+    assert process(scraper, url) is False
+    assert scraper.current_run().flush_attachments() == 1
+    assert table.items["owner"]["other_urls"] == {url}
+    assert table.items[scraper.make_id(url, AGENT)]["attached_to"] == "owner"
+
+    # Next day's run
+    scraper.begin_scrape_run()
+    assert process(scraper, url) is False
+    assert fetches == [url]
+    assert scraper.current_run().attachments == {}
+
+
+def test_no_marker_when_the_contact_is_missing(scraper, table, fetches):
+    url = "https://campus.edu/store/hours"
+    scraper.current_run().attach("owner", url, AGENT)
+
+    assert scraper.current_run().flush_attachments() == 0
+    assert table.items == {}
+
+
+def test_markers_are_not_contacts(scraper):
+    marker = scraper.attachment_marker("https://campus.edu/store/hours", AGENT, "owner")
+    assert "contact_email" not in marker and "contact_email_norm" not in marker
+    assert book_outreach.contact_owners([marker]) == {}
+
+
+def test_outreach_owner_is_the_lead_furthest_along():
+    items = [
+        {"id": "new", "contact_email": "store@campus.edu", "scraped_at": 200},
+        {"id": "started", "contact_email": "Store@Campus.edu ", "sequence_step": 1, "scraped_at": 300},
+        {"id": "other", "contact_email": "dean@campus.edu", "scraped_at": 100},
+        {"id": "older", "contact_email": "dean@campus.edu", "scraped_at": 50},
+    ]
+    assert book_outreach.contact_owners(items) == {"store@campus.edu": "started", "dean@campus.edu": "older"}
+
+
+def test_migration_merges_leads_sharing_an_email(scraper):
+    first = {**OWNER, "id": scraper.make_id(OWNER["url"], AGENT), "sequence_step": 1, "scraped_at": 100}
+    second = {
+        "id": "raw", "url": "http://www.campus.edu/textbooks/", "source": "campus_bookstore_west_agent",
+        "contact_email": "store@campus.edu", "scraped_at": 50, "do_not_contact": True,
+    }
+    second_id = scraper.make_id(second["url"], second["source"])
+
+    result = migrate_lead_urls.plan([first, second])
+    puts = {item["id"]: item for item in result["puts"]}
+
+    assert result["contacts_merged"] == 1
+    assert result["deletes"] == ["raw"]
+    assert puts[first["id"]]["other_urls"] == {"http://www.campus.edu/textbooks/"}
+    assert puts[first["id"]]["other_sources"] == {"campus_bookstore_west_agent"}
+    assert puts[first["id"]]["do_not_contact"] is True
+    assert puts[second_id]["attached_to"] == first["id"]
+    assert "contact_email" not in puts[second_id]
+
+    # Re-running over the migrated table changes nothing
+    assert migrate_lead_urls.plan(list(puts.values()))["puts"] == []
@@ -0,0 +1,86 @@
+import threading
+
+import book_core
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_item(self, **kwargs):
+        self.calls.append(("get_item", kwargs))
+        return {"Item": {"id": kwargs["Key"]["id"]}}
+
+
+def test_dynamo_table_passes_its_name_to_the_client():
+    client = FakeClient()
+    table = book_core.DynamoTable(client, "leads")
+    assert table.get_item(Key={"id": "a"}) == {"Item": {"id": "a"}}
+    assert client.calls == [("get_item", {"TableName": "leads", "Key": {"id": "a"}})]
+    assert table.meta.client is client
+
+
+def test_dynamo_table_only_exposes_table_operations():
+    table = book_core.DynamoTable(FakeClient(), "leads")
+    try:
+        table.load
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("load should not be forwarded")
+
+
+def test_worker_threads_share_one_table(monkeypatch):
+    monkeypatch.setattr(book_core, "_tables", {})
+    tables = []
+    threads = [threading.Thread(target=lambda: tables.append(book_core.get_dynamo_table("leads")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(table) for table in tables}) == 1
+
+
+class ThrottlingClient:
+    """BatchWriteItem that leaves `throttled` items unprocessed on its first `times` calls."""
+
+    def __init__(self, throttled: int, times: int = 1):
+        self.throttled = throttled
+        self.times = times
+        self.batches = []
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        self.batches.append((table_name, len(requests)))
+        unprocessed = requests[:self.throttled] if len(self.batches) <= self.times else []
+        return {"UnprocessedItems": {table_name: unprocessed} if unprocessed else {}}
+
+
+def writer_on(monkeypatch, client, **kwargs):
+    sleeps = []
+    monkeypatch.setattr(book_core, "get_dynamo_table", lambda name: book_core.DynamoTable(client, name))
+    monkeypatch.setattr(book_core.time, "sleep", sleeps.append)
+    return book_core.LeadWriter("sga-agent", **kwargs), sleeps
+
+
+def test_lead_writer_backs_off_before_resending_unprocessed_items(monkeypatch):
+    client = ThrottlingClient(throttled=3)
+    writer, sleeps = writer_on(monkeypatch, client, table_name="sga-leads")
+    for i in range(5):
+        writer.add({"id": str(i)})
+
+    assert writer.flush() == 5
+    assert client.batches == [("sga-leads", 5), ("sga-leads", 3)]
+    assert len(sleeps) == 1 and sleeps[0] > 0
+
+
+def test_lead_writer_counts_only_accepted_items(monkeypatch):
+    monkeypatch.setattr(book_core, "BATCH_WRITE_MAX_RETRIES", 2)
+    writer, _ = writer_on(monkeypatch, ThrottlingClient(throttled=2, times=3))
+    for i in range(5):
+        writer.add({"id": str(i)})
+    assert writer.add({"id": "0"}) is False
+
+    writer.flush()
+    assert (writer.saved, writer.failed) == (3, 2)
@@ -0,0 +1,65 @@
+import pytest
+
+AGENTS = {
+    "a": {"search_queries": ["a0", "a1", "a2", "a3"], "max_results_per_query": 5, "segment": "Test"},
+    "b": {"search_queries": ["b0", "b1"], "max_results_per_query": 5, "segment": "Test"},
+}
+
+
+@pytest.fixture
+def agents(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "get_agents", lambda: AGENTS)
+    monkeypatch.setattr(scraper, "cse_spent_today", lambda: 0)
+    return scraper
+
+
+def test_reserve_and_query_budget(agents):
+    quota = agents.CseQuota(20, reserve_fraction=0.25)
+    assert (quota.fallback_reserve, quota.query_budget) == (5, 15)
+
+
+def test_lowest_yield_queries_are_skipped(agents, monkeypatch):
+    monkeypatch.setattr(agents, "query_yield", lambda q: {"searches": 10, "saved": 0 if q == "a3" else 5})
+    quota = agents.CseQuota(5, reserve_fraction=0)
+    quota.plan(["a", "b"])
+    assert quota.skipped == [("a", "a3")]
+    assert quota.planned_left == 5
+
+
+def test_plan_starts_at_the_checkpoint_position(agents):
+    class Checkpoint:
+        def position(self, name):
+            return (3, 2) if name == "a" else (0, 0)
+
+    quota = agents.CseQuota(3, reserve_fraction=0)
+    quota.plan(["a", "b"], Checkpoint())
+    # a3, b0, b1 fit the budget: nothing skipped
+    assert quota.skipped == []
+    assert quota.planned_left == 3
+
+
+def test_try_spend_keeps_first_pages_ahead_of_deep_pages(agents):
+    quota = agents.CseQuota(2, reserve_fraction=0)
+    quota.planned_left = 1
+    assert quota.try_spend("deep")
+    assert not quota.try_spend("deep")
+    assert quota.try_spend("query")
+    assert not quota.try_spend("fallback")
+
+
+def test_unknown_single_agent_is_a_value_error(agents):
+    with pytest.raises(ValueError, match="Unknown agent"):
+        agents.book_scraper_handler({"agent_name": "nope"}, None)
+
+
+def test_failed_search_is_not_recorded_as_a_yield(agents, monkeypatch):
+    def search(q, **kwargs):
+        if q == "b0":
+            raise agents.CseSearchError("HTTP 503")
+        return []
+
+    monkeypatch.setattr(agents, "google_search", search)
+    monkeypatch.setattr(agents, "CSE_MAX_PAGES_PER_RUN", 1)
+    agents.run_agents(["b"], {"engine": "asyncio"})
+    assert agents.query_yield("b0") == {"searches": 0, "saved": 0}
+    assert agents.query_yield("b1")["searches"] == 1
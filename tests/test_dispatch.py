@@ -0,0 +1,69 @@
+import json
+
+AGENTS = {
+    f"agent_{i}": {"search_queries": ["q1", "q2"], "max_results_per_query": 5, "segment": "Test"}
+    for i in range(4)
+}
+
+
+def setup(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "get_agents", lambda: AGENTS)
+    monkeypatch.setattr(scraper, "cse_spent_today", lambda: 0)
+    monkeypatch.setattr(scraper, "CSE_DAILY_BUDGET", 40)
+
+
+def test_async_shards_are_queued_not_awaited(scraper, monkeypatch):
+    setup(scraper, monkeypatch)
+    payloads = []
+
+    def invoker(payload):
+        payloads.append(payload)
+        return {"statusCode": 202}
+
+    body = scraper.dispatch_agents(list(AGENTS), 2, invoker=invoker)
+    assert body["queued_shards"] == [0, 1]
+    assert body["failed_shards"] == []
+    assert sorted(p["shard"] for p in payloads) == [0, 1]
+    assert sum(p["cse_budget"] for p in payloads) == 40
+
+
+def test_synchronous_shard_results_are_merged(scraper, monkeypatch):
+    setup(scraper, monkeypatch)
+
+    def invoker(payload):
+        by_agent = {name: 1 for name in payload["agent_names"]}
+        return {"statusCode": 200, "body": json.dumps({"by_agent": by_agent, "run_stats": {"pages": 2}})}
+
+    body = scraper.dispatch_agents(list(AGENTS), 2, invoker=invoker)
+    assert body["total_saved"] == 4
+    assert body["run_stats"] == {"pages": 4}
+    assert body["queued_shards"] == []
+
+
+def test_lambda_invoker_uses_event_invocations(scraper, monkeypatch):
+    calls = []
+
+    class Client:
+        def invoke(self, **kwargs):
+            calls.append(kwargs)
+            return {"StatusCode": 202}
+
+    monkeypatch.setattr(scraper, "_lambda_client", Client())
+    assert scraper.lambda_invoker({"agent_names": ["a"]}) == {"statusCode": 202}
+    assert calls[0]["InvocationType"] == "Event"
+
+
+def test_queued_shards_report_no_totals(scraper, monkeypatch):
+    setup(scraper, monkeypatch)
+    body = scraper.dispatch_agents(list(AGENTS), 2, invoker=lambda payload: {"statusCode": 202})
+    assert body["total_saved"] is None
+    assert body["by_agent"] is None
+    assert sorted(body["queued_agents"]) == sorted(AGENTS)
+    assert "2 shards queued" in body["message"]
+
+
+def test_unknown_invoker_is_a_bad_request(scraper, monkeypatch):
+    setup(scraper, monkeypatch)
+    resp = scraper.book_scraper_handler({"mode": "dispatch", "invoker": "carrier-pigeon"}, None)
+    assert resp["statusCode"] == 400
+    assert "Unknown invoker: carrier-pigeon" in json.loads(resp["body"])["message"]
@@ -0,0 +1,35 @@
+def setup_fallback(scraper, monkeypatch, pages):
+    """CSE returns `pages` (link -> email, or a PageSkipped reason) in order."""
+    fetched = []
+
+    def fetch(url, contact_pages=None):
+        fetched.append(url)
+        result = pages[url]
+        if isinstance(result, scraper.PageSkipped):
+            raise result
+        return result
+
+    monkeypatch.setattr(scraper, "google_search", lambda query, **kwargs: [{"link": url} for url in pages])
+    monkeypatch.setattr(scraper, "fetch_page_email", fetch)
+    return fetched
+
+
+def test_skipped_fallback_page_moves_on_to_the_next_link(scraper, monkeypatch):
+    fetched = setup_fallback(scraper, monkeypatch, {
+        "https://a.edu/handbook.pdf": None,
+        "https://a.edu/private": scraper.PageSkipped("robots_txt", "https://a.edu/private"),
+        "https://a.edu/contact": "info@a.edu",
+    })
+
+    assert scraper.lookup_domain_email("a.edu") == "info@a.edu"
+    assert fetched == ["https://a.edu/private", "https://a.edu/contact"]
+    assert scraper.get_cache_store("domain").get("a.edu") == {"email": "info@a.edu"}
+
+
+def test_domain_without_email_is_cached_as_a_miss(scraper, monkeypatch):
+    setup_fallback(scraper, monkeypatch, {
+        "https://a.edu/big": scraper.PageSkipped("content_length", "https://a.edu/big"),
+    })
+
+    assert scraper.lookup_domain_email("a.edu") is None
+    assert scraper.get_cache_store("domain").get("a.edu") == {"email": None}
@@ -0,0 +1,63 @@
+import pytest
+
+from email_extract import EmailScanner, best_email, extract_emails, site_of
+
+
+@pytest.mark.parametrize("host, site", [
+    ("www.cs.example.edu", "example.edu"),
+    ("Example.EDU:443", "example.edu"),
+    ("www.ox.ac.uk", "ox.ac.uk"),
+    ("ox.ac.uk", "ox.ac.uk"),
+    ("library.unimelb.edu.au", "unimelb.edu.au"),
+    ("www.myschool.k12.ca.us", "myschool.k12.ca.us"),
+    ("otherdistrict.k12.ca.us", "otherdistrict.k12.ca.us"),
+    ("www.lanecc.cc.or.us", "lanecc.cc.or.us"),
+    ("www.ci.boston.ma.us", "boston.ma.us"),
+    ("www.example.de", "example.de"),
+    ("www.bbc.co.uk", "bbc.co.uk"),
+    ("localhost", "localhost"),
+])
+def test_site_of(host, site):
+    assert site_of(host) == site
+
+
+def test_same_site_wins_across_a_shared_public_suffix():
+    page = (b'<a href="mailto:info@otherdistrict.k12.ca.us">District</a> '
+            b'<a href="mailto:principal@myschool.k12.ca.us">Principal</a>')
+    assert best_email(page, "https://www.myschool.k12.ca.us/staff") == "principal@myschool.k12.ca.us"
+
+
+def test_scanner_doesnt_stop_early_on_another_site():
+    scanner = EmailScanner("https://www.myschool.k12.ca.us/")
+    scanner.feed(b'<a href="mailto:info@otherdistrict.k12.ca.us">x</a>')
+    assert not scanner.done
+
+
+def test_ranking_prefers_mailto_then_same_site_then_edu():
+    page = (b"write to someone@gmail.com or dean@other.edu. "
+            b"Store: store@campus.edu "
+            b'<a href="mailto:help@vendor.com">help</a>')
+    assert extract_emails(page, "https://campus.edu/") == [
+        "help@vendor.com", "store@campus.edu", "dean@other.edu", "someone@gmail.com",
+    ]
+
+
+@pytest.mark.parametrize("length, found", [(63, True), (64, True), (65, False), (80, False)])
+def test_local_part_length_limit(length, found):
+    email = "a" * length + "@campus.edu"
+    assert (best_email(b" " + email.encode() + b" ") == email) is found
+
+
+def test_file_names_are_not_emails():
+    assert best_email(b'<img src="logo@2x.png"> <img src="icon@3x.webp">') is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_chunked_feed_matches_whole_page(chunk_size):
+    page = (b"x" * 100 + b' <a href="mailto:store@campus.edu">Store</a> ' + b"y" * 50
+            + b" manager@campus.edu")
+    scanner = EmailScanner("https://campus.edu/")
+    for i in range(0, len(page), chunk_size):
+        scanner.feed(page[i:i + chunk_size])
+    scanner.feed(b"", final=True)
+    assert scanner.best == best_email(page, "https://campus.edu/") == "store@campus.edu"
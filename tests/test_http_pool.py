@@ -0,0 +1,59 @@
+import gzip
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_pool
+
+PAGE = b"<p>Store hours</p>" * 1000
+# 20 MB of zeros, about 20 KB compressed
+BOMB = gzip.compress(b"\0" * (20 * 1024 * 1024))
+
+
+class Handler(BaseHTTPRequestHandler):
+    BODIES = {
+        "/page": ("gzip", gzip.compress(PAGE)),
+        "/raw-deflate": ("deflate", zlib.compress(PAGE)[2:-4]),
+        "/bomb": ("gzip", BOMB),
+    }
+
+    def do_GET(self):
+        encoding, body = self.BODIES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    http_pool._pool.clear()
+
+
+@pytest.mark.parametrize("path", ["/page", "/raw-deflate"])
+def test_compressed_bodies_are_decoded(server, path):
+    assert http_pool.get(server + path).body == PAGE
+
+
+def test_decoded_chunks_stay_within_the_chunk_size(server):
+    with http_pool.stream(server + "/bomb") as resp:
+        sizes = [len(chunk) for chunk in resp.iter_chunks(64 * 1024)]
+    assert max(sizes) <= 64 * 1024
+    assert sum(sizes) == 20 * 1024 * 1024
+    assert resp.bytes_received == len(BOMB)
+
+
+def test_get_refuses_a_body_over_max_bytes(server):
+    with pytest.raises(http_pool.ResponseTooLarge):
+        http_pool.get(server + "/bomb", max_bytes=1024 * 1024)
+    assert len(http_pool.get(server + "/page", max_bytes=len(PAGE)).body) == len(PAGE)
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    monkeypatch.setattr(metrics, "recorder", metrics.MetricsRecorder(sink=metrics.MemorySink()))
+    monkeypatch.setattr(metrics, "init_seconds", None)
+    return metrics.recorder.sink
+
+
+def test_invocation_tags_and_flushes_its_metrics(sink):
+    @metrics.invocation("outreach")
+    def handler(event, context):
+        metrics.put("EmailsSent", 3)
+        assert sink.records == []
+
+    handler({}, None)
+    assert sink.values("EmailsSent", Function="outreach") == [3]
+    assert len(sink.values("Duration", Function="outreach")) == 1
+
+
+def test_nested_invocation_keeps_the_outer_dimensions_and_buffer(sink):
+    @metrics.invocation("shard")
+    def shard(event, context):
+        metrics.put("LeadsSaved", 2)
+
+    @metrics.invocation("dispatcher")
+    def dispatcher(event, context):
+        metrics.put("LeadsSaved", 1)
+        shard({}, None)
+        # The shard flushed only its own values
+        assert sink.values("LeadsSaved", Function="dispatcher") == []
+        metrics.put("LeadsSaved", 5)
+
+    dispatcher({}, None)
+    assert sink.values("LeadsSaved", Function="shard") == [2]
+    assert sink.values("LeadsSaved", Function="dispatcher") == [1, 5]
+
+
+def test_concurrent_invocations_dont_share_dimensions(sink):
+    started = threading.Barrier(2)
+
+    def make(name):
+        @metrics.invocation(name)
+        def handler(event, context):
+            started.wait()
+            metrics.put("Runs", 1)
+        return handler
+
+    threads = [threading.Thread(target=make(name), args=({}, None)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sink.values("Runs", Function="a") == [1]
+    assert sink.values("Runs", Function="b") == [1]
+
+
+def test_metrics_outside_an_invocation_wait_for_flush(sink):
+    metrics.put("ItemsScanned", 7)
+    assert sink.records == []
+    metrics.flush()
+    assert sink.values("ItemsScanned") == [7]
@@ -0,0 +1,67 @@
+import pytest
+
+AGENT = "test_agent"
+QUERY = "campus bookstore"
+CFG = {"search_queries": [QUERY], "max_results_per_query": 5, "segment": "Test"}
+
+
+def setup_agent(scraper, monkeypatch, failures=0):
+    """
+    One agent with one query whose first `failures` CSE calls fail; the
+    page at `start` is x<start>..x<start+4>. Returns the starts searched.
+    """
+    searched = []
+    monkeypatch.setattr(scraper, "get_agents", lambda: {AGENT: CFG})
+    monkeypatch.setattr(scraper, "cse_spent_today", lambda: 0)
+
+    def search(q, num=10, start=1, **kw):
+        searched.append(start)
+        if len(searched) <= failures:
+            raise scraper.CseSearchError("HTTP 503")
+        return [{"link": f"https://a.edu/x{i}"} for i in range(start, start + num)]
+
+    monkeypatch.setattr(scraper, "google_search", search)
+    monkeypatch.setattr(scraper, "process_search_result", lambda *args: True)
+    return searched
+
+
+@pytest.mark.parametrize("text", [None, "<html>Service Unavailable</html>", '{"error": {"message": "rate"}}'])
+def test_failed_cse_call_raises(scraper, monkeypatch, text):
+    monkeypatch.setattr(scraper, "http_get_text", lambda *args, **kwargs: text)
+    with pytest.raises(scraper.CseSearchError):
+        scraper.google_search(QUERY, ttl_hours=0)
+
+
+def test_empty_cse_page_is_an_empty_list(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "http_get_text", lambda *args, **kwargs: '{"kind": "customsearch#search"}')
+    assert scraper.google_search(QUERY, ttl_hours=0) == []
+
+
+def test_failed_search_keeps_the_deep_cursor(scraper, monkeypatch):
+    searched = setup_agent(scraper, monkeypatch, failures=1)
+    monkeypatch.setattr(scraper, "CSE_MAX_PAGES_PER_RUN", 1)
+    scraper.save_query_cursor(QUERY, 5, 11)
+
+    scraper.run_agents([AGENT], {"engine": "asyncio"})
+    assert searched == [11]
+    assert scraper.load_query_cursor(QUERY, 5) == 11
+
+
+def test_failed_search_is_retried_next_round(scraper, monkeypatch):
+    searched = setup_agent(scraper, monkeypatch, failures=1)
+    monkeypatch.setattr(scraper, "CSE_MAX_PAGES_PER_RUN", 2)
+    scraper.save_query_cursor(QUERY, 5, 11)
+
+    scraper.run_agents([AGENT], {"engine": "asyncio"})
+    assert searched == [11, 11]
+    assert scraper.load_query_cursor(QUERY, 5) == 16
+
+
+def test_agent_without_a_segment_still_reports(scraper, monkeypatch):
+    setup_agent(scraper, monkeypatch)
+    no_segment = {k: v for k, v in CFG.items() if k != "segment"}
+    monkeypatch.setattr(scraper, "get_agents", lambda: {AGENT: no_segment})
+    monkeypatch.setattr(scraper, "CSE_MAX_PAGES_PER_RUN", 1)
+    result = scraper.run_agents([AGENT], {"engine": "asyncio"})[AGENT]
+    assert result["saved"] == 0
+    assert scraper.agent_segment(AGENT, {}) == "test"
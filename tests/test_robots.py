@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+import http_pool
+
+
+@pytest.fixture
+def robots(scraper, monkeypatch, tmp_path):
+    """A RobotsCache under tmp_path whose robots.txt responses are set by the test."""
+    responses = {}
+
+    def fake_get(url, headers=None, timeout=None, params=None):
+        responses["fetches"] = responses.get("fetches", 0) + 1
+        status, body = responses["next"]
+        return http_pool.Response(status, {}, url, body)
+
+    monkeypatch.setattr(scraper.http_pool, "get", fake_get)
+    monkeypatch.setattr(scraper, "host_scheduler", scraper.HostScheduler(min_delay_ms=0))
+    cache = scraper.RobotsCache(str(tmp_path / "robots"))
+    cache.responses = responses
+    return cache
+
+
+def test_rules_from_a_200_response(robots):
+    robots.responses["next"] = (200, b"User-agent: *\nDisallow: /private/\n")
+    assert robots.allowed("https://campus.edu/store")
+    assert not robots.allowed("https://campus.edu/private/x")
+
+
+@pytest.mark.parametrize("status, allowed", [(404, True), (410, True), (401, False), (403, False),
+                                             (500, False), (503, False)])
+def test_status_without_rules(robots, status, allowed):
+    robots.responses["next"] = (status, b"")
+    assert robots.allowed("https://campus.edu/store") is allowed
+
+
+def test_server_error_is_only_remembered_briefly(scraper, robots, monkeypatch):
+    robots.responses["next"] = (503, b"")
+    assert not robots.allowed("https://campus.edu/store")
+
+    robots.responses["next"] = (200, b"User-agent: *\nAllow: /\n")
+    assert not robots.allowed("https://campus.edu/store")
+    assert robots.responses["fetches"] == 1
+
+    later = time.time() + scraper.ROBOTS_ERROR_TTL_MINUTES * 60 + 1
+    monkeypatch.setattr(scraper.time, "time", lambda: later)
+    assert robots.allowed("https://campus.edu/store")
+    assert robots.responses["fetches"] == 2
+
+
+def test_rules_are_remembered_for_the_full_ttl(scraper, robots, monkeypatch):
+    robots.responses["next"] = (200, b"User-agent: *\nAllow: /\n")
+    assert robots.allowed("https://campus.edu/store")
+
+    later = time.time() + scraper.ROBOTS_ERROR_TTL_MINUTES * 60 + 1
+    monkeypatch.setattr(scraper.time, "time", lambda: later)
+    assert robots.allowed("https://campus.edu/store")
+    assert robots.responses["fetches"] == 1
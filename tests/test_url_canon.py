@@ -0,0 +1,53 @@
+import pytest
+
+from url_canon import canonical_url, url_key
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTP://WWW.Campus.EDU/Store", "http://www.campus.edu/Store"),
+    ("https://campus.edu:443/a", "https://campus.edu/a"),
+    ("https://campus.edu:8443/a", "https://campus.edu:8443/a"),
+    ("https://campus.edu", "https://campus.edu/"),
+    ("https://campus.edu/a#hours", "https://campus.edu/a"),
+    ("https://campus.edu/a?utm_source=x&id=3&fbclid=y&UTM_Medium=z", "https://campus.edu/a?id=3"),
+    ("https://campus.edu/a?b=2&a=1", "https://campus.edu/a?b=2&a=1"),
+    ("https://campus.edu/x?print", "https://campus.edu/x?print"),
+    ("https://campus.edu/a%20b?q=a%20b", "https://campus.edu/a%20b?q=a%20b"),
+    # Index documents are fetched as given
+    ("https://a.edu/index.php?id=3", "https://a.edu/index.php?id=3"),
+    ("https://a.edu/store/index.html", "https://a.edu/store/index.html"),
+    # Not http(s): unchanged
+    ("  mailto:x@campus.edu ", "mailto:x@campus.edu"),
+    ("https://user:pw@Campus.edu/x", "https://user:pw@Campus.edu/x"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+@pytest.mark.parametrize("variants", [
+    [
+        "HTTP://www.Campus.edu/store/index.html?utm_source=x#hours",
+        "https://campus.edu/store/",
+        "https://campus.edu/store",
+        "http://campus.edu:80/store/default.aspx",
+    ],
+    ["https://campus.edu/a?b=2&a=1", "https://www.campus.edu/a/?a=1&b=2&gclid=z"],
+    ["https://campus.edu", "https://campus.edu/", "http://www.campus.edu/index.php"],
+])
+def test_url_key_folds_variant_spellings(variants):
+    assert len({url_key(url) for url in variants}) == 1
+
+
+def test_url_key_keeps_different_pages_apart():
+    keys = {url_key(url) for url in [
+        "https://campus.edu/store",
+        "https://campus.edu/store?id=3",
+        "https://campus.edu:8443/store",
+        "https://shop.campus.edu/store",
+        "https://campus.edu/Store",
+    ]}
+    assert len(keys) == 5
+
+
+def test_url_key_example():
+    assert url_key("HTTP://www.Campus.edu/store/index.html?utm_source=x#hours") == "campus.edu/store"
@@ -0,0 +1,30 @@
+import asyncio
+import threading
+
+
+def test_worker_pool_is_reused_per_size(scraper):
+    assert scraper.worker_pool(3) is scraper.worker_pool(3)
+    assert scraper.worker_pool(3) is not scraper.worker_pool(4)
+
+
+def test_agents_run_one_after_another_reuse_worker_threads(scraper):
+    async def thread_of_one_step():
+        return await scraper.run_blocking(asyncio.Semaphore(1), threading.current_thread)
+
+    async def run(concurrency):
+        scraper.current_run().workers = scraper.worker_pool(concurrency)
+        return await thread_of_one_step()
+
+    # Like run_agent: one asyncio.run per agent
+    first = asyncio.run(run(1))
+    second = asyncio.run(run(1))
+    assert first is second
+
+
+def test_worker_steps_see_the_current_run(scraper):
+    run = scraper.current_run()
+
+    async def step():
+        return await scraper.in_worker(scraper.current_run)
+
+    assert asyncio.run(step()) is run
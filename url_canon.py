@@ -0,0 +1,82 @@
+"""
+URL canonicalization for scraped result pages.
+
+CSE hands back the same page under many spellings. Two levels:
+
+    canonical_url(url)  the form that is fetched and stored: lowercased
+                        scheme/host, no default port, no fragment, no
+                        tracking parameters
+    url_key(url)        identity used for ids and dedup: canonical_url
+                        plus http/https, "www.", a trailing index.html
+                        and a trailing slash folded, query parameters
+                        sorted
+
+Only url_key folds spellings that could change the response: a site
+may not answer on https or on its bare host, and "/index.php?id=3" is
+not necessarily the page "/?id=3" serves.
+
+    >>> url_key("HTTP://www.Campus.edu/store/index.html?utm_source=x#hours")
+    'campus.edu/store'
+"""
+from urllib.parse import urlsplit, urlunsplit
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = frozenset({
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "_hsenc", "_hsmi", "hsctatracking", "mkt_tok", "igshid",
+})
+TRACKING_PREFIXES = ("utm_",)
+
+INDEX_PAGES = ("index.html", "index.htm", "index.php", "default.aspx", "default.asp")
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def _query_params(query: str) -> list:
+    """Raw "name=value" pieces minus tracking parameters (encoding left alone)."""
+    params = []
+    for piece in query.split("&"):
+        name = piece.split("=", 1)[0].lower()
+        if piece and name not in TRACKING_PARAMS and not name.startswith(TRACKING_PREFIXES):
+            params.append(piece)
+    return params
+
+
+def canonical_url(url: str) -> str:
+    """Fetchable canonical form; other URLs come back unchanged (stripped)."""
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname or parts.username:
+        return url
+
+    host = parts.hostname.rstrip(".")
+    if ":" in host:
+        host = f"[{host}]"
+    if port is not None and str(port) != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    return urlunsplit((scheme, host, path, "&".join(_query_params(parts.query)), ""))
+
+
+def url_key(url: str) -> str:
+    """Scheme-less identity of canonical_url(url) (see module docstring)."""
+    url = canonical_url(url)
+    parts = urlsplit(url)
+    if parts.scheme not in DEFAULT_PORTS:
+        return url
+
+    host = parts.netloc
+    if host.startswith("www."):
+        host = host[len("www."):]
+    path = parts.path
+    head, _, last = path.rpartition("/")
+    if last.lower() in INDEX_PAGES:
+        path = head
+    path = path.rstrip("/")
+    query = "&".join(sorted(_query_params(parts.query)))
+    return host + path + (f"?{query}" if query else "")